@@ -230,6 +230,37 @@ def analyze_domain():
         logger.error(f"Error analyzing domain: {e}")
         return jsonify({"success": False, "message": str(e)}), 500
 
+@app.route("/api/resume_domain", methods=["POST"])
+def resume_domain():
+    """
+    Resume an interrupted domain crawl from its last checkpoint for the given session.
+    """
+    try:
+        data = request.get_json()
+        session_id = data.get("session_id")
+        domain = data.get("domain")
+
+        if session_id not in analyzer_instances:
+            logger.warning(f"Invalid session for crawl resume: {session_id}")
+            return jsonify({"success": False, "message": "Invalid session."}), 400
+        if not domain:
+            logger.warning("Domain is required for crawl resume.")
+            return jsonify({"success": False, "message": "Domain is required."}), 400
+
+        analyzer = analyzer_instances[session_id]["analyzer"]
+        if not domain.startswith(("http://", "https://")):
+            domain = "https://" + domain
+        if not analyzer.crawler.has_checkpoint(domain):
+            logger.warning(f"No crawl checkpoint to resume for {domain}")
+            return jsonify({"success": False, "message": "No interrupted crawl to resume for this domain."}), 404
+
+        logger.info(f"Resuming domain crawl: {domain} for session {session_id}")
+        content = analyzer.analyze_domain(domain, resume=True)
+        return jsonify({"success": True, "content": content})
+    except Exception as e:
+        logger.error(f"Error resuming domain crawl: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
 @app.route("/api/analyze_urls", methods=["POST"])
 def analyze_urls():
     """
@@ -439,6 +470,30 @@ def sync():
         logger.error(f"Error syncing domain: {e}")
         return jsonify({"success": False, "message": str(e)}), 500
 
+@app.route("/api/reindex", methods=["POST"])
+def reindex():
+    """
+    Rebuild the domain index of the given session from the page archive.
+    """
+    try:
+        data = request.get_json()
+        session_id = data.get("session_id") if data else None
+        if not session_id:
+            logger.warning("Session ID is required for re-index.")
+            return jsonify({"success": False, "message": "Session ID is required."}), 400
+
+        if session_id not in analyzer_instances:
+            logger.warning(f"Invalid session for re-index: {session_id}")
+            return jsonify({"success": False, "message": "Invalid session."}), 404
+
+        analyzer = analyzer_instances[session_id]["analyzer"]
+        result = analyzer.reindex_domain()
+        logger.info(f"Re-indexed domain for session {session_id}")
+        return jsonify({"success": not result.startswith("Error"), "result": result})
+    except Exception as e:
+        logger.error(f"Error re-indexing domain: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
 @app.route("/api/clear-chat", methods=["POST"])
 def clear_chat():
     """
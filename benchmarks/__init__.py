@@ -0,0 +1,8 @@
+# ~/benchmarks/__init__.py
+"""
+Offline benchmark suite for the Enhanced Domain Intelligence Analyzer.
+
+Runs the crawler, content processor and analyzer end to end against a local
+synthetic website and a stub LLM, so performance can be measured without
+touching real sites or Groq. Run with: python -m benchmarks.run --help
+"""
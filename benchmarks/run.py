@@ -0,0 +1,347 @@
+# ~/benchmarks/run.py
+"""
+End-to-end offline benchmark for the Enhanced Domain Intelligence Analyzer.
+
+Starts a SyntheticSite, points all storage at a temporary directory, swaps
+the LLM for a StubLLM and then measures:
+
+- crawl:      EnhancedDomainCrawler.crawl_domain (pages/s, fetch latency)
+- index:      EnhancedContentProcessor.process_domain_data (chunks/s,
+              chunk/embed/upsert latency)
+- sync:       a second crawl in sync mode (conditional requests, lastmod)
+- embed:      encoding the crawled chunks without the cache: one encode()
+              call versus length-bucketed BatchedEncoder batches (and a
+              multi-process pool with --embed-processes), in chunks/s
+- end_to_end: EnhancedDomainAnalyzer.analyze_domain, streamed crawl to index
+- chat:       EnhancedDomainAnalyzer.chat_with_domain (retrieve/LLM latency)
+
+Results are printed (and optionally written) as JSON. Example:
+
+    python -m benchmarks.run --pages 200 --latency-ms 30 --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from functools import wraps
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+try:
+    import psutil
+except ImportError:  # pragma: no cover - optional
+    psutil = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from benchmarks.synthetic_site import SyntheticSite
+from benchmarks.stubs import install_stub_llm, install_stub_embedder
+from core.embedding_cache import get_embedding_cache
+
+SCENARIOS = ("crawl", "index", "sync", "embed", "end_to_end", "chat")
+
+class StageTimer:
+    """
+    Records wall-clock latency samples per stage by wrapping methods.
+    """
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    def record(self, stage: str, seconds: float):
+        self.samples.setdefault(stage, []).append(seconds)
+
+    def wrap(self, obj, name: str, stage: str):
+        """
+        Replace obj.name with a timed wrapper (sync or async).
+        """
+        fn = getattr(obj, name)
+        if asyncio.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    self.record(stage, time.perf_counter() - start)
+        else:
+            @wraps(fn)
+            def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(stage, time.perf_counter() - start)
+        setattr(obj, name, timed)
+
+    def summary(self) -> Dict[str, Dict]:
+        return {stage: latency_stats(values) for stage, values in self.samples.items()}
+
+def latency_stats(values: List[float]) -> Dict:
+    if not values:
+        return {'count': 0}
+    ms = np.asarray(values) * 1000
+    return {
+        'count': len(values),
+        'mean_ms': round(float(ms.mean()), 3),
+        'p50_ms': round(float(np.percentile(ms, 50)), 3),
+        'p95_ms': round(float(np.percentile(ms, 95)), 3),
+        'p99_ms': round(float(np.percentile(ms, 99)), 3),
+        'max_ms': round(float(ms.max()), 3)
+    }
+
+def peak_rss_mb() -> Dict:
+    # None where the platform does not report a peak
+    if resource is not None:
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return {
+            'self': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+            'children': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1)
+        }
+    # Windows: psutil reports the peak working set of this process only
+    peak = getattr(psutil.Process().memory_info(), 'peak_wset', None) if psutil is not None else None
+    return {'self': round(peak / (1024 * 1024), 1) if peak else None, 'children': None}
+
+def rate(count: int, seconds: float) -> float:
+    return round(count / seconds, 3) if seconds > 0 else 0.0
+
+def configure(storage: str, args):
+    """
+    Point every store at the temporary directory and size the crawl.
+    """
+    Config.CHROMA_DB_PATH = os.path.join(storage, "chroma_storage")
+    Config.COLLECTION_REGISTRY_PATH = os.path.join(storage, "collection_registry.db")
+    Config.HTTP_CACHE_PATH = os.path.join(storage, "http_cache")
+    Config.CRAWL_STATE_DB_PATH = os.path.join(storage, "crawl_state.db")
+    Config.ARCHIVE_PATH = os.path.join(storage, "page_archive")
+    Config.CHECKPOINT_PATH = os.path.join(storage, "crawl_checkpoints")
+    Config.EMBED_CACHE_PATH = os.path.join(storage, "embedding_cache")
+    if args.embedding_backend:
+        Config.EMBEDDING_BACKEND = args.embedding_backend
+    Config.MAX_PAGES = args.pages
+    Config.SITEMAP_MAX_URLS = max(Config.SITEMAP_MAX_URLS, args.pages)
+    if not args.polite:
+        # The fixture is local; measure the pipeline, not politeness delays
+        Config.CRAWL_DELAY = 0
+        Config.RATE_MIN_DELAY = 0
+
+def set_console_level(level: str):
+    """
+    Quiet the console handlers of the project's loggers; log files are untouched.
+    """
+    import logging
+    import core.analyzer  # noqa: F401  (creates every module logger)
+    for logger in list(logging.Logger.manager.loggerDict.values()):
+        for handler in getattr(logger, "handlers", []):
+            if type(handler) is logging.StreamHandler:
+                handler.setLevel(level)
+
+def count_chunks(processor) -> int:
+    return processor.collection.count() if processor.collection is not None else 0
+
+def run_crawl(site: SyntheticSite, timer: StageTimer, sync_mode=False) -> Tuple[Dict, Dict]:
+    from core.crawler import EnhancedDomainCrawler
+    crawler = EnhancedDomainCrawler()
+    stage = "sync_fetch" if sync_mode else "fetch"
+    timer.wrap(crawler.engine, "_fetch", stage)
+    requests_before = site.requests
+    start = time.perf_counter()
+    data = crawler.crawl_domain(site.base_url, sync_mode=sync_mode)
+    seconds = time.perf_counter() - start
+    methods = {}
+    for state in crawler.state.get_pages(site.base_url).values():
+        methods[state['fetch_method'] or 'unknown'] = methods.get(state['fetch_method'] or 'unknown', 0) + 1
+    result = {
+        'seconds': round(seconds, 3),
+        'pages': data['total_pages'],
+        'pages_per_s': rate(data['total_pages'], seconds),
+        'http_requests': site.requests - requests_before,
+        'near_duplicates': len(data.get('near_duplicates', [])),
+        'fetch_methods': methods,
+        'fetch_latency': latency_stats(timer.samples.get(stage, []))
+    }
+    if sync_mode:
+        sync = data['sync_info']
+        result['not_modified'] = len(sync['not_modified_pages'])
+        result['changed'] = sync['total_changes']
+    return result, data
+
+def run_index(domain_data: Dict, timer: StageTimer) -> Dict:
+    from core.processor import EnhancedContentProcessor
+    processor = EnhancedContentProcessor()
+    timer.wrap(processor, "page_chunks", "chunk")
+    timer.wrap(processor, "add_embedded_chunks", "upsert")
+    timer.wrap(processor.embedding_model, "encode", "embed")
+    try:
+        start = time.perf_counter()
+        processor.process_domain_data(domain_data)
+        seconds = time.perf_counter() - start
+    finally:
+        del processor.embedding_model.encode
+    chunks = count_chunks(processor)
+    return {
+        'seconds': round(seconds, 3),
+        'chunks': chunks,
+        'chunks_per_s': rate(chunks, seconds),
+        'stages': {stage: latency_stats(timer.samples.get(stage, [])) for stage in ("chunk", "embed", "upsert")}
+    }
+
+def run_embed(domain_data: Dict, args) -> Dict:
+    from core.embedding_batch import BatchedEncoder
+    from core.processor import EnhancedContentProcessor
+    processor = EnhancedContentProcessor()
+    model = EnhancedContentProcessor._embedding_model  # Uncached, so every run encodes
+    texts = [chunk['text'] for page in domain_data['pages'] for chunk in processor.page_chunks(page)]
+
+    def measure(encode) -> Dict:
+        samples = []
+        for _ in range(args.embed_repeats):
+            start = time.perf_counter()
+            encode(texts)
+            samples.append(time.perf_counter() - start)
+        seconds = min(samples)
+        return {'seconds': round(seconds, 3), 'chunks_per_s': rate(len(texts), seconds)}
+
+    batch_size = args.embed_batch_size or Config.EMBED_BATCH_SIZE
+    # The previous path: one call with default settings, converted to lists
+    result = {
+        'chunks': len(texts),
+        'batch_size': batch_size,
+        'single_call': measure(lambda t: model.encode(t).tolist()),
+        'bucketed': measure(BatchedEncoder(model, batch_size, processes=0).encode)
+    }
+    if args.embed_processes > 0:
+        encoder = BatchedEncoder(model, batch_size, processes=args.embed_processes, min_texts=0)
+        encoder.encode(texts[:1])  # Start the pool outside the measurement
+        result['multi_process'] = {'processes': args.embed_processes, **measure(encoder.encode)}
+    return result
+
+def run_end_to_end(site: SyntheticSite, args) -> Tuple[Dict, Optional[Dict]]:
+    from core.analyzer import EnhancedDomainAnalyzer
+    timer = StageTimer()
+    analyzer = EnhancedDomainAnalyzer()
+    timer.wrap(analyzer.crawler.engine, "_fetch", "fetch")
+    timer.wrap(analyzer.processor, "page_chunks", "chunk")
+    timer.wrap(analyzer.processor, "add_embedded_chunks", "upsert")
+    timer.wrap(analyzer.processor.embedding_model, "encode", "embed")
+    timer.wrap(analyzer, "generate_domain_summary", "summary")
+    try:
+        start = time.perf_counter()
+        analyzer.analyze_domain(site.base_url)
+        seconds = time.perf_counter() - start
+    finally:
+        del analyzer.processor.embedding_model.encode
+    pages = analyzer.current_domain_data['total_pages'] if analyzer.current_domain_data else 0
+    chunks = count_chunks(analyzer.processor)
+    result = {
+        'seconds': round(seconds, 3),
+        'pages': pages,
+        'chunks': chunks,
+        'pages_per_s': rate(pages, seconds),
+        'chunks_per_s': rate(chunks, seconds),
+        'stages': timer.summary()
+    }
+
+    chat = None
+    if "chat" in args.scenarios and chunks:
+        chat_timer = StageTimer()
+        chat_timer.wrap(analyzer.processor, "search_similar_content", "retrieve")
+        chat_timer.wrap(analyzer.analyzer, "generate_response", "llm")
+        words = site.vocabulary
+        for i in range(args.chat_queries):
+            question = f"What does the site say about {words[2 * i % len(words)]} and {words[(2 * i + 1) % len(words)]}?"
+            start = time.perf_counter()
+            analyzer.chat_with_domain(question)
+            chat_timer.record("total", time.perf_counter() - start)
+        chat = {'queries': args.chat_queries, 'stages': chat_timer.summary()}
+    return result, chat
+
+def main(argv=None) -> Dict:
+    parser = argparse.ArgumentParser(description="Offline benchmark against a synthetic local website.")
+    parser.add_argument("--pages", type=int, default=100, help="pages on the synthetic site")
+    parser.add_argument("--fanout", type=int, default=8, help="links per page")
+    parser.add_argument("--page-words", type=int, default=800, help="body words per page")
+    parser.add_argument("--latency-ms", type=float, default=20, help="server delay per response")
+    parser.add_argument("--js-fraction", type=float, default=0.0, help="fraction of JS-only pages")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--llm-latency-ms", type=float, default=0, help="stub LLM delay per call")
+    parser.add_argument("--chat-queries", type=int, default=20)
+    parser.add_argument("--embedding-backend", choices=("torch", "onnx"), help="embedding runtime (default: Config.EMBEDDING_BACKEND)")
+    parser.add_argument("--embed-batch-size", type=int, help="texts per forward pass in the embed scenario")
+    parser.add_argument("--embed-processes", type=int, default=0, help="also measure a multi-process encode pool")
+    parser.add_argument("--embed-repeats", type=int, default=3, help="runs per embed variant (best is reported)")
+    parser.add_argument("--stub-embeddings", action="store_true", help="use hash embeddings instead of the real model")
+    parser.add_argument("--polite", action="store_true", help="keep the configured crawl delays")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of " + ",".join(SCENARIOS))
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--log-level", default="WARNING", help="console log level while benchmarking")
+    parser.add_argument("--keep-storage", action="store_true", help="keep the temporary storage directory")
+    args = parser.parse_args(argv)
+    args.scenarios = {s.strip() for s in args.scenarios.split(",") if s.strip()}
+
+    storage = tempfile.mkdtemp(prefix="domchat-bench-")
+    configure(storage, args)
+    set_console_level(args.log_level.upper())
+    install_stub_llm(args.llm_latency_ms)
+    if args.stub_embeddings:
+        install_stub_embedder()
+
+    site = SyntheticSite(args.pages, args.fanout, args.page_words, args.latency_ms, args.js_fraction, args.seed).start()
+    report = {
+        'site': site.config(),
+        'settings': {
+            'stub_embeddings': args.stub_embeddings,
+            'embedding_model': Config.EMBEDDING_MODEL,
+            'embedding_backend': Config.EMBEDDING_BACKEND,
+            'llm_latency_ms': args.llm_latency_ms,
+            'polite': args.polite,
+            'crawl_concurrency': Config.CRAWL_CONCURRENCY,
+            'extract_workers': Config.EXTRACT_WORKERS,
+            'embed_batch_size': Config.EMBED_BATCH_SIZE,
+            'embed_processes': Config.EMBED_PROCESSES
+        }
+    }
+    try:
+        timer = StageTimer()
+        domain_data = None
+        if args.scenarios & {"crawl", "index", "sync", "embed"}:
+            report['crawl'], domain_data = run_crawl(site, timer)
+        if "index" in args.scenarios:
+            report['index'] = run_index(domain_data, timer)
+        if "sync" in args.scenarios:
+            report['sync'], _ = run_crawl(site, timer, sync_mode=True)
+        if "embed" in args.scenarios:
+            report['embed'] = run_embed(domain_data, args)
+        if args.scenarios & {"end_to_end", "chat"}:
+            report['end_to_end'], chat = run_end_to_end(site, args)
+            if chat is not None:
+                report['chat'] = chat
+        cache = get_embedding_cache()
+        report['embedding_cache'] = {'hits': cache.hits, 'misses': cache.misses}
+        report['peak_rss_mb'] = peak_rss_mb()
+    finally:
+        site.stop()
+        if not args.keep_storage:
+            shutil.rmtree(storage, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    return report
+
+if __name__ == "__main__":
+    main()
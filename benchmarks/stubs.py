@@ -0,0 +1,82 @@
+# ~/benchmarks/stubs.py
+"""
+Stand-ins for the LLM and (optionally) the embedding model in benchmarks.
+
+StubLLM mimics llama_cpp.Llama.create_chat_completion() with a fixed delay,
+so chat and summary timings measure this project's code rather than a model
+or Groq. StubEmbedder returns deterministic vectors without loading a model.
+"""
+
+import time
+import hashlib
+from typing import List
+
+import numpy as np
+
+class StubLLM:
+    """
+    Fake chat model returning a canned reply after a fixed delay.
+
+    Args:
+        latency_ms: Simulated generation time per call (milliseconds).
+    """
+
+    def __init__(self, latency_ms: float = 0):
+        self.latency = max(0.0, latency_ms) / 1000
+        self.calls = 0
+
+    def create_chat_completion(self, messages: List[dict], **kwargs) -> dict:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        prompt_chars = sum(len(m.get("content", "")) for m in messages)
+        return {
+            "choices": [{
+                "message": {
+                    "role": "assistant",
+                    "content": f"Stub answer ({prompt_chars} prompt characters).\nSuggestion: none\nSources:\n- stub"
+                }
+            }]
+        }
+
+class StubEmbedder:
+    """
+    Deterministic hash-seeded embeddings with the SentenceTransformer encode() API.
+
+    Args:
+        dimension: Embedding size.
+    """
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        if isinstance(texts, str):
+            texts = [texts]
+        out = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            seed = int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+            vector = np.random.default_rng(seed).standard_normal(self.dimension).astype(np.float32)
+            out[row] = vector / np.linalg.norm(vector)
+        return out
+
+def install_stub_llm(latency_ms: float = 0) -> StubLLM:
+    """
+    Make get_llm() return a StubLLM for the rest of the process.
+    """
+    from core import llm_singleton
+    llm = StubLLM(latency_ms)
+    llm_singleton._llm = llm
+    return llm
+
+def install_stub_embedder(dimension: int = 384) -> StubEmbedder:
+    """
+    Make every EnhancedContentProcessor use a StubEmbedder.
+    """
+    from core.processor import EnhancedContentProcessor
+    embedder = StubEmbedder(dimension)
+    EnhancedContentProcessor._embedding_model = embedder
+    return embedder
@@ -0,0 +1,185 @@
+# ~/benchmarks/synthetic_site.py
+"""
+Generated website served from a local HTTP server, for offline benchmarks.
+
+Pages are built deterministically from a seed: each has a title, headings,
+a configurable amount of body text drawn from a synthetic vocabulary and a
+fixed number of links to other pages. A fraction of pages can be JS-only
+(an empty shell that writes its content from a script), and every response
+can be delayed to simulate network latency. robots.txt, sitemap.xml (with
+lastmod) and ETag/304 revalidation are supported so discovery and sync paths
+run too; ETags can be turned off to mimic servers without validators, and
+touch() edits pages between crawls to exercise sync.
+"""
+
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict
+
+LASTMOD = "2020-01-01"
+
+class SyntheticSite:
+    """
+    A generated website served on 127.0.0.1.
+
+    Args:
+        pages: Number of pages.
+        fanout: Links from each page to other pages.
+        page_words: Words of body text per page.
+        latency_ms: Delay added to every response (milliseconds).
+        js_fraction: Fraction of pages that only render with JavaScript.
+        seed: Random seed for page content and link structure.
+        validators: Send ETags and answer If-None-Match with 304.
+    """
+
+    def __init__(self, pages: int = 100, fanout: int = 8, page_words: int = 800,
+                 latency_ms: float = 20, js_fraction: float = 0.0, seed: int = 42, validators: bool = True):
+        self.pages = max(1, pages)
+        self.fanout = max(0, min(fanout, self.pages - 1))
+        self.page_words = max(1, page_words)
+        self.latency = max(0.0, latency_ms) / 1000
+        self.js_fraction = min(max(js_fraction, 0.0), 1.0)
+        self.seed = seed
+        self.validators = validators
+        self.requests = 0
+        self.page_requests = 0
+
+        rng = random.Random(seed)
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        self.vocabulary = [
+            ''.join(rng.choice(letters) for _ in range(rng.randint(3, 10)))
+            for _ in range(5000)
+        ]
+        self._js_pages = {i for i in range(1, self.pages) if rng.random() < self.js_fraction}
+        self._cache: Dict[int, bytes] = {}
+        self._revisions: Dict[int, int] = {}
+        self._lastmod: Dict[int, str] = {}
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/"
+
+    def config(self) -> Dict:
+        return {
+            'pages': self.pages,
+            'fanout': self.fanout,
+            'page_words': self.page_words,
+            'latency_ms': self.latency * 1000,
+            'js_fraction': self.js_fraction,
+            'js_pages': len(self._js_pages),
+            'seed': self.seed,
+            'validators': self.validators
+        }
+
+    def touch(self, *pages: int):
+        """
+        Change the content (and ETag) of pages and set their sitemap lastmod to now.
+        """
+        for i in pages:
+            self._revisions[i] = self._revisions.get(i, 0) + 1
+            self._lastmod[i] = datetime.now().astimezone().isoformat()
+            self._cache.pop(i, None)
+
+    def path(self, i: int) -> str:
+        return "/" if i == 0 else f"/page/{i}"
+
+    def page_html(self, i: int) -> bytes:
+        if i in self._cache:
+            return self._cache[i]
+        rng = random.Random(self.seed * 1000003 + i)
+        words = [rng.choice(self.vocabulary) for _ in range(self.page_words)]
+        paragraphs = [' '.join(words[k:k + 80]) for k in range(0, len(words), 80)]
+        sections = ''.join(
+            f"<h2>Section {n} {words[n * 80 % len(words)]}</h2><p>{p}</p>"
+            for n, p in enumerate(paragraphs)
+        )
+        targets = rng.sample([j for j in range(self.pages) if j != i], self.fanout) if self.fanout else []
+        links = ''.join(f'<li><a href="{self.path(j)}">Page {j}</a></li>' for j in targets)
+        title = f"Page {i} {words[0]}"
+        if i in self._revisions:
+            sections += f"<p>Revision {self._revisions[i]} of page {i}</p>"
+
+        if i in self._js_pages:
+            payload = json.dumps(f"<main><h1>{title}</h1>{sections}<ul>{links}</ul></main>")
+            body = f'<div id="app"></div><script>document.getElementById("app").innerHTML = {payload};</script>'
+        else:
+            body = f"<main><h1>{title}</h1>{sections}<ul>{links}</ul></main>"
+        html = (
+            f"<!DOCTYPE html><html><head><title>{title}</title></head><body>"
+            f"<header><nav><a href=\"/\">Home</a></nav></header>{body}"
+            f"<footer>Synthetic benchmark site</footer></body></html>"
+        ).encode()
+        self._cache[i] = html
+        return html
+
+    def robots_txt(self, host: str) -> bytes:
+        return f"User-agent: *\nAllow: /\nSitemap: http://{host}/sitemap.xml\n".encode()
+
+    def sitemap_xml(self, host: str) -> bytes:
+        urls = ''.join(
+            f"<url><loc>http://{host}{self.path(i)}</loc><lastmod>{self._lastmod.get(i, LASTMOD)}</lastmod></url>"
+            for i in range(self.pages)
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+        ).encode()
+
+    def start(self) -> "SyntheticSite":
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes = b"", content_type: str = "text/html", headers: Dict = None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                site.requests += 1
+                if site.latency:
+                    time.sleep(site.latency)
+                host = self.headers.get("Host", "127.0.0.1")
+                path = self.path.split("?", 1)[0].split("#", 1)[0]
+                if path == "/robots.txt":
+                    return self._send(200, site.robots_txt(host), "text/plain")
+                if path == "/sitemap.xml":
+                    return self._send(200, site.sitemap_xml(host), "application/xml")
+                if path == "/":
+                    i = 0
+                elif path.startswith("/page/") and path[6:].isdigit() and int(path[6:]) < site.pages:
+                    i = int(path[6:])
+                else:
+                    return self._send(404)
+                site.page_requests += 1
+                if not site.validators:
+                    return self._send(200, site.page_html(i))
+                etag = f'"p{site.seed}-{i}-{site._revisions.get(i, 0)}"'
+                if self.headers.get("If-None-Match") == etag:
+                    return self._send(304, headers={"ETag": etag})
+                self._send(200, site.page_html(i), headers={"ETag": etag})
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="synthetic-site", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
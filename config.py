@@ -15,14 +15,69 @@ class Config:
 
     Attributes:
         CHROMA_DB_PATH (str): Path to ChromaDB persistent storage.
+        COLLECTION_REGISTRY_PATH (str): SQLite file mapping domains to collections and index settings.
+        HTTP_CACHE_PATH (str): Path to the HTTP validator cache used by sync.
+        CRAWL_STATE_DB_PATH (str): SQLite file holding persistent crawl state.
+        ARCHIVE_PATH (str): Directory of the compressed raw-HTML page archive.
+        ARCHIVE_ENABLED (bool): Write fetched HTML to the page archive during crawls.
+        ARCHIVE_COMPRESSION_LEVEL (int): zstd compression level of archive records.
+        ARCHIVE_MAX_SEGMENTS (int): Archive segments per domain before they are compacted to the newest record of each URL (0 disables).
+        CHECKPOINT_PATH (str): Directory of resumable domain crawl checkpoints.
+        CHECKPOINT_EVERY_PAGES (int): Pages visited between crawl checkpoints (0 disables).
         LLAMA_MODEL_PATH (str): Path to GGUF model for llama-cpp-python.
         EMBEDDING_MODEL (str): Embedding model name.
+        EMBEDDING_BACKEND (str): Embedding runtime: "torch" or "onnx" (int8 ONNX Runtime on CPU).
+        ONNX_MODEL_PATH (str): Directory of exported int8 ONNX embedding models.
+        ONNX_THREADS (int): ONNX Runtime intra-op threads (0 = runtime default).
         CHUNK_SIZE (int): Number of characters per content chunk.
         CHUNK_OVERLAP (int): Overlap between chunks for context.
         CONTEXT_CHUNKS (int): Number of chunks to use for context in RAG.
+        PIPELINE_QUEUE_SIZE (int): Pages buffered between crawl and indexing stages.
+        PIPELINE_EMBED_BATCH (int): Maximum chunks per streamed embedding batch.
+        EMBED_CACHE_PATH (str): Directory of the on-disk embedding cache.
+        EMBED_CACHE_MEMORY_ITEMS (int): Embeddings kept in the in-memory LRU tier (0 disables).
+        EMBED_CACHE_DISK_MB (int): Size of the memory-mapped disk tier per model (0 disables).
+        EMBED_BATCH_SIZE (int): Texts per embedding model forward pass.
+        EMBED_PROCESSES (int): Multi-process encode workers (0 = encode in the calling thread).
+        EMBED_MULTIPROCESS_MIN (int): Fewest texts in one call worth sending to the process pool.
         MAX_PAGES (int): Maximum pages to crawl per domain.
-        CRAWL_DELAY (int): Delay between crawl requests (seconds).
+        CRAWL_MAX_DEPTH (int): Maximum link hops from the homepage.
+        SITEMAP_MAX_URLS (int): Maximum sitemap URLs read per domain.
+        SITEMAP_MAX_FILES (int): Maximum sitemap files read per domain.
+        URL_MAX_LENGTH (int): Longer URLs are treated as crawler traps.
+        URL_MAX_PATH_DEPTH (int): URLs with more path segments are treated as traps.
+        URL_MAX_SEGMENT_REPEAT (int): Times one path segment may repeat before a URL is a trap.
+        URL_MAX_QUERY_PARAMS (int): URLs with more distinct query parameters are treated as traps.
+        URL_MAX_QUERY_VARIANTS (int): Distinct query strings crawled per path before further ones are traps.
+        CRAWL_DELAY (int): Initial delay between requests to a host (seconds); adapted per host at runtime.
+        RATE_MIN_DELAY (float): Smallest per-host delay the rate limiter may speed up to (seconds).
+        RATE_MAX_DELAY (float): Largest per-host delay the rate limiter may slow down to (seconds).
+        RATE_FAST_LATENCY (float): Response time below which a host is sped up (seconds).
+        RATE_SLOW_LATENCY (float): Response time above which a host is slowed down (seconds).
+        RATE_MAX_BACKOFF (float): Longest Retry-After pause honoured after 429/503 (seconds).
+        RATE_MAX_RETRIES (int): Retries of a URL answered with 429/503.
+        CRAWL_CONCURRENCY (int): Maximum concurrent fetches across all hosts.
+        CRAWL_HOST_CONCURRENCY (int): Maximum concurrent fetches per host.
+        CRAWL_TIMEOUT (int): HTTP request timeout (seconds).
+        HTTP2 (bool): Negotiate HTTP/2 when the h2 package is installed.
+        HTTP_MAX_CONNECTIONS (int): Connection pool size of the shared HTTP clients.
+        HTTP_KEEPALIVE_EXPIRY (int): Seconds an idle pooled connection is kept open.
+        BROWSER_POOL_SIZE (int): Maximum pooled Playwright browsers.
+        BROWSER_RECYCLE_PAGES (int): Pages rendered before a browser is relaunched.
+        RENDER_MODE (str): Playwright render mode ("light" blocks assets and trackers, "full" waits for network idle).
+        RENDER_SETTLE_MS (int): Maximum wait for network quiet after DOMContentLoaded in light mode (ms).
+        FETCH_RENDER_STREAK (int): Consecutive render-only pages before a host is rendered directly.
+        FETCH_REPROBE_EVERY (int): Directly rendered pages between plain HTTP re-probes of a host.
         MAX_CONTENT_LENGTH (int): Maximum characters per page.
+        HTML_PARSER (str): HTML parser backend ("lxml" or "html.parser").
+        EXTRACT_WORKERS (int): Extraction worker processes (0 = extract in a thread).
+        BULK_WORKERS (int): Extraction worker processes for offline bulk ingestion.
+        BULK_BATCH_PAGES (int): Pages sent to an extraction worker per task during bulk ingestion.
+        BULK_MAX_FILE_BYTES (int): HTML files or WARC records larger than this are skipped by bulk ingestion.
+        NEAR_DUPLICATE_DISTANCE (int): Max SimHash bit distance treated as a duplicate page (-1 disables).
+        BOILERPLATE_MIN_PAGES (int): Pages a text block must appear on to count as site template (0 disables).
+        BOILERPLATE_MIN_RATIO (float): Minimum share of a site's pages a template block appears on.
+        BOILERPLATE_WARMUP (int): Pages held back at the start of a crawl to learn the template from.
         MAX_CHAT_HISTORY (int): Number of chat messages to keep per session.
         LLM_PROVIDER (str): LLM provider ("local" or "groq").
         GROQ_API_KEY (str): API key for Groq provider.
@@ -34,20 +89,75 @@ class Config:
 
     # Local storage configuration
     CHROMA_DB_PATH = os.path.join(os.getcwd(), "storage", "chroma_storage")
+    COLLECTION_REGISTRY_PATH = os.path.join(os.getcwd(), "storage", "collection_registry.db")
+    HTTP_CACHE_PATH = os.path.join(os.getcwd(), "storage", "http_cache")
+    CRAWL_STATE_DB_PATH = os.path.join(os.getcwd(), "storage", "crawl_state.db")
+    ARCHIVE_PATH = os.path.join(os.getcwd(), "storage", "page_archive")
+    ARCHIVE_ENABLED = True          # Keep raw HTML so pages can be re-extracted offline
+    ARCHIVE_COMPRESSION_LEVEL = 3   # zstd level of archive records
+    ARCHIVE_MAX_SEGMENTS = 8        # Segments per domain before compaction (0 disables)
+    CHECKPOINT_PATH = os.path.join(os.getcwd(), "storage", "crawl_checkpoints")
+    CHECKPOINT_EVERY_PAGES = 100    # Pages visited between crawl checkpoints (0 disables)
     LLAMA_MODEL_PATH = os.path.join(os.getcwd(), "storage", "models", "mistral-7b-instruct-v0.2.Q3_K_M.gguf")
     # Alternative model path example:
     # LLAMA_MODEL_PATH = os.path.join(os.getcwd(), "storage", "models", "phi-2.Q3_K_L.gguf")
 
     # Embedding model configuration
     EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+    EMBEDDING_BACKEND = "torch"     # "torch" (sentence-transformers) or "onnx" (int8 ONNX Runtime)
+    ONNX_MODEL_PATH = os.path.join(os.getcwd(), "storage", "onnx_models")
+    ONNX_THREADS = 0                # ONNX Runtime intra-op threads (0 = runtime default)
     CHUNK_SIZE = 1000
     CHUNK_OVERLAP = 200
     CONTEXT_CHUNKS = 5
+    PIPELINE_QUEUE_SIZE = 32        # Pages buffered between crawl and indexing stages
+    PIPELINE_EMBED_BATCH = 64       # Maximum chunks per streamed embedding batch
+    EMBED_CACHE_PATH = os.path.join(os.getcwd(), "storage", "embedding_cache")
+    EMBED_CACHE_MEMORY_ITEMS = 20000  # Embeddings in the in-memory LRU tier (0 disables)
+    EMBED_CACHE_DISK_MB = 1024      # Memory-mapped disk tier size per model (0 disables)
+    EMBED_BATCH_SIZE = 32           # Texts per embedding model forward pass
+    EMBED_PROCESSES = 0             # Multi-process encode workers (0 = encode in the calling thread)
+    EMBED_MULTIPROCESS_MIN = 512    # Fewest texts in one call worth sending to the process pool
 
     # Crawling configuration
     MAX_PAGES = 25                  # Maximum pages to crawl per domain
-    CRAWL_DELAY = 1                 # Delay between requests in seconds
+    CRAWL_MAX_DEPTH = 3             # Maximum link hops from the homepage
+    SITEMAP_MAX_URLS = 5000         # Maximum sitemap URLs read per domain
+    SITEMAP_MAX_FILES = 50          # Maximum sitemap files read per domain
+    URL_MAX_LENGTH = 512            # Longer URLs are treated as crawler traps
+    URL_MAX_PATH_DEPTH = 10         # Maximum path segments per URL
+    URL_MAX_SEGMENT_REPEAT = 2      # Times one path segment may repeat in a URL
+    URL_MAX_QUERY_PARAMS = 5        # Maximum distinct query parameters per URL
+    URL_MAX_QUERY_VARIANTS = 20     # Query-string variants crawled per path
+    CRAWL_DELAY = 1                 # Initial delay between requests to a host in seconds
+    RATE_MIN_DELAY = 0.1            # Fastest per-host delay when no Crawl-delay is set
+    RATE_MAX_DELAY = 30             # Slowest per-host delay
+    RATE_FAST_LATENCY = 0.5         # Responses faster than this speed a host up (seconds)
+    RATE_SLOW_LATENCY = 3           # Responses slower than this slow a host down (seconds)
+    RATE_MAX_BACKOFF = 120          # Longest Retry-After pause honoured (seconds)
+    RATE_MAX_RETRIES = 2            # Retries of a URL answered with 429/503
+    CRAWL_CONCURRENCY = 10          # Maximum concurrent fetches across all hosts
+    CRAWL_HOST_CONCURRENCY = 4      # Maximum concurrent fetches per host
+    CRAWL_TIMEOUT = 10              # HTTP request timeout in seconds
+    HTTP2 = True                    # Negotiate HTTP/2 when h2 is installed
+    HTTP_MAX_CONNECTIONS = 100      # Connection pool size of the shared HTTP clients
+    HTTP_KEEPALIVE_EXPIRY = 30      # Seconds an idle pooled connection is kept open
+    BROWSER_POOL_SIZE = 2           # Maximum pooled Playwright browsers
+    BROWSER_RECYCLE_PAGES = 50      # Pages rendered before a browser is relaunched
+    RENDER_MODE = "light"           # Playwright render mode: "light" or "full"
+    RENDER_SETTLE_MS = 1000         # Max wait for network quiet after DOMContentLoaded (ms)
+    FETCH_RENDER_STREAK = 3         # Render-only pages in a row before a host skips plain HTTP
+    FETCH_REPROBE_EVERY = 20        # Directly rendered pages between plain HTTP re-probes
     MAX_CONTENT_LENGTH = 10000      # Maximum characters per page content
+    HTML_PARSER = "lxml"            # HTML parser backend: "lxml" or "html.parser"
+    EXTRACT_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))  # Extraction worker processes
+    BULK_WORKERS = max(1, (os.cpu_count() or 2) - 1)  # Extraction processes for bulk ingestion
+    BULK_BATCH_PAGES = 32           # Pages per extraction task in bulk ingestion
+    BULK_MAX_FILE_BYTES = 5 * 1024 * 1024  # Larger HTML files/records are skipped
+    NEAR_DUPLICATE_DISTANCE = 3     # Max SimHash bit distance for duplicate pages (-1 disables)
+    BOILERPLATE_MIN_PAGES = 3       # Pages a block must repeat on to be template (0 disables)
+    BOILERPLATE_MIN_RATIO = 0.3     # Share of a site's pages a template block appears on
+    BOILERPLATE_WARMUP = 10         # Pages held back at crawl start to learn the template
 
     # Chat configuration
     MAX_CHAT_HISTORY = 20           # Number of chat messages to keep per session
@@ -10,6 +10,7 @@ managing chat history, and generating summaries and reports.
 import uuid
 from core.crawler import EnhancedDomainCrawler, fetch_html
 from core.processor import EnhancedContentProcessor
+from core.pipeline import IndexingPipeline
 from core.llm_local import LlamaCppAnalyzer
 from typing import Dict, Tuple, List
 from datetime import datetime
@@ -36,12 +37,16 @@ class EnhancedDomainAnalyzer:
         self.doc_analyzer = None
         self.session_id = None
 
-    def analyze_domain(self, domain: str) -> Tuple[str, str]:
-        logger.info(f"Starting domain analysis for: {domain}")
+    def analyze_domain(self, domain: str, resume: bool = False) -> Tuple[str, str]:
+        logger.info(f"Starting domain analysis for: {domain} (resume: {resume})")
         if not domain.startswith(("http://", "https://")):
             domain = "https://" + domain
 
-        domain_data = self.crawler.crawl_domain(domain)
+        # Pages are chunked, embedded and stored while the crawl continues
+        pipeline = IndexingPipeline(self.processor)
+        domain_data, collection_name = pipeline.run(
+            domain, lambda emit: self.crawler.crawl_domain(domain, on_pages=emit, resume=resume)
+        )
         self.current_domain_data = domain_data
         self.last_sync_time = datetime.now()
 
@@ -49,7 +54,6 @@ class EnhancedDomainAnalyzer:
             logger.warning(f"No pages could be crawled from the domain: {domain}")
             return "Error: No pages could be crawled from the domain.", ""
 
-        collection_name = self.processor.process_domain_data(domain_data)
         self.current_domain = collection_name
         self.analyzer.clear_history()
 
@@ -181,6 +185,13 @@ class EnhancedDomainAnalyzer:
             logger.warning("Sync is only supported for crawled domains, not uploaded files or multiple URLs.")
             return "Error: Sync is only supported for crawled domains, not uploaded files or multiple URLs."
 
+        if not self.processor.index_matches(original_domain_string):
+            # Sync only embeds changed pages, which must not mix with chunks built differently
+            logger.warning("Embedding or chunking settings changed since the last index; re-indexing before sync.")
+            result = self.reindex_domain()
+            if result.startswith("Error"):
+                return result
+
         try:
             domain_data = self.crawler.crawl_domain(original_domain_string, sync_mode=True)
             self.processor.process_domain_data(domain_data, sync_mode=True)
@@ -195,6 +206,31 @@ class EnhancedDomainAnalyzer:
             logger.error(f"Sync failed: {e}")
             return f"Error: Sync failed: {str(e)}"
 
+    def reindex_domain(self) -> str:
+        """
+        Rebuild the current domain's collection from the page archive,
+        applying the current extraction and chunking settings without
+        fetching anything.
+        """
+        logger.info("Re-indexing domain data for current session from the page archive.")
+        domain = self.processor.domain_metadata.get('domain')
+        if not self.current_domain or not domain or domain.startswith("uploads:") or domain == 'multiple-urls':
+            logger.error("No crawled domain to re-index.")
+            return "Error: Re-index is only supported for crawled domains."
+
+        try:
+            domain_data = self.crawler.reindex_domain(domain)
+            if not domain_data["pages"]:
+                logger.warning(f"No archived pages for {domain}")
+                return "Error: No archived pages for this domain. Analyze it again to build the archive."
+            self.current_domain = self.processor.process_domain_data(domain_data)
+            self.current_domain_data = domain_data
+            logger.info("Re-index completed successfully.")
+            return f"Success: Re-indexed {domain_data['total_pages']} pages from the archive."
+        except Exception as e:
+            logger.error(f"Re-index failed: {e}")
+            return f"Error: Re-index failed: {str(e)}"
+
     def chat_with_domain(self, message: str) -> str:
         logger.info(f"Chat with domain context: {message}")
         if self.current_domain and (not self.processor.collection or self.processor.collection.name != self.current_domain):
@@ -274,6 +310,7 @@ class EnhancedDomainAnalyzer:
 - Sync Detected: ✅
 - New Pages: {len(sync.get('new_pages', []))}
 - Updated Pages: {len(sync.get('updated_pages', []))}
+- Removed Pages: {len(sync.get('removed_pages', []))}
 - Total Changes: {sync['total_changes']}
 """
         return report
@@ -0,0 +1,117 @@
+# ~/core/boilerplate.py
+"""
+Cross-page boilerplate removal for the Enhanced Domain Intelligence Analyzer.
+
+Extraction already drops nav/header/footer elements, but cookie banners,
+sidebars, calls to action and mega-menus built from plain divs survive on
+every page. SiteTemplate counts on how many of a site's pages each text
+block (one line of extracted content) appears; blocks repeated on enough
+pages are the site template and are stripped before chunking, so they are
+not embedded once per page.
+"""
+
+from hashlib import blake2b
+from typing import Dict, Iterable, List, Set
+
+from config import Config
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+def block_key(block: str) -> str:
+    """
+    Stable key of a text block, ignoring case and spacing.
+    """
+    normalized = ' '.join(block.lower().split())
+    return blake2b(normalized.encode(), digest_size=8).hexdigest()
+
+def template_id(keys: Iterable[str]) -> str:
+    """
+    Stable id of the template blocks stripped from a page ('' for none).
+    """
+    keys = sorted(set(keys))
+    return blake2b(' '.join(keys).encode(), digest_size=8).hexdigest() if keys else ""
+
+class SiteTemplate:
+    """
+    Learns the repeated text blocks of one site and strips them from pages.
+
+    Args:
+        known: Template block keys cached from an earlier crawl.
+        min_pages: Pages a block must appear on (defaults to Config.BOILERPLATE_MIN_PAGES).
+        min_ratio: Share of observed pages a block must appear on
+            (defaults to Config.BOILERPLATE_MIN_RATIO).
+    """
+
+    def __init__(self, known: Iterable[str] = (), min_pages: int = None, min_ratio: float = None):
+        self.min_pages = Config.BOILERPLATE_MIN_PAGES if min_pages is None else min_pages
+        self.min_ratio = Config.BOILERPLATE_MIN_RATIO if min_ratio is None else min_ratio
+        self.known: Set[str] = set(known)
+        self.pages_seen = 0
+        self._counts: Dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.min_pages > 0
+
+    def to_state(self) -> Dict:
+        return {'known': sorted(self.known), 'pages_seen': self.pages_seen, 'counts': self._counts}
+
+    def load_state(self, state: Dict):
+        self.known = set(state['known'])
+        self.pages_seen = state['pages_seen']
+        self._counts = dict(state['counts'])
+
+    def observe(self, page: Dict):
+        """
+        Count the distinct blocks of one page.
+        """
+        if not self.enabled:
+            return
+        self.pages_seen += 1
+        for key in {block_key(block) for block in page['content'].split('\n') if block.strip()}:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def learned(self) -> Set[str]:
+        """
+        Block keys that qualify as template on the pages observed so far.
+        """
+        threshold = max(self.min_pages, self.min_ratio * self.pages_seen)
+        return {key for key, count in self._counts.items() if count >= threshold}
+
+    def blocks(self) -> Set[str]:
+        """
+        Template block keys: learned on this crawl plus the cached ones.
+        """
+        return self.learned() | self.known if self.enabled else set()
+
+    def strip(self, pages: List[Dict]) -> List[Dict]:
+        """
+        Return a new list of pages with template blocks removed (pages
+        without template blocks are passed through as is).
+
+        content_hash is left as is so change detection still compares the
+        pages as served; word_count is recomputed and template_id records
+        which blocks were stripped, so a page is re-chunked when a changed
+        template strips it differently.
+        """
+        template = self.blocks()
+        if not template:
+            return list(pages)
+        stripped, removed = [], 0
+        for page in pages:
+            blocks = page['content'].split('\n')
+            keys = [block_key(block) for block in blocks]
+            kept = [block for block, key in zip(blocks, keys) if key not in template]
+            if len(kept) == len(blocks):
+                stripped.append(page)
+                continue
+            removed += len(blocks) - len(kept)
+            page = dict(page)
+            page['content'] = '\n'.join(kept)
+            page['template_id'] = template_id(key for key in keys if key in template)
+            page['word_count'] = len(page['content'].split())
+            stripped.append(page)
+        logger.debug(f"Stripped {removed} template blocks from {len(pages)} pages")
+        return stripped
@@ -0,0 +1,245 @@
+# ~/core/browser_pool.py
+"""
+Long-lived headless Chromium pool for Playwright render fallbacks.
+
+Playwright's sync API binds every object to the thread that created it, so
+each browser lives on its own worker thread and render jobs are handed to the
+workers through a queue. Every job gets a fresh, isolated browser context.
+Browsers are relaunched after a configurable number of pages and all of them
+are closed cleanly when the process exits.
+
+In the default "light" render mode images, fonts, media, stylesheets and
+known tracker hosts are blocked, and navigation waits for DOMContentLoaded
+plus a short settle period instead of network idle.
+"""
+
+import atexit
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from urllib.parse import urlparse
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from config import Config
+from core.http_client import DEFAULT_HEADERS
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+__all__ = ["BrowserPool", "get_browser_pool"]
+
+_pool = None
+_lock = threading.Lock()
+
+# Resource types never needed to read a page's text
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet", "texttrack", "eventsource", "websocket", "manifest", "other"}
+
+# Analytics, ad and tag-manager hosts (suffix match)
+BLOCKED_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "googlesyndication.com",
+    "doubleclick.net", "googleadservices.com", "connect.facebook.net",
+    "hotjar.com", "segment.io", "cdn.segment.com", "mixpanel.com",
+    "amplitude.com", "clarity.ms", "bat.bing.com", "ads-twitter.com",
+    "px.ads.linkedin.com", "snap.licdn.com", "criteo.com", "taboola.com", "outbrain.com",
+    "newrelic.com", "nr-data.net", "sentry.io", "intercom.io", "hubspot.com",
+    "hs-scripts.com", "optimizely.com", "quantserve.com", "scorecardresearch.com"
+)
+
+def _is_blocked_host(url: str) -> bool:
+    host = urlparse(url).hostname or ""
+    return any(host == h or host.endswith("." + h) for h in BLOCKED_HOSTS)
+
+def _route_light(route):
+    """
+    Abort sub-resources that do not contribute page text.
+    """
+    request = route.request
+    if request.is_navigation_request() and request.frame.parent_frame is None:
+        route.continue_()
+    elif request.resource_type in BLOCKED_RESOURCE_TYPES or _is_blocked_host(request.url):
+        route.abort()
+    else:
+        route.continue_()
+
+class BrowserPool:
+    """
+    Fixed-size pool of Chromium browsers, each owned by one worker thread.
+
+    Args:
+        max_browsers: Maximum number of browsers running at once.
+        recycle_after: Pages rendered before a browser is relaunched.
+        user_agent: User-Agent used for every browser context.
+        render_mode: "light" blocks non-document resources and waits for
+            DOMContentLoaded plus settle_ms; "full" loads everything and
+            waits for network idle.
+        settle_ms: Maximum extra wait for network quiet in light mode.
+    """
+
+    # Seconds a caller waits beyond the navigation timeout (queueing, relaunches)
+    RESULT_HEADROOM = 30.0
+
+    def __init__(self, max_browsers: int, recycle_after: int, user_agent: str,
+                 render_mode: str = "light", settle_ms: int = 1000):
+        self.max_browsers = max(1, max_browsers)
+        self.recycle_after = max(1, recycle_after)
+        self.user_agent = user_agent
+        self.render_mode = render_mode
+        self.settle_ms = max(0, settle_ms)
+        self._jobs = queue.Queue()
+        self._workers = []
+        self._pending = 0
+        self._closed = False
+        self._workers_lock = threading.Lock()
+
+    def render(self, url: str, timeout: int = 15000) -> str:
+        """
+        Render a URL in a pooled browser and return the page HTML.
+
+        Args:
+            url: URL to render.
+            timeout: Navigation timeout in milliseconds.
+
+        Returns:
+            str: Rendered HTML.
+
+        Raises:
+            RuntimeError: If the pool has been shut down.
+            TimeoutError: If no result arrived in time; a job still queued
+                is cancelled, so no browser renders it for nobody.
+            Exception: Any Playwright navigation error.
+        """
+        if self._closed:
+            raise RuntimeError("Browser pool is shut down")
+        future = Future()
+        self._ensure_worker()
+        self._jobs.put((url, timeout, future))
+        try:
+            return future.result(timeout=timeout / 1000 + self.RESULT_HEADROOM)
+        except FutureTimeoutError:
+            # Workers skip cancelled jobs; a render already running ends
+            # within its own navigation timeout
+            if future.cancel():
+                logger.warning(f"Render of {url} timed out waiting for a browser; job dropped")
+            raise
+        finally:
+            with self._workers_lock:
+                self._pending -= 1
+
+    def shutdown(self):
+        """
+        Stop all workers and close their browsers.
+        """
+        with self._workers_lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+        for _ in workers:
+            self._jobs.put(None)
+        for worker in workers:
+            worker.join(timeout=10)
+        logger.info(f"Browser pool shut down ({len(workers)} browsers)")
+
+    def _ensure_worker(self):
+        """
+        Register a pending job and start another worker if every running
+        worker is already busy and the pool is not full.
+        """
+        with self._workers_lock:
+            self._pending += 1
+            if len(self._workers) >= self.max_browsers or self._pending <= len(self._workers):
+                return
+            worker = threading.Thread(
+                target=self._run_worker,
+                name=f"browser-pool-{len(self._workers)}",
+                daemon=True
+            )
+            self._workers.append(worker)
+            worker.start()
+            logger.info(f"Started browser pool worker {len(self._workers)}/{self.max_browsers}")
+
+    def _run_worker(self):
+        playwright = None
+        browser = None
+        pages_rendered = 0
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    break
+                url, timeout, future = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    if browser is None or pages_rendered >= self.recycle_after:
+                        if browser is not None:
+                            logger.info(f"Recycling browser after {pages_rendered} pages")
+                            browser.close()
+                        if playwright is None:
+                            playwright = sync_playwright().start()
+                        browser = playwright.chromium.launch(headless=True)
+                        pages_rendered = 0
+
+                    context = browser.new_context(user_agent=self.user_agent)
+                    try:
+                        html = self._render_page(context, url, timeout)
+                    finally:
+                        context.close()
+                    pages_rendered += 1
+                    future.set_result(html)
+                except Exception as e:
+                    future.set_exception(e)
+                    # A crashed browser would fail every later job, so drop it
+                    if browser is not None and not browser.is_connected():
+                        browser = None
+        finally:
+            try:
+                if browser is not None:
+                    browser.close()
+                if playwright is not None:
+                    playwright.stop()
+            except Exception as e:
+                logger.error(f"Error closing pooled browser: {e}")
+
+    def _render_page(self, context, url: str, timeout: int) -> str:
+        if self.render_mode != "light":
+            page = context.new_page()
+            page.goto(url, timeout=timeout, wait_until="networkidle")
+            return page.content()
+
+        context.route("**/*", _route_light)
+        page = context.new_page()
+        page.goto(url, timeout=timeout, wait_until="domcontentloaded")
+        if self.settle_ms:
+            # Give client-side rendering a moment, but never wait out
+            # beacons that keep the network busy
+            try:
+                page.wait_for_load_state("networkidle", timeout=self.settle_ms)
+            except PlaywrightTimeoutError:
+                pass
+        return page.content()
+
+def get_browser_pool() -> BrowserPool:
+    """
+    Thread-safe function to return the process-wide browser pool.
+    The pool is created on first use and shut down at process exit.
+
+    Returns:
+        BrowserPool instance
+    """
+    global _pool
+    if _pool is not None:
+        return _pool
+
+    with _lock:
+        if _pool is None:
+            _pool = BrowserPool(
+                max_browsers=Config.BROWSER_POOL_SIZE,
+                recycle_after=Config.BROWSER_RECYCLE_PAGES,
+                user_agent=DEFAULT_HEADERS['User-Agent'],
+                render_mode=Config.RENDER_MODE,
+                settle_ms=Config.RENDER_SETTLE_MS
+            )
+            atexit.register(_pool.shutdown)
+            logger.info(f"Browser pool ready (max {Config.BROWSER_POOL_SIZE} browsers, {Config.RENDER_MODE} render mode)")
+        return _pool
@@ -0,0 +1,257 @@
+# ~/core/bulk_ingest.py
+"""
+Offline bulk ingestion for the Enhanced Domain Intelligence Analyzer.
+
+Indexes existing site mirrors and WARC files (.warc, .warc.gz, .warc.zst,
+e.g. from other crawlers or this project's page archive) without any
+network access. Inputs are streamed: HTML is read lazily, extracted in
+batches by a private process pool with a bounded number of tasks in
+flight, near-duplicates are dropped, and the pages then flow through the
+chunk -> embed -> upsert IndexingPipeline, whose bounded queues hold the
+readers back when embedding is the bottleneck. Memory therefore stays flat
+however many pages are ingested.
+
+Command line:
+
+    python -m core.bulk_ingest dumps/*.warc.gz mirror/ --base-url https://example.com
+"""
+
+import argparse
+import json
+import os
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+from urllib.parse import quote
+from config import Config
+from core.dedup import NearDuplicateIndex, drop_near_duplicates
+from core.extract_pool import new_extraction_pool
+from core.html_extract import decode_html, extract_pages
+from core.page_archive import open_warc, read_warc
+from core.pipeline import IndexingPipeline
+from core.processor import EnhancedContentProcessor
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+WARC_SUFFIXES = ('.warc', '.warc.gz', '.warc.zst')
+HTML_SUFFIXES = ('.html', '.htm', '.xhtml')
+INDEX_FILES = ('index.html', 'index.htm')
+
+def _new_stats() -> Dict:
+    return {
+        'inputs': 0,
+        'documents': 0,
+        'bytes': 0,
+        'skipped_inputs': 0,
+        'failed': 0,
+        'short': 0,
+        'duplicates': 0,
+        'pages': 0,
+        'chunks': 0
+    }
+
+def iter_warc(path: str, stats: Dict) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (html, url) for every successful HTML response in a WARC file.
+    """
+    with open_warc(path) as stream:
+        for record in read_warc(stream, max_bytes=Config.BULK_MAX_FILE_BYTES):
+            content_type = record['headers'].get('content-type', 'text/html').lower()
+            if record['status'] != 200 or 'html' not in content_type or not record['html']:
+                stats['skipped_inputs'] += 1
+                continue
+            stats['bytes'] += len(record['html'])
+            yield record['html'], record['url']
+
+def _file_url(root: str, path: str, base_url: str) -> str:
+    if not base_url:
+        return Path(path).resolve().as_uri()
+    relative = os.path.relpath(path, root).replace(os.sep, '/')
+    if relative.split('/')[-1].lower() in INDEX_FILES:
+        relative = relative.rsplit('/', 1)[0] + '/' if '/' in relative else ''
+    return base_url.rstrip('/') + '/' + quote(relative)
+
+def iter_html_dir(root: str, base_url: str, stats: Dict) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (html, url) for every HTML file under a directory, in path order,
+    decoded by BOM or <meta> charset (see decode_html). URLs are
+    base_url + relative path, or file:// URIs without base_url.
+    """
+    for directory, subdirs, files in os.walk(root):
+        subdirs.sort()
+        for name in sorted(files):
+            if not name.lower().endswith(HTML_SUFFIXES):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                if os.path.getsize(path) > Config.BULK_MAX_FILE_BYTES:
+                    stats['skipped_inputs'] += 1
+                    continue
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError as e:
+                logger.warning(f"Skipped unreadable file {path}: {e}")
+                stats['skipped_inputs'] += 1
+                continue
+            stats['bytes'] += len(data)
+            yield decode_html(data), _file_url(root, path, base_url)
+
+def _single_file(path: str, base_url: str, stats: Dict) -> Iterator[Tuple[str, str]]:
+    with open(path, 'rb') as f:
+        data = f.read()
+    stats['bytes'] += len(data)
+    yield decode_html(data), _file_url(os.path.dirname(path) or '.', path, base_url)
+
+def iter_inputs(paths: List[str], base_url: str, stats: Dict) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (html, url) from a mix of WARC files and HTML directories.
+    """
+    for path in paths:
+        stats['inputs'] += 1
+        try:
+            if os.path.isdir(path):
+                yield from iter_html_dir(path, base_url, stats)
+            elif path.lower().endswith(WARC_SUFFIXES):
+                yield from iter_warc(path, stats)
+            elif path.lower().endswith(HTML_SUFFIXES):
+                yield from _single_file(path, base_url, stats)
+            else:
+                logger.warning(f"Skipped unsupported input: {path}")
+                stats['skipped_inputs'] += 1
+        except Exception as e:
+            logger.error(f"Stopped reading {path}: {e}")
+            stats['failed'] += 1
+
+def _batches(items: Iterator, size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+class BulkIngestor:
+    """
+    Streams offline HTML into a ChromaDB collection.
+
+    Args:
+        processor: Content processor to index with (a new one if omitted).
+        workers: Extraction processes (defaults to Config.BULK_WORKERS).
+        batch_pages: Pages per extraction task (defaults to Config.BULK_BATCH_PAGES).
+    """
+
+    def __init__(self, processor: EnhancedContentProcessor = None, workers: int = None, batch_pages: int = None):
+        self.processor = processor or EnhancedContentProcessor()
+        self.workers = max(1, workers or Config.BULK_WORKERS)
+        self.batch_pages = max(1, batch_pages or Config.BULK_BATCH_PAGES)
+
+    def ingest(self, paths: List[str], collection_name: str = None, base_url: str = None) -> Dict:
+        """
+        Index WARC files and HTML directories into a collection.
+
+        Args:
+            paths: WARC files, HTML files or directories of HTML files.
+            collection_name: Collection to add to (e.g. a session collection);
+                a new bulk_<id> collection if omitted.
+            base_url: Site URL that HTML directories mirror, used to build
+                page URLs (file:// URIs if omitted).
+
+        Returns:
+            Dict: Throughput report with input, page and chunk counts,
+            elapsed seconds and per-second rates.
+        """
+        collection_name = collection_name or f"bulk_{uuid.uuid4().hex[:8]}"
+        label = "uploads:bulk:" + ",".join(os.path.basename(os.path.normpath(p)) for p in paths)
+        stats = _new_stats()
+        logger.info(f"Bulk ingesting {len(paths)} inputs into {collection_name} ({self.workers} workers)")
+
+        pipeline = IndexingPipeline(self.processor, collection_name=collection_name)
+        start = time.perf_counter()
+        pipeline.run(label, lambda emit: self._produce(paths, base_url, stats, emit, label))
+        seconds = time.perf_counter() - start
+
+        stats['chunks'] = pipeline.chunk_count
+        report = {
+            'collection': collection_name,
+            **stats,
+            'workers': self.workers,
+            'seconds': round(seconds, 3),
+            'pages_per_s': round(stats['pages'] / seconds, 2) if seconds else 0.0,
+            'chunks_per_s': round(stats['chunks'] / seconds, 2) if seconds else 0.0,
+            'mb_per_s': round(stats['bytes'] / 1e6 / seconds, 2) if seconds else 0.0
+        }
+        logger.info(
+            f"Bulk ingestion finished: {stats['pages']} pages, {stats['chunks']} chunks in {seconds:.1f}s "
+            f"({report['pages_per_s']} pages/s, {report['mb_per_s']} MB/s)"
+        )
+        return report
+
+    def _produce(self, paths: List[str], base_url: str, stats: Dict, emit, label: str) -> Dict:
+        dedup = NearDuplicateIndex(Config.NEAR_DUPLICATE_DISTANCE)
+        inflight = deque()
+
+        def drain():
+            pages = []
+            for page in inflight.popleft().result():
+                if page is None:
+                    stats['failed'] += 1
+                elif page['word_count'] <= 50:
+                    stats['short'] += 1
+                else:
+                    page.pop('canonical_url', None)
+                    pages.append(page)
+            kept, dropped = drop_near_duplicates(pages, dedup)
+            stats['duplicates'] += len(dropped)
+            stats['pages'] += len(kept)
+            if kept:
+                emit(kept)
+
+        pool = new_extraction_pool(self.workers)
+        try:
+            for batch in _batches(iter_inputs(paths, base_url, stats), self.batch_pages):
+                stats['documents'] += len(batch)
+                inflight.append(pool.submit(extract_pages, batch))
+                # Bounded read-ahead: wait for the oldest task before reading on
+                if len(inflight) >= self.workers * 2:
+                    drain()
+            while inflight:
+                drain()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        return {
+            'domain': label,
+            'pages': [],
+            'total_pages': stats['pages'],
+            'crawl_date': datetime.now().isoformat()
+        }
+
+def main(argv=None) -> Dict:
+    parser = argparse.ArgumentParser(description="Index WARC files and HTML mirrors without network access.")
+    parser.add_argument("inputs", nargs="+", help="WARC files (.warc, .warc.gz, .warc.zst), HTML files or directories")
+    parser.add_argument("--collection", help="collection to add to (default: a new bulk_<id> collection)")
+    parser.add_argument("--base-url", help="site URL that HTML directories mirror")
+    parser.add_argument("--workers", type=int, help="extraction processes")
+    parser.add_argument("--batch-pages", type=int, help="pages per extraction task")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = BulkIngestor(workers=args.workers, batch_pages=args.batch_pages).ingest(
+        args.inputs, args.collection, args.base_url
+    )
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# ~/core/collection_registry.py
+"""
+Persistent collection registry for the Enhanced Domain Intelligence Analyzer.
+
+Each crawled domain is indexed into a ChromaDB collection whose name is
+derived from the domain (collection_name_for()), so every process and every
+restart maps a domain to the same collection. The registry records, per
+domain, that collection together with the embedding model and chunking
+parameters its chunks were built with, so an existing index is only reused
+when it is compatible with the current settings.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from hashlib import blake2b
+from typing import Dict, Optional
+from config import Config
+from core.crawl_state import domain_key
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS collections (
+    domain          TEXT PRIMARY KEY,
+    collection      TEXT NOT NULL UNIQUE,
+    embedding_model TEXT NOT NULL,
+    dimension       INTEGER NOT NULL,
+    chunk_size      INTEGER NOT NULL,
+    chunk_overlap   INTEGER NOT NULL,
+    created_at      TEXT NOT NULL,
+    updated_at      TEXT NOT NULL
+);
+"""
+# Settings that must match for chunks to be added to an existing index
+INDEX_PARAMS = ("embedding_model", "dimension", "chunk_size", "chunk_overlap")
+
+def collection_name_for(domain: str) -> str:
+    """
+    Stable ChromaDB collection name of a domain (or 'multiple-urls').
+    Scheme, case and paths do not matter: one collection per host.
+    """
+    return f"domain_{blake2b(domain_key(domain).encode(), digest_size=8).hexdigest()}"
+
+class CollectionRegistry:
+    """
+    SQLite-backed map of domain -> collection -> index settings, shared by
+    all sessions and worker processes.
+
+    Args:
+        path: SQLite database file (defaults to Config.COLLECTION_REGISTRY_PATH).
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.COLLECTION_REGISTRY_PATH
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, domain: str) -> Optional[Dict]:
+        """
+        Return the registry entry of a domain, or None if it was never indexed.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM collections WHERE domain = ?", (domain_key(domain),)).fetchone()
+        return dict(row) if row else None
+
+    def matches(self, domain: str, params: Dict) -> bool:
+        """
+        True if the domain's index was built with the given settings
+        (or the domain has no index yet).
+        """
+        entry = self.get(domain)
+        return entry is None or all(entry[name] == params[name] for name in INDEX_PARAMS)
+
+    def register(self, domain: str, collection: str, params: Dict):
+        """
+        Record that a domain's collection now holds chunks built with params.
+        """
+        now = datetime.now().isoformat()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO collections (domain, collection, embedding_model, dimension, chunk_size, chunk_overlap, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (domain) DO UPDATE SET
+                    collection      = excluded.collection,
+                    embedding_model = excluded.embedding_model,
+                    dimension       = excluded.dimension,
+                    chunk_size      = excluded.chunk_size,
+                    chunk_overlap   = excluded.chunk_overlap,
+                    updated_at      = excluded.updated_at
+                """,
+                (domain_key(domain), collection, *(params[name] for name in INDEX_PARAMS), now, now)
+            )
+        logger.debug(f"Registered collection {collection} for {domain_key(domain)}")
@@ -0,0 +1,159 @@
+# ~/core/crawl_checkpoint.py
+"""
+Crawl checkpoints for the Enhanced Domain Intelligence Analyzer.
+
+A long domain crawl periodically saves its progress so an interrupted
+crawl (process killed, request timed out) can resume where it stopped
+instead of starting over. Accepted page records are appended to a JSON
+Lines file, so each checkpoint only writes the pages crawled since the
+previous one; the small crawl state (frontier, seen set, dedup, trap and
+template state, counters) is rewritten atomically next to it and records
+how much of the page file is valid.
+
+Checkpoints are kept per host, so a crawl holds an exclusive lock on its
+host's checkpoint for as long as it runs; a concurrent crawl of the same
+host (another session or worker) does not get the lock and runs without
+checkpoints instead of interleaving writes or clearing the first one's.
+"""
+
+import json
+import os
+import shutil
+from typing import Dict, List, Optional
+from config import Config
+from core.crawl_state import domain_key
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+class CrawlCheckpoint:
+    """
+    Checkpoint files of one domain's crawl.
+
+    Args:
+        domain: Domain URL being crawled.
+        path: Checkpoint root directory (defaults to Config.CHECKPOINT_PATH).
+    """
+
+    def __init__(self, domain: str, path: str = None):
+        self.directory = os.path.join(path or Config.CHECKPOINT_PATH, domain_key(domain).replace(':', '_'))
+        self._state_path = os.path.join(self.directory, "state.json")
+        self._pages_path = os.path.join(self.directory, "pages.jsonl")
+        # Next to the directory, so clear() never removes a held lock
+        self._lock_path = self.directory + ".lock"
+        self._lock_fd = None
+        self._pages_bytes = 0
+        self._pages_written = 0
+
+    def acquire(self) -> bool:
+        """
+        Take the host's checkpoint lock without waiting.
+
+        Returns:
+            bool: False if another crawl (in any process) holds it.
+        """
+        try:
+            os.makedirs(os.path.dirname(self._lock_path), exist_ok=True)
+            fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError as e:
+            logger.error(f"Failed to open crawl checkpoint lock {self._lock_path}: {e}")
+            return False
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    def release(self):
+        """
+        Release the lock taken by acquire(); the lock file itself stays.
+        """
+        if self._lock_fd is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(self._lock_fd, msvcrt.LK_UNLCK, 1)
+        except OSError as e:
+            logger.warning(f"Failed to unlock crawl checkpoint {self._lock_path}: {e}")
+        finally:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self._state_path)
+
+    def load(self) -> Optional[Dict]:
+        """
+        Read the last checkpoint.
+
+        Returns:
+            The saved crawl state with the checkpointed page records under
+            'pages', or None if there is no usable checkpoint.
+        """
+        try:
+            with open(self._state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            pages = []
+            with open(self._pages_path, "rb") as f:
+                # Bytes past the recorded size were written after the last checkpoint
+                data = f.read(state['pages_bytes'])
+            for line in data.splitlines():
+                if line.strip():
+                    pages.append(json.loads(line))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Ignoring unreadable crawl checkpoint in {self.directory}: {e}")
+            return None
+        self._pages_bytes = state['pages_bytes']
+        self._pages_written = len(pages)
+        state['pages'] = pages
+        logger.info(f"Loaded crawl checkpoint from {self.directory}: {len(pages)} pages, {state['visited']} visited")
+        return state
+
+    def save(self, state: Dict, pages: List[Dict]):
+        """
+        Append the pages not yet checkpointed and replace the crawl state.
+
+        Args:
+            state: JSON-serializable crawl state (without pages).
+            pages: All accepted page records so far, in crawl order.
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._pages_path, "ab") as f:
+                f.truncate(self._pages_bytes)
+                for page in pages[self._pages_written:]:
+                    f.write(json.dumps(page).encode("utf-8") + b"\n")
+                self._pages_bytes = f.tell()
+            self._pages_written = len(pages)
+
+            tmp = self._state_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({**state, 'pages_bytes': self._pages_bytes}, f)
+            os.replace(tmp, self._state_path)
+            logger.info(f"Checkpointed crawl: {len(pages)} pages, {state['visited']} visited")
+        except Exception as e:
+            logger.error(f"Failed to write crawl checkpoint to {self.directory}: {e}")
+
+    def clear(self):
+        """
+        Delete the checkpoint, e.g. once the crawl has finished.
+        """
+        self._pages_bytes = 0
+        self._pages_written = 0
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,196 @@
+# ~/core/crawl_state.py
+"""
+Persistent crawl state for the Enhanced Domain Intelligence Analyzer.
+
+Keeps one SQLite row per (domain, URL) with the content hash, fetch
+timestamp, HTTP status and fetch method of the last crawl, so incremental
+sync keeps working across sessions, processes and server restarts. A second
+table remembers per host whether pages needed a Playwright render, and a
+third caches each site's boilerplate template blocks for sync.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List
+from urllib.parse import urlparse
+from config import Config
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_pages (
+    domain       TEXT NOT NULL,
+    url          TEXT NOT NULL,
+    content_hash TEXT,
+    status_code  INTEGER,
+    fetch_method TEXT,
+    fetched_at   TEXT NOT NULL,
+    PRIMARY KEY (domain, url)
+);
+CREATE TABLE IF NOT EXISTS host_strategy (
+    host              TEXT PRIMARY KEY,
+    render_streak     INTEGER NOT NULL,
+    pages_since_probe INTEGER NOT NULL,
+    updated_at        TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS site_templates (
+    domain    TEXT NOT NULL,
+    block_key TEXT NOT NULL,
+    PRIMARY KEY (domain, block_key)
+);
+"""
+
+def domain_key(domain: str) -> str:
+    """
+    Normalize a domain URL or host name to the key used by the store.
+    """
+    parsed = urlparse(domain if "://" in domain else "https://" + domain)
+    return parsed.netloc.lower()
+
+class CrawlStateStore:
+    """
+    SQLite-backed store of per-URL crawl state, shared by all sessions.
+
+    Args:
+        path: SQLite database file (defaults to Config.CRAWL_STATE_DB_PATH).
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.CRAWL_STATE_DB_PATH
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_pages(self, domain: str) -> Dict[str, Dict]:
+        """
+        Return {url: state} for every page stored for a domain.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM crawl_pages WHERE domain = ?",
+                (domain_key(domain),)
+            ).fetchall()
+        return {row["url"]: dict(row) for row in rows}
+
+    def record_pages(self, domain: str, records: List[Dict]):
+        """
+        Insert or update the state of crawled pages.
+
+        Each record needs 'url' and may carry 'content_hash', 'status_code',
+        'fetch_method' and 'fetched_at'. A missing hash or method keeps the
+        previously stored value, so 304s and failures do not erase them.
+        """
+        if not records:
+            return
+        now = datetime.now().isoformat()
+        key = domain_key(domain)
+        rows = [
+            (
+                key,
+                r["url"],
+                r.get("content_hash"),
+                r.get("status_code"),
+                r.get("fetch_method"),
+                r.get("fetched_at") or now
+            )
+            for r in records
+        ]
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO crawl_pages (domain, url, content_hash, status_code, fetch_method, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (domain, url) DO UPDATE SET
+                    content_hash = COALESCE(excluded.content_hash, crawl_pages.content_hash),
+                    status_code  = excluded.status_code,
+                    fetch_method = COALESCE(excluded.fetch_method, crawl_pages.fetch_method),
+                    fetched_at   = excluded.fetched_at
+                """,
+                rows
+            )
+        logger.debug(f"Recorded crawl state for {len(rows)} pages of {key}")
+
+    def clear_hashes(self, domain: str, urls: List[str]):
+        """
+        Forget the content hash of pages that are no longer indexed.
+        """
+        if not urls:
+            return
+        key = domain_key(domain)
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "UPDATE crawl_pages SET content_hash = NULL WHERE domain = ? AND url = ?",
+                [(key, url) for url in urls]
+            )
+
+    def get_host_strategies(self, hosts: List[str]) -> Dict[str, Dict]:
+        """
+        Return {host: strategy row} for the given hosts that have one.
+        """
+        if not hosts:
+            return {}
+        placeholders = ",".join("?" for _ in hosts)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM host_strategy WHERE host IN ({placeholders})",
+                list(hosts)
+            ).fetchall()
+        return {row["host"]: dict(row) for row in rows}
+
+    def save_host_strategies(self, strategies: Dict[str, Dict]):
+        """
+        Insert or replace per-host fetch strategy rows.
+        """
+        if not strategies:
+            return
+        now = datetime.now().isoformat()
+        rows = [
+            (host, s["render_streak"], s["pages_since_probe"], now)
+            for host, s in strategies.items()
+        ]
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO host_strategy (host, render_streak, pages_since_probe, updated_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+    def get_template(self, domain: str) -> List[str]:
+        """
+        Return the cached boilerplate block keys of a domain.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT block_key FROM site_templates WHERE domain = ?",
+                (domain_key(domain),)
+            ).fetchall()
+        return [row["block_key"] for row in rows]
+
+    def save_template(self, domain: str, block_keys: List[str]):
+        """
+        Replace the cached boilerplate block keys of a domain.
+        """
+        key = domain_key(domain)
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM site_templates WHERE domain = ?", (key,))
+            conn.executemany(
+                "INSERT INTO site_templates (domain, block_key) VALUES (?, ?)",
+                [(key, block) for block in block_keys]
+            )
+        logger.debug(f"Saved {len(block_keys)} template blocks for {key}")
@@ -1,69 +1,34 @@
 # ~/core/crawler.py
 
-import requests
-from bs4 import BeautifulSoup
-import re
-import time
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
-from typing import List, Dict, Tuple
+from itertools import islice
+from typing import Callable, List, Dict, Optional
 import hashlib
 from config import Config
-
-# Add Playwright imports
-from playwright.sync_api import sync_playwright
+from core.fetcher import fetch_html, AsyncCrawlEngine
+from core.http_client import get_http_client
+from core.html_extract import extract_page
+from core.frontier import CrawlFrontier
+from core.http_cache import HttpCache
+from core.crawl_state import CrawlStateStore
+from core.fetch_strategy import FetchStrategyMemory
+from core.dedup import NearDuplicateIndex, drop_near_duplicates
+from core.boilerplate import SiteTemplate
+from core.page_archive import PageArchive
+from core.crawl_checkpoint import CrawlCheckpoint
+from core.extract_pool import get_extraction_pool, reset_extraction_pool
+from core.url_canon import canonicalize_url, TrapDetector
+from core.sitemap import RobotsPolicy, load_robots, iter_sitemap_urls, parse_lastmod
 
 # Add logger
 from core.logger_config import setup_logger
 logger = setup_logger(__name__)
 
-def fetch_html(url: str) -> Tuple[str, str]:
-    """
-    Fetch HTML content from a URL using requests first.
-    If the content is too short or likely empty, fallback to Playwright.
-    Returns (html_text, source) where source is 'requests' or 'playwright'.
-    """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    try:
-        resp = requests.get(url, headers=headers, timeout=10)
-        html = resp.text
-        soup = BeautifulSoup(html, 'html.parser')
-        body = soup.find('body')
-        if not body or len(body.get_text(strip=True)) < 40 or len(html) < 100:
-            logger.info(f"Fallback to Playwright for {url}")
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page(user_agent=headers['User-Agent'])
-                try:
-                    page.goto(url, timeout=15000, wait_until="networkidle")
-                    html = page.content()
-                    browser.close()
-                    logger.info(f"Used Playwright for {url}")
-                    return html, "playwright"
-                except Exception as e:
-                    browser.close()
-                    logger.error(f"Playwright failed for {url}: {e}")
-                    return resp.text, "requests"
-        else:
-            logger.info(f"Used requests for {url}")
-            return html, "requests"
-    except Exception as e:
-        logger.error(f"requests.get failed for {url}: {e}")
-        # Try Playwright as last resort
-        try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page(user_agent=headers['User-Agent'])
-                page.goto(url, timeout=15000, wait_until="networkidle")
-                html = page.content()
-                browser.close()
-                logger.info(f"Used Playwright for {url}")
-                return html, "playwright"
-        except Exception as e2:
-            logger.error(f"Playwright also failed for {url}: {e2}")
-            return "", "requests"
+# Statuses that mean a page no longer exists
+GONE_STATUSES = (404, 410)
+# Archived pages extracted per batch when re-indexing
+REINDEX_BATCH_PAGES = 64
 
 class EnhancedDomainCrawler:
     """
@@ -71,12 +36,12 @@ class EnhancedDomainCrawler:
     """
 
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.session = get_http_client()
         self.visited_urls = set()
-        self.last_crawl_hashes = {}
+        self.state = CrawlStateStore()
+        self.engine = AsyncCrawlEngine(strategy=FetchStrategyMemory(self.state))
+        self.http_cache = HttpCache()
+        self.archive = PageArchive()
 
     def get_page_hash(self, content: str) -> str:
         """
@@ -106,142 +71,411 @@ class EnhancedDomainCrawler:
             logger.error(f"Error in is_valid_url for {url}: {e}")
             return False
 
-    def extract_content(self, html: str, url: str) -> Dict:
-        """
-        Extract main content, title, and headings from HTML.
+    def admit_url(self, url: str, base_domain: str, robots: RobotsPolicy, traps: TrapDetector) -> Optional[str]:
         """
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # Remove unwanted elements
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
-
-        title = soup.find('title')
-        title = title.text.strip() if title else "No Title"
-
-        main_content = ""
-        selectors = [
-            'main', '[role="main"]', '.main-content', '#main-content',
-            '.content', '#content', 'article', '.post', '.page-content'
-        ]
-
-        # Try to find main content using common selectors
-        for selector in selectors:
-            content_elem = soup.select_one(selector)
-            if content_elem:
-                main_content = content_elem.get_text(separator=' ', strip=True)
-                break
-
-        # Fallback to body if no main content found
-        if not main_content:
-            body = soup.find('body')
-            if body:
-                main_content = body.get_text(separator=' ', strip=True)
-
-        main_content = re.sub(r'\s+', ' ', main_content).strip()
-        main_content = main_content[:Config.MAX_CONTENT_LENGTH]
-
-        headings = [h.get_text().strip() for h in soup.find_all(['h1', 'h2', 'h3'])]
+        Canonicalize a discovered URL and return it if it may be crawled.
 
-        logger.debug(f"Extracted content for {url}: {len(main_content)} chars, {len(headings)} headings")
-        return {
-            'url': url,
-            'title': title,
-            'content': main_content,
-            'headings': headings,
-            'word_count': len(main_content.split()),
-            'content_hash': self.get_page_hash(main_content),
-            'timestamp': datetime.now().isoformat()
-        }
+        Returns:
+            The canonical URL, or None if it is off-site, skipped, disallowed
+            by robots.txt or looks like a crawler trap.
+        """
+        canonical = canonicalize_url(url, prefer_host=urlparse(base_domain).netloc)
+        if (canonical is None or not self.is_valid_url(canonical, base_domain)
+                or not robots.allowed(canonical) or not traps.allow(canonical)):
+            return None
+        return canonical
 
-    def discover_pages(self, domain: str) -> List[str]:
+    def extract_content(self, html: str, url: str) -> Dict:
         """
-        Discover and prioritize URLs to crawl from the domain's homepage.
+        Extract main content, title, headings and outgoing links from HTML.
+        Crawls get this record from the extraction pool; this runs in-process.
         """
-        urls_to_crawl = [domain]
-        try:
-            html, source = fetch_html(domain)
-            soup = BeautifulSoup(html, 'html.parser')
-
-            links = [urljoin(domain, a['href']) for a in soup.find_all('a', href=True)]
-            links = [url for url in links if self.is_valid_url(url, domain)]
-
-            priority_keywords = [
-                'about', 'service', 'product', 'solution', 'team',
-                'contact', 'portfolio', 'work', 'case-study', 'blog',
-                'news', 'career', 'job', 'pricing', 'plan'
-            ]
+        page, _ = extract_page(html, url)
+        logger.debug(f"Extracted content for {url}: {len(page['content'])} chars, {len(page['headings'])} headings")
+        return page
 
-            prioritized = []
-            for keyword in priority_keywords:
-                for link in links:
-                    if keyword in link.lower() and link not in prioritized:
-                        prioritized.append(link)
+    def seed_from_sitemaps(self, domain: str, robots: RobotsPolicy, frontier: CrawlFrontier,
+                           known_pages: Dict[str, Dict], traps: TrapDetector = None) -> List[str]:
+        """
+        Seed the frontier with URLs from the domain's sitemaps.
 
-            for link in links:
-                if link not in prioritized:
-                    prioritized.append(link)
+        Pages whose <lastmod> is not newer than their stored fetch time, and
+        whose page record is cached, are not queued for fetching.
 
-            urls_to_crawl.extend(prioritized[:Config.MAX_PAGES-1])
-            logger.info(f"Discovered {len(urls_to_crawl)} URLs to crawl for domain {domain}")
-        except Exception as e:
-            logger.error(f"Error in discover_pages for {domain}: {e}")
+        Args:
+            domain: Domain URL being crawled.
+            robots: Parsed robots.txt of the domain.
+            frontier: Frontier to seed.
+            known_pages: Stored crawl state by URL; empty to disable skipping.
+            traps: Trap detector of the crawl (a fresh one if omitted).
 
-        return list(set(urls_to_crawl))
+        Returns:
+            List[str]: URLs skipped as unchanged.
+        """
+        sitemaps = robots.sitemaps or [urljoin(domain, '/sitemap.xml')]
+        traps = traps or TrapDetector()
+        unchanged = []
+        for loc, lastmod in iter_sitemap_urls(sitemaps):
+            loc = self.admit_url(loc, domain, robots, traps)
+            if loc is None or frontier.is_seen(loc):
+                continue
+            state = known_pages.get(loc)
+            modified = parse_lastmod(lastmod)
+            if (state and state['content_hash'] and modified
+                    and modified <= datetime.fromisoformat(state['fetched_at'])
+                    and self.http_cache.get_page(loc) is not None):
+                frontier.mark_seen(loc)
+                unchanged.append(loc)
+                continue
+            frontier.push(loc, 1)
+        logger.info(f"Seeded frontier from sitemaps for {domain}: {len(frontier)} queued, {len(unchanged)} unchanged")
+        return unchanged
+
+    def has_checkpoint(self, domain: str) -> bool:
+        """
+        Return True if an interrupted crawl of the domain can be resumed.
+        """
+        return CrawlCheckpoint(domain).exists()
 
-    def crawl_domain(self, domain: str, sync_mode=False) -> Dict:
+    def crawl_domain(self, domain: str, sync_mode=False, on_pages: Callable[[List[Dict]], None] = None,
+                     resume=False) -> Dict:
         """
-        Crawl all discovered pages in a domain and extract their content.
+        Crawl a domain frontier-first and extract page content.
+
+        The priority frontier is seeded with the homepage and the site's
+        sitemaps, honouring robots.txt. Pages are fetched in concurrent waves
+        and links found on each wave are scored and pushed back, so the
+        MAX_PAGES budget goes to the best pages first. Pages skipped by
+        sitemap lastmod are replayed from the cache after the frontier and
+        are not charged to the budget. Text blocks repeated
+        across the site (its template) are stripped from page content; the
+        first BOILERPLATE_WARMUP pages are held back to learn it, and sync
+        starts from the template cached by the previous crawl. Progress is
+        checkpointed every CHECKPOINT_EVERY_PAGES visited pages so an
+        interrupted crawl can be resumed, and fetched HTML is archived.
+        While another crawl of the same host holds the host's crawl lock,
+        this one runs without checkpoints and without archiving.
 
         Args:
             domain (str): Domain URL to crawl.
-            sync_mode (bool): If True, track updated/new pages.
+            sync_mode (bool): If True, track updated/new pages, send
+                conditional requests and skip pages whose sitemap lastmod
+                shows they have not changed since the last crawl.
+            on_pages (callable): Optional callback receiving accepted
+                (deduplicated, template-stripped) pages while the crawl continues.
+                On resume it first receives the pages restored from the checkpoint.
+            resume (bool): Continue from the domain's last checkpoint, if
+                any (its sync mode wins over sync_mode); otherwise a new
+                crawl starts and any old checkpoint is discarded.
 
         Returns:
             Dict: Crawl results and sync info.
         """
-        logger.info(f"Crawling domain: {domain} (Sync: {sync_mode})")
-        urls = self.discover_pages(domain)
-
-        crawled_data, updated, new = [], [], []
+        lock = CrawlCheckpoint(domain)
+        exclusive = lock.acquire()
+        if not exclusive:
+            logger.warning(f"Another crawl of {domain} is running; this crawl is not checkpointed, resumed or archived")
+        try:
+            checkpoint = lock if exclusive and Config.CHECKPOINT_EVERY_PAGES > 0 else None
+            return self._crawl_domain(domain, sync_mode, on_pages, resume, checkpoint, archived=exclusive)
+        finally:
+            if exclusive:
+                lock.release()
+
+    def _crawl_domain(self, domain: str, sync_mode: bool, on_pages: Optional[Callable[[List[Dict]], None]],
+                      resume: bool, checkpoint: Optional[CrawlCheckpoint], archived: bool) -> Dict:
+        restored = checkpoint.load() if checkpoint and resume else None
+        if resume and not restored:
+            logger.info(f"No crawl checkpoint for {domain}; starting a new crawl")
+        elif restored:
+            sync_mode = restored['sync_mode']
+        logger.info(f"Crawling domain: {domain} (Sync: {sync_mode}, resumed: {bool(restored)})")
+        robots = load_robots(domain)
+        known_pages = {} if restored else self.state.get_pages(domain)
+        # Pre-crawl hashes: the store already holds those of pages fetched
+        # after the last checkpoint, so a resumed crawl diffs the snapshot
+        known_hashes = restored['known_hashes'] if restored else {
+            url: page['content_hash'] for url, page in known_pages.items() if page['content_hash']
+        }
 
-        for url in urls:
-            try:
-                html, source = fetch_html(url)
-                if not html or len(html) < 100:
-                    logger.warning(f"Skipped {url}: empty HTML")
-                    continue
-                content = self.extract_content(html, url)
-                if content['word_count'] > 50:
-                    crawled_data.append(content)
-                    if sync_mode:
-                        if url in self.last_crawl_hashes:
-                            if self.last_crawl_hashes[url] != content['content_hash']:
-                                updated.append(url)
+        # All URLs are canonicalized against the start URL's host
+        start = canonicalize_url(domain) or domain
+        traps = TrapDetector()
+        frontier = CrawlFrontier(max_depth=Config.CRAWL_MAX_DEPTH)
+        dedup_index = NearDuplicateIndex(Config.NEAR_DUPLICATE_DISTANCE)
+        template = SiteTemplate(self.state.get_template(domain) if sync_mode else ())
+        archive = self.archive.writer(domain) if Config.ARCHIVE_ENABLED and archived else None
+
+        if restored:
+            frontier.load_state(restored['frontier'])
+            traps.load_state(restored['traps'])
+            template.load_state(restored['template'])
+            skipped, visited = restored['skipped'], restored['visited']
+            indexed = set(restored['indexed'])  # Canonical URLs of accepted pages
+            crawled_data, pending = restored['pages'], restored['pending']
+            updated, new = restored['updated'], restored['new']
+            not_modified, duplicates = restored['not_modified'], restored['duplicates']
+            responded = restored['responded']
+            for page in crawled_data + pending:
+                dedup_index.add(page['simhash'], page['url'])
+            if on_pages and crawled_data:
+                on_pages(crawled_data)
+        else:
+            if checkpoint:
+                checkpoint.clear()
+            frontier.push(start, 0, score=float('inf'))
+            skipped = self.seed_from_sitemaps(start, robots, frontier, known_pages if sync_mode else {}, traps)
+            indexed = set()  # Canonical URLs of accepted pages
+            crawled_data, updated, new, not_modified, duplicates = [], [], [], [], []
+            responded = []  # URLs that answered with a page or as gone, for sync removals
+            pending = []  # Accepted pages waiting for the template to be learned
+            visited = 0
+        checkpointed = visited
+
+        def release():
+            if not pending:
+                return
+            batch = list(pending)
+            pending.clear()
+            pages = template.strip(batch)
+            crawled_data.extend(pages)
+            if on_pages:
+                on_pages(pages)
+
+        while (len(frontier) and visited < Config.MAX_PAGES) or skipped:
+            if len(frontier) and visited < Config.MAX_PAGES:
+                batch = dict(frontier.pop_batch(min(Config.CRAWL_CONCURRENCY, Config.MAX_PAGES - visited)))
+                conditional = {url: self.http_cache.conditional_headers(url) for url in batch} if sync_mode else None
+                results = self.engine.fetch_all(list(batch), conditional, robots.crawl_delay)
+                visited += len(batch)
+            else:
+                # Unchanged per sitemap lastmod: replay cached records once the
+                # frontier is spent; no request, so not charged to MAX_PAGES
+                batch = {url: 1 for url in skipped[:Config.CRAWL_CONCURRENCY]}
+                skipped = skipped[len(batch):]
+                results = [
+                    {'url': url, 'html': "", 'source': "lastmod", 'status': None, 'headers': {}}
+                    for url in batch
+                ]
+
+            records, wave_pages, fetched = [], [], []
+            for result in results:
+                url, html = result['url'], result['html']
+                unchanged = result['source'] in ("not_modified", "lastmod")
+                record = {
+                    'url': url,
+                    'status_code': result['status'],
+                    'fetch_method': None if unchanged else result['source']
+                }
+                if result['source'] != "lastmod":
+                    records.append(record)
+                if result['status'] in GONE_STATUSES:
+                    responded.append(url)
+                try:
+                    if unchanged:
+                        # Reuse the stored page record, no parse or hash
+                        content = self.http_cache.get_page(url)
+                        if content is None:
+                            logger.warning(f"Skipped {url}: not modified but no cached page")
+                            continue
+                        if content['content_hash'] == known_hashes.get(url):
+                            not_modified.append(url)
                         else:
-                            new.append(url)
-                    self.last_crawl_hashes[url] = content['content_hash']
-                    logger.info(f"Crawled: {url} ({content['word_count']} words)")
-                else:
-                    logger.warning(f"Skipped short content: {url}")
-                self.visited_urls.add(url)
-                time.sleep(Config.CRAWL_DELAY)
-            except Exception as e:
-                logger.error(f"Failed to crawl {url}: {e}")
-
-        logger.info(f"Finished crawling domain {domain}: {len(crawled_data)} pages")
+                            # Changed since the snapshot, e.g. refetched before a resume
+                            unchanged = False
+                    elif not html or len(html) < 100 or result['page'] is None:
+                        logger.warning(f"Skipped {url}: empty HTML")
+                        continue
+                    else:
+                        content = result['page']
+                        self.http_cache.store(url, result['headers'], content)
+                        fetched.append({
+                            'url': url, 'html': html, 'status': result['status'],
+                            'headers': result['headers'], 'fetch_method': result['source']
+                        })
+                    content = dict(content)
+                    responded.append(url)
+                    for link in content.pop('links', []):
+                        link = self.admit_url(link, start, robots, traps)
+                        if link:
+                            frontier.push(link, batch[url] + 1)
+                    canonical = content.pop('canonical_url', None)
+                    if canonical:
+                        canonical = canonicalize_url(canonical, prefer_host=urlparse(start).netloc)
+                        if canonical and not self.is_valid_url(canonical, start):
+                            canonical = None
+                    key = canonical or url
+                    if key in indexed:
+                        logger.info(f"Skipped {url}: canonical page {key} already crawled")
+                        continue
+                    if canonical and canonical != url:
+                        # Don't fetch the canonical URL again on its own
+                        frontier.mark_seen(canonical)
+                    if content['word_count'] > 50:
+                        indexed.update((key, url))
+                        wave_pages.append(content)
+                        if sync_mode and not unchanged:
+                            if url in known_hashes:
+                                if known_hashes[url] != content['content_hash']:
+                                    updated.append(url)
+                            else:
+                                new.append(url)
+                        record['content_hash'] = content['content_hash']
+                        logger.info(f"Crawled: {url} ({content['word_count']} words)")
+                    else:
+                        logger.warning(f"Skipped short content: {url}")
+                    self.visited_urls.add(url)
+                except Exception as e:
+                    logger.error(f"Failed to crawl {url}: {e}")
+            self.state.record_pages(domain, records)
+            if archive:
+                archive.write(fetched)
+
+            kept, dropped = drop_near_duplicates(wave_pages, dedup_index)
+            duplicates.extend(dropped)
+            for page in kept:
+                template.observe(page)
+            pending.extend(kept)
+            if not template.enabled or template.known or template.pages_seen >= Config.BOILERPLATE_WARMUP:
+                release()
+
+            if checkpoint and visited - checkpointed >= Config.CHECKPOINT_EVERY_PAGES:
+                checkpoint.save({
+                    'sync_mode': sync_mode,
+                    'visited': visited,
+                    'known_hashes': known_hashes,
+                    'frontier': frontier.to_state(),
+                    'skipped': skipped,
+                    'indexed': sorted(indexed),
+                    'traps': traps.to_state(),
+                    'template': template.to_state(),
+                    'pending': pending,
+                    'updated': updated,
+                    'new': new,
+                    'not_modified': not_modified,
+                    'duplicates': duplicates,
+                    'responded': responded
+                }, crawled_data)
+                checkpointed = visited
+
+        release()
+        if checkpoint:
+            checkpoint.clear()
+        if template.enabled and template.pages_seen >= template.min_pages:
+            blocks = template.learned()
+            self.state.save_template(domain, sorted(blocks))
+            logger.info(f"Learned {len(blocks)} template blocks on {domain} from {template.pages_seen} pages")
+
+        # Pages that answered this time but were not kept (gone, short,
+        # duplicate, canonicalized elsewhere) must leave the index on sync
+        accepted = {page['url'] for page in crawled_data}
+        removed = sorted({url for url in responded if url not in accepted and url in known_hashes})
+        if sync_mode and removed:
+            self.state.clear_hashes(domain, removed)
+
+        if duplicates:
+            dropped = {d['url'] for d in duplicates}
+            updated = [url for url in updated if url not in dropped]
+            new = [url for url in new if url not in dropped]
+            not_modified = [url for url in not_modified if url not in dropped]
+
+        if archive and archive.records:
+            logger.info(f"Archived {archive.records} pages of {domain} to {archive.path}")
+            self.archive.compact(domain)
+        if traps.rejected:
+            logger.info(f"Trap heuristics rejected {traps.rejected} URLs on {domain}")
+        logger.info(f"Finished crawling domain {domain}: {len(crawled_data)} pages ({visited} visited)")
         return {
             'domain': domain,
             'pages': crawled_data,
             'total_pages': len(crawled_data),
+            'near_duplicates': duplicates,
             'crawl_date': datetime.now().isoformat(),
             'sync_info': {
                 'updated_pages': updated,
                 'new_pages': new,
-                'total_changes': len(updated) + len(new)
+                'not_modified_pages': not_modified,
+                'removed_pages': removed,
+                'total_changes': len(updated) + len(new) + len(removed)
             } if sync_mode else {}
         }
 
+    def _extract_archived(self, records: List[Dict]) -> List[Dict]:
+        """
+        Extract page records from archived HTML in the extraction pool.
+        """
+        htmls = [record['html'] for record in records]
+        urls = [record['url'] for record in records]
+        pool = get_extraction_pool()
+        if pool is not None:
+            try:
+                return [page for page, _ in pool.map(extract_page, htmls, urls, chunksize=8)]
+            except Exception as e:
+                reset_extraction_pool()
+                logger.warning(f"Extraction pool failed during re-index ({e}); extracting in-process")
+        return [extract_page(html, url)[0] for html, url in zip(htmls, urls)]
+
+    def reindex_domain(self, domain: str) -> Dict:
+        """
+        Rebuild a domain's crawl result from the page archive, without network.
+
+        The newest archived copy of every page is extracted again with the
+        current extraction settings, then goes through the same canonical,
+        length, near-duplicate and template filters as a live crawl. Pages
+        whose last fetch failed (HTTP 4xx/5xx) are left out.
+
+        Args:
+            domain (str): Domain URL that was crawled.
+
+        Returns:
+            Dict: Crawl results in the crawl_domain() format.
+        """
+        logger.info(f"Re-indexing domain from archive: {domain}")
+        states = self.state.get_pages(domain)
+        records = (
+            record for record in self.archive.latest_records(domain)
+            if (states.get(record['url'], {}).get('status_code') or 0) < 400 and record['html']
+        )
+        start = canonicalize_url(domain) or domain
+
+        # Only one batch of raw HTML is held at a time
+        pages, indexed, archived = [], set(), 0
+        while True:
+            batch = list(islice(records, REINDEX_BATCH_PAGES))
+            if not batch:
+                break
+            archived += len(batch)
+            for page in self._extract_archived(batch):
+                page.pop('links', None)
+                canonical = page.pop('canonical_url', None)
+                if canonical:
+                    canonical = canonicalize_url(canonical, prefer_host=urlparse(start).netloc)
+                    if canonical and not self.is_valid_url(canonical, start):
+                        canonical = None
+                key = canonical or page['url']
+                if key in indexed or page['word_count'] <= 50:
+                    continue
+                indexed.update((key, page['url']))
+                pages.append(page)
+
+        pages, duplicates = drop_near_duplicates(pages, NearDuplicateIndex(Config.NEAR_DUPLICATE_DISTANCE))
+        template = SiteTemplate()
+        for page in pages:
+            template.observe(page)
+        pages = template.strip(pages)
+        if template.enabled and template.pages_seen >= template.min_pages:
+            self.state.save_template(domain, sorted(template.learned()))
+
+        logger.info(f"Re-indexed {len(pages)} pages of {domain} from {archived} archived pages")
+        return {
+            'domain': domain,
+            'pages': pages,
+            'total_pages': len(pages),
+            'near_duplicates': duplicates,
+            'crawl_date': datetime.now().isoformat(),
+            'sync_info': {}
+        }
+
     def crawl_specific_urls(self, urls: List[str]) -> Dict:
         """
         Crawl and extract content from a list of specific URLs.
@@ -254,28 +488,30 @@ class EnhancedDomainCrawler:
         """
         logger.info(f"Crawling specific URLs: {len(urls)}")
         crawled, failed = [], []
+        targets = [url if url.startswith(("http://", "https://")) else "https://" + url for url in urls]
+        targets = list(dict.fromkeys(canonicalize_url(url) or url for url in targets))
 
-        for url in urls:
+        for result in self.engine.fetch_all(targets):
+            url, html = result['url'], result['html']
             try:
-                if not url.startswith(("http://", "https://")):
-                    url = "https://" + url
-
-                html, source = fetch_html(url)
-                if not html or len(html) < 100:
+                if not html or len(html) < 100 or result['page'] is None:
                     failed.append(url)
                     logger.warning(f"Skipped {url}: empty HTML")
                     continue
-                content = self.extract_content(html, url)
+                content = result['page']
+                content.pop('links')
+                content.pop('canonical_url', None)
                 if content['word_count'] > 50:
                     crawled.append(content)
                     logger.info(f"Crawled: {url} ({content['word_count']} words)")
                 else:
                     logger.warning(f"Skipped short content: {url}")
-                time.sleep(Config.CRAWL_DELAY)
             except Exception as e:
                 failed.append(url)
                 logger.error(f"Error crawling {url}: {e}")
 
+        crawled, duplicates = drop_near_duplicates(crawled)
+
         logger.info(f"Finished crawling specific URLs: {len(crawled)} pages, {len(failed)} failed")
         return {
             'domain': 'multiple-urls',
@@ -283,6 +519,7 @@ class EnhancedDomainCrawler:
             'pages': crawled,
             'failed_urls': failed,
             'total_pages': len(crawled),
+            'near_duplicates': duplicates,
             'crawl_date': datetime.now().isoformat(),
             'crawl_type': 'specific_urls'
         }
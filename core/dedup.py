@@ -0,0 +1,119 @@
+# ~/core/dedup.py
+"""
+Near-duplicate page detection for the Enhanced Domain Intelligence Analyzer.
+
+Each page gets a 64-bit SimHash of its word shingles. Pages whose
+fingerprints differ in at most Config.NEAR_DUPLICATE_DISTANCE bits are
+treated as copies (tag pages, pagination, tracking-parameter variants and
+so on) and only the first, highest-priority one is kept for embedding.
+"""
+
+from hashlib import blake2b
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from config import Config
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+SHINGLE_SIZE = 3
+
+def simhash(text: str, shingle_size: int = SHINGLE_SIZE) -> int:
+    """
+    Compute a 64-bit SimHash fingerprint of a text from word shingles.
+
+    Returns:
+        int: Fingerprint in [0, 2**64); 0 for empty text.
+    """
+    tokens = text.lower().split()
+    if not tokens:
+        return 0
+    if len(tokens) <= shingle_size:
+        shingles = [' '.join(tokens)]
+    else:
+        shingles = [' '.join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)]
+
+    hashes = np.fromiter(
+        (int.from_bytes(blake2b(s.encode(), digest_size=8).digest(), 'little') for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles)
+    )
+    bits = np.unpackbits(hashes.view(np.uint8), bitorder='little').reshape(-1, 64)
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > len(shingles)
+    return int(np.packbits(majority, bitorder='little').view('<u8')[0])
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+class NearDuplicateIndex:
+    """
+    Finds fingerprints within a Hamming distance of any indexed one.
+
+    The 64 bits are split into max_distance + 1 blocks; by the pigeonhole
+    principle two fingerprints within max_distance bits agree exactly on at
+    least one block, so only candidates sharing a block are compared.
+    """
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        blocks = max_distance + 1
+        width = 64 // blocks
+        self._blocks = [
+            (i * width, 64 - i * width if i == blocks - 1 else width)
+            for i in range(blocks)
+        ]
+        self._tables = [{} for _ in self._blocks]
+
+    def _keys(self, fingerprint: int):
+        for table, (shift, width) in zip(self._tables, self._blocks):
+            yield table, (fingerprint >> shift) & ((1 << width) - 1)
+
+    def find(self, fingerprint: int) -> Optional[str]:
+        """
+        Return the key of an indexed near-duplicate, or None.
+        """
+        for table, block in self._keys(fingerprint):
+            for other, key in table.get(block, ()):
+                if hamming_distance(fingerprint, other) <= self.max_distance:
+                    return key
+        return None
+
+    def add(self, fingerprint: int, key: str):
+        for table, block in self._keys(fingerprint):
+            table.setdefault(block, []).append((fingerprint, key))
+
+def drop_near_duplicates(pages: List[Dict], index: Optional[NearDuplicateIndex] = None) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Remove near-duplicate pages, keeping the first page of each group.
+
+    Args:
+        pages: Page records in priority order.
+        index: Index of pages already kept, to deduplicate a crawl wave by
+            wave; kept pages are added to it.
+
+    Returns:
+        (kept_pages, duplicates) where duplicates is a list of
+        {'url': ..., 'duplicate_of': ...} dicts.
+    """
+    if Config.NEAR_DUPLICATE_DISTANCE < 0 or (index is None and len(pages) < 2):
+        return pages, []
+
+    if index is None:
+        index = NearDuplicateIndex(Config.NEAR_DUPLICATE_DISTANCE)
+    kept, duplicates = [], []
+    for page in pages:
+        fingerprint = page.get('simhash')
+        if fingerprint is None:
+            fingerprint = simhash(page['content'])
+        original = index.find(fingerprint)
+        if original is not None:
+            duplicates.append({'url': page['url'], 'duplicate_of': original})
+            continue
+        index.add(fingerprint, page['url'])
+        kept.append(page)
+
+    if duplicates:
+        logger.info(f"Dropped {len(duplicates)} near-duplicate pages of {len(pages)}")
+    return kept, duplicates
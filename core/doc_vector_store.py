@@ -6,8 +6,8 @@ Based on Project 2's vector store but adapted for session management.
 
 import chromadb
 from chromadb.config import Settings
-from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
 from core.doc_config import DocConfig
+from core.embedding_cache import CachedEmbeddingFunction
 import os
 
 # Add logger
@@ -34,9 +34,7 @@ class DocumentVectorStore:
         # Create or get collection for this session
         self.collection = self.client.get_or_create_collection(
             name=self.collection_name,
-            embedding_function=SentenceTransformerEmbeddingFunction(
-                model_name=DocConfig.DOC_EMBEDDING_MODEL
-            )
+            embedding_function=CachedEmbeddingFunction(DocConfig.DOC_EMBEDDING_MODEL)
         )
         logger.info(f"ChromaDB collection ready: {self.collection_name}")
 
@@ -120,9 +118,7 @@ class DocumentVectorStore:
             self.client.delete_collection(self.collection_name)
             self.collection = self.client.create_collection(
                 name=self.collection_name,
-                embedding_function=SentenceTransformerEmbeddingFunction(
-                    model_name=DocConfig.DOC_EMBEDDING_MODEL
-                )
+                embedding_function=CachedEmbeddingFunction(DocConfig.DOC_EMBEDDING_MODEL)
             )
             logger.info(f"Cleared collection: {self.collection_name}")
             return True
@@ -0,0 +1,323 @@
+# ~/core/embedding_backend.py
+"""
+Embedding model backends for the Enhanced Domain Intelligence Analyzer.
+
+Config.EMBEDDING_BACKEND selects how embedding models run:
+
+- "torch": sentence-transformers on PyTorch (the default)
+- "onnx":  the same transformer exported to ONNX, with dynamic int8
+           quantization, run by ONNX Runtime on the CPU. Tokenization uses
+           the Rust `tokenizers` library and pooling/normalization are done
+           in numpy, so encoding imports neither torch nor transformers.
+
+The first time a model is used with the onnx backend it is exported and
+quantized once into Config.ONNX_MODEL_PATH (this step needs torch and
+sentence-transformers); later processes load the int8 model directly.
+Quantization shifts the vectors slightly: export_model() records the
+cosine drift against PyTorch on sample texts and parity_check() measures
+it on any texts. Vectors of the two backends are never mixed in the
+embedding cache (see embedding_cache_name()).
+
+Command line:
+
+    python -m core.embedding_backend export all-MiniLM-L6-v2
+    python -m core.embedding_backend parity all-MiniLM-L6-v2 --texts sample.txt
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from typing import Dict, List
+from config import Config
+
+import numpy as np
+
+try:
+    import onnxruntime
+    from tokenizers import Tokenizer
+    ONNX_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on installed extras
+    onnxruntime = None
+    Tokenizer = None
+    ONNX_AVAILABLE = False
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+__all__ = ["load_embedding_model", "embedding_cache_name", "OnnxEmbedder", "export_model", "parity_check"]
+
+ONNX_SUFFIX = "@onnx-int8"
+MODEL_FILE = "model.int8.onnx"
+META_FILE = "embedder.json"
+SAMPLE_TEXTS = [
+    "Contact us",
+    "Our support team answers questions about pricing, plans and billing within one business day.",
+    "The API returns paginated JSON; pass the cursor from the previous response to fetch the next page.",
+    "Shipping is free for orders over fifty dollars in the continental United States.",
+    "Privacy policy: we collect only the data needed to operate the service and never sell it to third parties. "
+    "You can request a copy or the deletion of your data at any time by writing to our data protection officer.",
+    "Installation requires Python 3.10 or later, a C compiler and about two gigabytes of free disk space.",
+    "Frequently asked questions",
+    "The quarterly report shows revenue growth of twelve percent, driven mostly by new enterprise customers "
+    "in Europe and Asia, while operating costs stayed flat compared to the same period last year."
+]
+
+def _model_dir(model_name: str) -> str:
+    return os.path.join(Config.ONNX_MODEL_PATH, re.sub(r'[^A-Za-z0-9_.-]', '_', model_name))
+
+def _cosine(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.clip(np.linalg.norm(a, axis=1, keepdims=True), 1e-12, None)
+    b = b / np.clip(np.linalg.norm(b, axis=1, keepdims=True), 1e-12, None)
+    return np.einsum("ij,ij->i", a, b)
+
+class OnnxEmbedder:
+    """
+    int8 ONNX Runtime model with the SentenceTransformer encode() API.
+
+    Args:
+        model_name: SentenceTransformer model name.
+        directory: Exported model directory (defaults to one per model
+            under Config.ONNX_MODEL_PATH).
+    """
+
+    def __init__(self, model_name: str, directory: str = None):
+        if not ONNX_AVAILABLE:
+            raise RuntimeError("the onnx embedding backend needs onnxruntime and tokenizers")
+        self.model_name = model_name
+        directory = directory or _model_dir(model_name)
+        with open(os.path.join(directory, META_FILE), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.pooling = self.meta['pooling']
+        self.normalize = self.meta['normalize']
+        self.dimension = self.meta['dimension']
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(directory, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.meta['max_seq_length'])
+        self.tokenizer.enable_padding(pad_id=self.meta['pad_id'], pad_token=self.meta['pad_token'])
+
+        options = onnxruntime.SessionOptions()
+        if Config.ONNX_THREADS > 0:
+            options.intra_op_num_threads = Config.ONNX_THREADS
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(directory, MODEL_FILE), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, texts, batch_size: int = 32, normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        """
+        Embed texts as a float32 array of shape (len(texts), dimension).
+        Other SentenceTransformer options (progress bar, output type) are ignored.
+        """
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+        texts = list(texts)
+        out = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for start in range(0, len(texts), max(1, batch_size)):
+            encodings = self.tokenizer.encode_batch(texts[start:start + batch_size])
+            mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            feeds = {'input_ids': np.array([e.ids for e in encodings], dtype=np.int64), 'attention_mask': mask}
+            if 'token_type_ids' in self.input_names:
+                feeds['token_type_ids'] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+            hidden = self.session.run(None, feeds)[0]
+            if self.pooling == 'cls':
+                vectors = hidden[:, 0]
+            else:
+                weights = mask[:, :, None].astype(np.float32)
+                vectors = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+            if self.normalize or normalize_embeddings:
+                vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+            out[start:start + len(encodings)] = vectors
+        return out[0] if single else out
+
+def export_model(model_name: str, directory: str = None) -> Dict:
+    """
+    Export a SentenceTransformer to ONNX and quantize it to int8.
+
+    Args:
+        model_name: SentenceTransformer model name.
+        directory: Output directory (defaults to one per model under
+            Config.ONNX_MODEL_PATH).
+
+    Returns:
+        Dict: The exported model's metadata, including the cosine drift
+        against PyTorch on sample texts.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    directory = directory or _model_dir(model_name)
+    logger.info(f"Exporting embedding model {model_name} to ONNX int8 in {directory}")
+    model = SentenceTransformer(model_name, device="cpu")
+    pooling = model[1].get_pooling_mode_str()
+    if pooling not in ('mean', 'cls'):
+        raise ValueError(f"unsupported pooling mode for the onnx backend: {pooling}")
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    sample = tokenizer(["export"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+
+    class HiddenStates(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, *inputs):
+            return self.transformer(**dict(zip(input_names, inputs)))[0]
+
+    # Write to a scratch directory and swap it in, so readers never see a partial export
+    tmp = directory + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    fp32_path = os.path.join(tmp, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            HiddenStates(),
+            tuple(sample[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes={name: {0: "batch", 1: "sequence"} for name in input_names + ["last_hidden_state"]},
+            opset_version=14
+        )
+    quantize_dynamic(fp32_path, os.path.join(tmp, MODEL_FILE), weight_type=QuantType.QInt8)
+    os.remove(fp32_path)
+    tokenizer.save_pretrained(tmp)  # tokenizer.json for the Rust tokenizer
+
+    meta = {
+        'model': model_name,
+        'pooling': pooling,
+        'normalize': any(type(module).__name__ == 'Normalize' for module in model),
+        'dimension': model.get_sentence_embedding_dimension(),
+        'max_seq_length': model.max_seq_length,
+        'pad_id': tokenizer.pad_token_id,
+        'pad_token': tokenizer.pad_token,
+        'exported_at': time.time()
+    }
+    with open(os.path.join(tmp, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+    cosine = _cosine(model.encode(SAMPLE_TEXTS, convert_to_numpy=True), OnnxEmbedder(model_name, tmp).encode(SAMPLE_TEXTS))
+    meta['sample_cosine_min'] = round(float(cosine.min()), 6)
+    with open(os.path.join(tmp, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp, directory)
+    logger.info(f"Exported {model_name} to ONNX int8 (minimum cosine to PyTorch on samples: {meta['sample_cosine_min']})")
+    return meta
+
+def load_embedding_model(model_name: str, backend: str = None):
+    """
+    Load an embedding model with the configured backend.
+
+    The onnx backend exports the model on first use. If ONNX Runtime is
+    not installed or the model cannot be exported or loaded, the PyTorch
+    backend is used instead.
+
+    Args:
+        model_name: SentenceTransformer model name.
+        backend: "torch" or "onnx" (defaults to Config.EMBEDDING_BACKEND).
+    """
+    backend = (backend or Config.EMBEDDING_BACKEND).lower()
+    if backend == "onnx":
+        if not ONNX_AVAILABLE:
+            logger.error("Embedding backend 'onnx' needs onnxruntime and tokenizers, falling back to torch")
+        else:
+            try:
+                if not os.path.exists(os.path.join(_model_dir(model_name), META_FILE)):
+                    export_model(model_name)
+                logger.info(f"Loading embedding model: {model_name} (ONNX Runtime, int8)")
+                return OnnxEmbedder(model_name)
+            except Exception as e:
+                logger.error(f"Failed to load ONNX embedding model {model_name}, falling back to torch: {e}")
+    elif backend != "torch":
+        logger.error(f"Unknown embedding backend '{backend}', using torch")
+
+    from sentence_transformers import SentenceTransformer
+    logger.info(f"Loading embedding model: {model_name}")
+    return SentenceTransformer(model_name)
+
+def embedding_cache_name(model_name: str, model) -> str:
+    """
+    Name of a loaded model in embedding cache keys; quantized vectors are
+    cached apart from the PyTorch ones.
+    """
+    return model_name + ONNX_SUFFIX if isinstance(model, OnnxEmbedder) else model_name
+
+def parity_check(model_name: str, texts: List[str] = None, batch_size: int = 32) -> Dict:
+    """
+    Compare the onnx backend with PyTorch on the same texts.
+
+    Args:
+        model_name: SentenceTransformer model name (exported if needed).
+        texts: Texts to embed (defaults to built-in sample texts).
+        batch_size: Texts per forward pass for both backends.
+
+    Returns:
+        Dict: Cosine similarity statistics between the two backends' vectors
+        (drift = 1 - cosine) and the encode throughput of each.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    texts = texts or SAMPLE_TEXTS
+    if not os.path.exists(os.path.join(_model_dir(model_name), META_FILE)):
+        export_model(model_name)
+    backends = {'torch': SentenceTransformer(model_name, device="cpu"), 'onnx': OnnxEmbedder(model_name)}
+    vectors, throughput = {}, {}
+    for name, model in backends.items():
+        model.encode(texts[:batch_size], batch_size=batch_size)  # Warm up
+        start = time.perf_counter()
+        vectors[name] = np.asarray(model.encode(texts, batch_size=batch_size), dtype=np.float32)
+        seconds = time.perf_counter() - start
+        throughput[name] = round(len(texts) / seconds, 2) if seconds > 0 else 0.0
+
+    cosine = _cosine(vectors['torch'], vectors['onnx'])
+    return {
+        'model': model_name,
+        'texts': len(texts),
+        'cosine_mean': round(float(cosine.mean()), 6),
+        'cosine_min': round(float(cosine.min()), 6),
+        'drift_mean': round(float(1 - cosine.mean()), 6),
+        'drift_max': round(float(1 - cosine.min()), 6),
+        'drift_p99': round(float(np.percentile(1 - cosine, 99)), 6),
+        'torch_texts_per_s': throughput['torch'],
+        'onnx_texts_per_s': throughput['onnx'],
+        'speedup': round(throughput['onnx'] / throughput['torch'], 2) if throughput['torch'] else 0.0
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export and check the ONNX int8 embedding backend.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="export and quantize a model (replaces an earlier export)")
+    export.add_argument("model", nargs="?", default=Config.EMBEDDING_MODEL)
+    parity = commands.add_parser("parity", help="report cosine drift and speed against PyTorch")
+    parity.add_argument("model", nargs="?", default=Config.EMBEDDING_MODEL)
+    parity.add_argument("--texts", help="file with one text per line (default: built-in samples)")
+    parity.add_argument("--batch-size", type=int, default=Config.EMBED_BATCH_SIZE)
+    parity.add_argument("--max-drift", type=float, default=0.02, help="exit with status 1 above this drift")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        print(json.dumps(export_model(args.model), indent=2))
+        return 0
+
+    texts = None
+    if args.texts:
+        with open(args.texts, "r", encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    report = parity_check(args.model, texts, args.batch_size)
+    print(json.dumps(report, indent=2))
+    return 1 if report['drift_max'] > args.max_drift else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
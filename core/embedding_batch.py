@@ -0,0 +1,124 @@
+# ~/core/embedding_batch.py
+"""
+Batched embedding for the Enhanced Domain Intelligence Analyzer.
+
+BatchedEncoder sits between the embedding cache and the model. It sorts the
+texts of a call by length and encodes them in fixed-size buckets
+(Config.EMBED_BATCH_SIZE), so each forward pass pads its texts to a similar
+length, and writes every bucket straight into one preallocated float32
+array in the caller's order. Large calls can instead fan out to a
+SentenceTransformer multi-process pool (Config.EMBED_PROCESSES) on many-core
+hosts; the pool is started once per model and stopped at exit.
+"""
+
+import atexit
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+from config import Config
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+__all__ = ["BatchedEncoder", "length_buckets"]
+
+_pools: Dict[Tuple[int, int], Tuple[object, object, threading.Lock]] = {}
+_pools_lock = threading.Lock()
+
+def length_buckets(texts: List[str], batch_size: int) -> List[np.ndarray]:
+    """
+    Split text positions into batches of similar length, longest first.
+    """
+    order = np.argsort(-np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts)), kind="stable")
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+def _get_pool(model, processes: int):
+    """
+    Start (once) and return the multi-process pool of a model with its lock,
+    or None if the model cannot run one.
+    """
+    key = (id(model), processes)
+    entry = _pools.get(key)
+    if entry is None:
+        with _pools_lock:
+            entry = _pools.get(key)
+            if entry is None:
+                pool = None
+                if hasattr(model, "start_multi_process_pool"):
+                    try:
+                        pool = model.start_multi_process_pool(target_devices=["cpu"] * processes)
+                        atexit.register(_stop_pool, model, pool)
+                        logger.info(f"Embedding process pool ready ({processes} processes)")
+                    except Exception as e:
+                        logger.error(f"Failed to start embedding process pool, encoding in-process: {e}")
+                else:
+                    logger.warning(f"{type(model).__name__} has no multi-process pool, encoding in-process")
+                # The model is kept so its id() stays unique while the pool exists
+                entry = (model, pool, threading.Lock())
+                _pools[key] = entry
+    return entry[1], entry[2]
+
+def _stop_pool(model, pool):
+    try:
+        type(model).stop_multi_process_pool(pool)
+    except Exception as e:
+        logger.warning(f"Failed to stop embedding process pool: {e}")
+
+class BatchedEncoder:
+    """
+    Length-bucketed, optionally multi-process encode() around a SentenceTransformer.
+
+    Args:
+        model: The wrapped model (anything with encode()).
+        batch_size: Texts per forward pass (defaults to Config.EMBED_BATCH_SIZE).
+        processes: Encode processes (defaults to Config.EMBED_PROCESSES; 0 = in-process).
+        min_texts: Fewest texts sent to the process pool
+            (defaults to Config.EMBED_MULTIPROCESS_MIN).
+    """
+
+    def __init__(self, model, batch_size: int = None, processes: int = None, min_texts: int = None):
+        self.model = model
+        self.batch_size = max(1, batch_size or Config.EMBED_BATCH_SIZE)
+        self.processes = Config.EMBED_PROCESSES if processes is None else processes
+        self.min_texts = Config.EMBED_MULTIPROCESS_MIN if min_texts is None else min_texts
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        """
+        Embed texts as a float32 array of shape (len(texts), dimension).
+        """
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+        texts = list(texts)
+        batch_size = kwargs.pop("batch_size", None) or self.batch_size
+        kwargs.pop("show_progress_bar", None)
+        out = np.empty((len(texts), self.get_sentence_embedding_dimension()), dtype=np.float32)
+        if not texts:
+            return out
+
+        buckets = length_buckets(texts, batch_size)
+        pool = None
+        if self.processes > 0 and len(texts) >= self.min_texts and not kwargs:
+            pool, pool_lock = _get_pool(self.model, self.processes)
+        if pool is not None:
+            order = np.concatenate(buckets)
+            # Pool queues are shared, so calls from several threads take turns
+            with pool_lock:
+                vectors = self.model.encode_multi_process([texts[i] for i in order], pool, batch_size=batch_size)
+            out[order] = vectors
+        else:
+            for positions in buckets:
+                out[positions] = self.model.encode(
+                    [texts[i] for i in positions],
+                    batch_size=batch_size,
+                    show_progress_bar=False,
+                    convert_to_numpy=True,
+                    **kwargs
+                )
+        logger.debug(f"Encoded {len(texts)} texts in {len(buckets)} buckets{' (process pool)' if pool is not None else ''}")
+        return out[0] if single else out
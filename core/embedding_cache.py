@@ -0,0 +1,338 @@
+# ~/core/embedding_cache.py
+"""
+Content-addressed embedding cache for the Enhanced Domain Intelligence Analyzer.
+
+Embeddings are keyed by (model name, hash of the whitespace-normalized
+text), so a chunk embedded once - by any session, crawl, sync or document
+upload - is never sent through the encoder again. Two tiers:
+
+- memory: an LRU of recently used vectors (Config.EMBED_CACHE_MEMORY_ITEMS)
+- disk:   one fixed-size float32 memory-mapped matrix per model, sized by
+          Config.EMBED_CACHE_DISK_MB, with a SQLite index of key -> row.
+          When it is full the least recently used rows are overwritten.
+
+CachedEmbedder wraps a BatchedEncoder for EnhancedContentProcessor and
+CachedEmbeddingFunction plugs the same cache into ChromaDB collections such
+as DocumentVectorStore's.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from hashlib import blake2b
+from typing import Dict, List, Optional
+
+import numpy as np
+from config import Config
+from core.embedding_backend import embedding_cache_name, load_embedding_model
+from core.embedding_batch import BatchedEncoder
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+__all__ = ["get_embedding_cache", "CachedEmbedder", "CachedEmbeddingFunction", "text_key"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model   TEXT NOT NULL,
+    key     TEXT NOT NULL,
+    slot    INTEGER NOT NULL,
+    used_at REAL NOT NULL,
+    PRIMARY KEY (model, key)
+);
+CREATE INDEX IF NOT EXISTS embeddings_lru ON embeddings (model, used_at);
+"""
+_SQL_BATCH = 500  # Stay below SQLite's bound-parameter limit
+# encode() options that do not change the vectors
+_NEUTRAL_KWARGS = {"batch_size", "show_progress_bar"}
+
+_cache = None
+_lock = threading.Lock()
+_models: Dict[str, object] = {}
+_models_lock = threading.Lock()
+
+def text_key(model_name: str, text: str) -> str:
+    """
+    Cache key of a text for a model: hash of the model name and the text
+    with whitespace runs collapsed.
+    """
+    normalized = ' '.join(text.split())
+    return blake2b(f"{model_name}\0{normalized}".encode("utf-8"), digest_size=16).hexdigest()
+
+class _DiskTier:
+    """
+    Fixed-capacity memory-mapped matrix of one model's embeddings.
+    """
+
+    def __init__(self, directory: str, model_name: str, dimension: int, index_path: str, max_bytes: int):
+        self.model = model_name
+        self.dimension = dimension
+        self.capacity = max(1, max_bytes // (dimension * 4))
+        self.index_path = index_path
+        slug = re.sub(r'[^A-Za-z0-9_.-]', '_', model_name)
+        self.path = os.path.join(directory, f"{slug}.{dimension}.f32")
+        size = self.capacity * dimension * 4
+        if not os.path.exists(self.path) or os.path.getsize(self.path) != size:
+            # New file or a different configured size: start this model over
+            with open(self.path, "wb") as f:
+                f.truncate(size)
+            with self._connect() as conn:
+                conn.execute("DELETE FROM embeddings WHERE model = ?", (model_name,))
+        self.matrix = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(self.capacity, dimension))
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        now = time.time()
+        with self._connect() as conn:
+            # Hold the write lock while reading slots: put() in another process
+            # cannot evict and overwrite a slot between the lookup and the read
+            conn.execute("BEGIN IMMEDIATE")
+            for i in range(0, len(keys), _SQL_BATCH):
+                part = keys[i:i + _SQL_BATCH]
+                placeholders = ",".join("?" for _ in part)
+                rows = conn.execute(
+                    f"SELECT key, slot FROM embeddings WHERE model = ? AND key IN ({placeholders})",
+                    [self.model, *part]
+                ).fetchall()
+                for key, slot in rows:
+                    found[key] = np.array(self.matrix[slot])
+                if rows:
+                    conn.executemany(
+                        "UPDATE embeddings SET used_at = ? WHERE model = ? AND key = ?",
+                        [(now, self.model, key) for key, _ in rows]
+                    )
+        return found
+
+    def put(self, vectors: Dict[str, np.ndarray]):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")  # Serialize slot allocation across processes
+            keys = list(vectors)
+            present = set()
+            for i in range(0, len(keys), _SQL_BATCH):
+                part = keys[i:i + _SQL_BATCH]
+                placeholders = ",".join("?" for _ in part)
+                present.update(row[0] for row in conn.execute(
+                    f"SELECT key FROM embeddings WHERE model = ? AND key IN ({placeholders})",
+                    [self.model, *part]
+                ))
+            # Slots 0..used-1 are occupied; a key stored by another process keeps its slot
+            items = [(key, vector) for key, vector in vectors.items() if key not in present][-self.capacity:]
+            if not items:
+                return
+            used = conn.execute("SELECT COUNT(*) FROM embeddings WHERE model = ?", (self.model,)).fetchone()[0]
+            free = list(range(used, min(self.capacity, used + len(items))))
+            if len(free) < len(items):
+                victims = conn.execute(
+                    "SELECT key, slot FROM embeddings WHERE model = ? ORDER BY used_at LIMIT ?",
+                    (self.model, len(items) - len(free))
+                ).fetchall()
+                conn.executemany(
+                    "DELETE FROM embeddings WHERE model = ? AND key = ?",
+                    [(self.model, key) for key, _ in victims]
+                )
+                free.extend(slot for _, slot in victims)
+            for (key, vector), slot in zip(items, free):
+                self.matrix[slot] = vector
+            self.matrix.flush()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, key, slot, used_at) VALUES (?, ?, ?, ?)",
+                [(self.model, key, slot, now) for (key, _), slot in zip(items, free)]
+            )
+
+class EmbeddingCache:
+    """
+    Two-tier (memory LRU, memory-mapped disk) store of embedding vectors.
+
+    Args:
+        path: Cache directory (defaults to Config.EMBED_CACHE_PATH).
+        memory_items: LRU capacity (defaults to Config.EMBED_CACHE_MEMORY_ITEMS).
+        disk_mb: Disk tier size per model (defaults to Config.EMBED_CACHE_DISK_MB).
+    """
+
+    def __init__(self, path: str = None, memory_items: int = None, disk_mb: int = None):
+        self.path = path or Config.EMBED_CACHE_PATH
+        self.memory_items = Config.EMBED_CACHE_MEMORY_ITEMS if memory_items is None else memory_items
+        self.disk_bytes = (Config.EMBED_CACHE_DISK_MB if disk_mb is None else disk_mb) * 1024 * 1024
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._disks: Dict[tuple, _DiskTier] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.disk_bytes > 0:
+            os.makedirs(self.path, exist_ok=True)
+            self._index_path = os.path.join(self.path, "index.db")
+            conn = sqlite3.connect(self._index_path, timeout=30)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+            finally:
+                conn.close()
+
+    def _disk(self, model_name: str, dimension: int) -> Optional[_DiskTier]:
+        if self.disk_bytes <= 0:
+            return None
+        tier = self._disks.get((model_name, dimension))
+        if tier is None:
+            tier = _DiskTier(self.path, model_name, dimension, self._index_path, self.disk_bytes)
+            self._disks[(model_name, dimension)] = tier
+        return tier
+
+    def _remember(self, key: str, vector: np.ndarray):
+        if self.memory_items <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, model_name: str, dimension: int, keys: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Return {key: vector} for the keys found in either tier.
+        """
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                else:
+                    missing.append(key)
+            disk = self._disk(model_name, dimension)
+            if missing and disk is not None:
+                try:
+                    from_disk = disk.get(missing)
+                except Exception as e:
+                    logger.warning(f"Embedding cache disk read failed: {e}")
+                    from_disk = {}
+                for key, vector in from_disk.items():
+                    self._remember(key, vector)
+                found.update(from_disk)
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, model_name: str, dimension: int, vectors: Dict[str, np.ndarray]):
+        """
+        Store new vectors in both tiers.
+        """
+        if not vectors:
+            return
+        with self._lock:
+            for key, vector in vectors.items():
+                self._remember(key, vector)
+            disk = self._disk(model_name, dimension)
+            if disk is not None:
+                try:
+                    disk.put(vectors)
+                except Exception as e:
+                    logger.warning(f"Embedding cache disk write failed: {e}")
+
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Thread-safe function to return the process-wide embedding cache.
+    """
+    global _cache
+    if _cache is not None:
+        return _cache
+
+    with _lock:
+        if _cache is None:
+            _cache = EmbeddingCache()
+            logger.info(f"Embedding cache ready at {_cache.path} "
+                        f"({_cache.memory_items} in memory, {_cache.disk_bytes // (1024 * 1024)} MB on disk per model)")
+        return _cache
+
+class CachedEmbedder:
+    """
+    SentenceTransformer stand-in that only encodes texts missing from the cache.
+
+    Args:
+        model: The wrapped model (anything with encode()).
+        model_name: Name used in cache keys.
+        cache: Cache to use (defaults to get_embedding_cache()).
+    """
+
+    def __init__(self, model, model_name: str, cache: EmbeddingCache = None):
+        self.model = model
+        self.model_name = model_name
+        self.cache = cache or get_embedding_cache()
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        """
+        Embed texts as a float32 array of shape (len(texts), dimension).
+        Options that change the vectors (e.g. normalize_embeddings) bypass the cache.
+        """
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+        if set(kwargs) - _NEUTRAL_KWARGS:
+            return self.model.encode(texts, **kwargs)
+        if not texts:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        dimension = self.get_sentence_embedding_dimension()
+        keys = [text_key(self.model_name, text) for text in texts]
+        found = self.cache.get(self.model_name, dimension, keys)
+
+        todo = {}  # key -> text, deduplicated
+        for key, text in zip(keys, texts):
+            if key not in found and key not in todo:
+                todo[key] = text
+        if todo:
+            encoded = np.asarray(self.model.encode(list(todo.values()), **kwargs), dtype=np.float32)
+            fresh = dict(zip(todo.keys(), encoded))
+            self.cache.put(self.model_name, dimension, fresh)
+            found.update(fresh)
+        logger.debug(f"Embedded {len(texts)} texts: {len(texts) - len(todo)} from cache, {len(todo)} encoded")
+
+        out = np.stack([found[key] for key in keys]).astype(np.float32, copy=False)
+        return out[0] if single else out
+
+def _shared_model(model_name: str):
+    """
+    Load an embedding model (Config.EMBEDDING_BACKEND) once per process and model name.
+    """
+    model = _models.get(model_name)
+    if model is not None:
+        return model
+    with _models_lock:
+        if model_name not in _models:
+            _models[model_name] = load_embedding_model(model_name)
+        return _models[model_name]
+
+class CachedEmbeddingFunction:
+    """
+    ChromaDB embedding function backed by a shared model and the embedding cache.
+
+    Args:
+        model_name: SentenceTransformer model name.
+    """
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self._embedder = None
+
+    def __call__(self, texts: List[str]) -> List[List[float]]:
+        if self._embedder is None:
+            model = _shared_model(self.model_name)
+            self._embedder = CachedEmbedder(BatchedEncoder(model), embedding_cache_name(self.model_name, model))
+        return self._embedder.encode(list(texts)).tolist()
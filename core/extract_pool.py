@@ -0,0 +1,73 @@
+# ~/core/extract_pool.py
+"""
+Process pool for CPU-bound HTML extraction.
+
+Parsing and text cleanup are pure CPU work that holds the GIL, so running
+them on the crawl thread stalls every other session served by the process.
+Pages are handed to a ProcessPoolExecutor instead, as raw HTML in and a
+compact page record out. Workers are forked from a clean forkserver process
+(spawned where forkserver is unavailable), never from the multi-threaded
+Flask process itself.
+"""
+
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from config import Config
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+__all__ = ["get_extraction_pool", "reset_extraction_pool", "new_extraction_pool"]
+
+_pool = None
+_lock = threading.Lock()
+
+def new_extraction_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Start a private extraction pool, e.g. for a bulk ingestion run.
+    The caller owns it and must shut it down.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["core.html_extract"])
+    else:
+        context = multiprocessing.get_context("spawn")
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    logger.info(f"Extraction process pool ready ({workers} workers, {context.get_start_method()})")
+    return pool
+
+def get_extraction_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Thread-safe function to return the shared extraction process pool.
+
+    Returns:
+        ProcessPoolExecutor, or None when Config.EXTRACT_WORKERS is 0 (the
+        caller then extracts in a thread of the current process).
+    """
+    global _pool
+    if Config.EXTRACT_WORKERS <= 0:
+        return None
+    if _pool is not None:
+        return _pool
+
+    with _lock:
+        if _pool is None:
+            _pool = new_extraction_pool(Config.EXTRACT_WORKERS)
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+def reset_extraction_pool():
+    """
+    Drop a broken pool (e.g. after a worker crash) so the next call to
+    get_extraction_pool() starts a fresh one.
+    """
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+            logger.warning("Extraction process pool reset")
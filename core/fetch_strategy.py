@@ -0,0 +1,84 @@
+# ~/core/fetch_strategy.py
+"""
+Per-host fetch strategy memory for the Enhanced Domain Intelligence Analyzer.
+
+Learns which hosts serve usable HTML over plain HTTP and which only work
+after a Playwright render, so later pages and syncs of a JavaScript-only
+site skip the wasted HTTP request and parse. Render-only hosts are
+re-probed with plain HTTP every Config.FETCH_REPROBE_EVERY pages so a site
+change is noticed. State is persisted in the crawl state store.
+"""
+
+from typing import Dict
+from config import Config
+from core.crawl_state import CrawlStateStore
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+class FetchStrategyMemory:
+    """
+    Chooses between HTTP-first fetching and direct rendering per host.
+
+    A host goes straight to Playwright once FETCH_RENDER_STREAK probes in a
+    row needed a render; any probe that plain HTTP satisfies resets it.
+
+    Args:
+        store: Crawl state store used for persistence.
+    """
+
+    def __init__(self, store: CrawlStateStore):
+        self.store = store
+        self._hosts: Dict[str, Dict] = {}
+        self._dirty = set()
+
+    def _state(self, host: str) -> Dict:
+        if host not in self._hosts:
+            stored = self.store.get_host_strategies([host]).get(host)
+            self._hosts[host] = {
+                'render_streak': stored['render_streak'] if stored else 0,
+                'pages_since_probe': stored['pages_since_probe'] if stored else 0
+            }
+        return self._hosts[host]
+
+    def plan(self, host: str) -> str:
+        """
+        Return 'render' to go straight to Playwright, or 'http' to probe
+        with plain HTTP first.
+        """
+        state = self._state(host)
+        if state['render_streak'] >= Config.FETCH_RENDER_STREAK and state['pages_since_probe'] < Config.FETCH_REPROBE_EVERY:
+            return "render"
+        return "http"
+
+    def observe(self, host: str, needed_render: bool, probed: bool):
+        """
+        Record the outcome of one page fetch.
+
+        Args:
+            host: Host the page was fetched from.
+            needed_render: True if the page only worked after rendering.
+            probed: True if plain HTTP was tried first for this page.
+        """
+        state = self._state(host)
+        if probed:
+            previous = state['render_streak']
+            state['render_streak'] = previous + 1 if needed_render else 0
+            state['pages_since_probe'] = 0
+            if previous >= Config.FETCH_RENDER_STREAK and not needed_render:
+                logger.info(f"Host {host} serves plain HTML again; switching back to HTTP-first")
+            elif state['render_streak'] == Config.FETCH_RENDER_STREAK:
+                logger.info(f"Host {host} needs rendering; fetching its pages with Playwright directly")
+        else:
+            state['pages_since_probe'] += 1
+        self._dirty.add(host)
+
+    def flush(self):
+        """
+        Persist changed host strategies.
+        """
+        if not self._dirty:
+            return
+        self.store.save_host_strategies({host: self._hosts[host] for host in self._dirty})
+        self._dirty.clear()
@@ -0,0 +1,227 @@
+# ~/core/fetcher.py
+"""
+Page fetching for the Enhanced Domain Intelligence Analyzer.
+
+Provides the synchronous fetch_html() helper and an asyncio-based crawl engine
+that fetches whole batches of URLs concurrently, with a global and a per-host
+concurrency limit. Both paths try plain HTTP first and fall back to Playwright
+rendering when the returned page looks empty; the engine can also remember
+hosts that always need rendering and go straight to Playwright for them.
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from config import Config
+from core.http_client import get_http_client, get_async_client, run_async
+from core.browser_pool import get_browser_pool
+from core.html_extract import extract_html, extract_page, looks_empty
+from core.extract_pool import get_extraction_pool, reset_extraction_pool
+from core.rate_limiter import HostRateLimiter, BACKOFF_STATUSES
+from concurrent.futures.process import BrokenProcessPool
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+def render_with_playwright(url: str) -> str:
+    """
+    Render a URL in a pooled headless Chromium and return the resulting HTML.
+    Returns an empty string if rendering fails.
+    """
+    try:
+        html = get_browser_pool().render(url)
+        logger.info(f"Used Playwright for {url}")
+        return html
+    except Exception as e:
+        logger.error(f"Playwright failed for {url}: {e}")
+        return ""
+
+def fetch_html(url: str) -> Tuple[str, str]:
+    """
+    Fetch HTML content from a URL with the shared HTTP client first.
+    If the content is too short or likely empty, fallback to Playwright.
+    Returns (html_text, source) where source is 'requests' or 'playwright'.
+    """
+    try:
+        resp = get_http_client().get(url)
+        html = resp.text
+    except Exception as e:
+        logger.error(f"HTTP fetch failed for {url}: {e}")
+        html = ""
+
+    if html and not looks_empty(html, extract_html(html)['has_body_text']):
+        logger.info(f"Used requests for {url}")
+        return html, "requests"
+
+    logger.info(f"Fallback to Playwright for {url}")
+    rendered = render_with_playwright(url)
+    if rendered:
+        return rendered, "playwright"
+    return html, "requests"
+
+class AsyncCrawlEngine:
+    """
+    Fetches batches of URLs concurrently on a single asyncio event loop.
+
+    A global semaphore caps the total number of in-flight fetches and a
+    per-host semaphore caps how hard any single site is hit. Request pacing
+    per host comes from an adaptive token bucket (HostRateLimiter) that
+    persists across batches, so each site is crawled at the rate it can
+    actually sustain. Playwright
+    fallbacks run in worker threads so they never block the event loop.
+    All batches run on the shared background event loop and reuse its
+    pooled async client, so connections stay alive between crawl waves.
+
+    Args:
+        max_concurrency: Total in-flight fetches (defaults to CRAWL_CONCURRENCY).
+        per_host_concurrency: In-flight fetches per host (defaults to CRAWL_HOST_CONCURRENCY).
+        strategy: Optional FetchStrategyMemory that skips plain HTTP for
+            hosts known to need rendering.
+    """
+
+    def __init__(self, max_concurrency: int = None, per_host_concurrency: int = None, strategy=None):
+        self.max_concurrency = max_concurrency or Config.CRAWL_CONCURRENCY
+        self.per_host_concurrency = per_host_concurrency or Config.CRAWL_HOST_CONCURRENCY
+        self.strategy = strategy
+        self._limiters = {}
+
+    def fetch_all(self, urls: List[str], conditional: Dict[str, Dict[str, str]] = None,
+                  crawl_delay: float = None) -> List[Dict]:
+        """
+        Fetch all URLs concurrently.
+
+        Args:
+            urls: URLs to fetch.
+            conditional: Optional per-URL conditional request headers
+                (If-None-Match/If-Modified-Since).
+            crawl_delay: Site-mandated delay (robots.txt Crawl-delay). When
+                set, each host is fetched one request at a time and never
+                faster than this delay.
+
+        Returns:
+            List of result dicts in the same order as urls, each with
+            'url', 'html', 'source', 'status', 'headers', 'elapsed' (HTTP
+            response time in seconds) and 'page' (the extracted page record,
+            built in the extraction process pool, or None). html is an empty string when the page could not be
+            fetched, and source is 'not_modified' when the server answered
+            304.
+        """
+        if not urls:
+            return []
+        return run_async(self._fetch_all(urls, conditional or {}, crawl_delay))
+
+    async def _fetch_all(self, urls: List[str], conditional: Dict[str, Dict[str, str]],
+                         crawl_delay: Optional[float]) -> List[Dict]:
+        global_slots = asyncio.Semaphore(self.max_concurrency)
+        host_slots = {}
+        per_host = 1 if crawl_delay is not None else self.per_host_concurrency
+        client = get_async_client()
+        tasks = [
+            self._fetch_one(client, url, conditional.get(url), global_slots, host_slots, per_host, crawl_delay)
+            for url in urls
+        ]
+        results = await asyncio.gather(*tasks)
+        if self.strategy is not None:
+            self.strategy.flush()
+        logger.info(f"Fetched {len(results)} URLs (concurrency {self.max_concurrency}, per host {per_host})")
+        return results
+
+    def _limiter(self, host: str, crawl_delay: Optional[float], burst: int) -> HostRateLimiter:
+        limiter = self._limiters.get(host)
+        floor = crawl_delay if crawl_delay is not None else Config.RATE_MIN_DELAY
+        if limiter is None:
+            initial = crawl_delay if crawl_delay is not None else Config.CRAWL_DELAY
+            limiter = self._limiters[host] = HostRateLimiter(host, initial, floor, burst)
+        elif limiter.floor != floor:
+            limiter.set_floor(floor)
+        return limiter
+
+    async def _fetch_one(self, client: httpx.AsyncClient, url: str, headers: Optional[Dict[str, str]],
+                         global_slots: asyncio.Semaphore, host_slots: dict,
+                         per_host: int, crawl_delay: Optional[float]) -> Dict:
+        host = urlparse(url).netloc
+        if host not in host_slots:
+            host_slots[host] = asyncio.Semaphore(per_host)
+        limiter = self._limiter(host, crawl_delay, per_host)
+
+        async with host_slots[host]:
+            for attempt in range(Config.RATE_MAX_RETRIES + 1):
+                # Wait for the host's bucket before taking a global slot, so
+                # a throttled host never idles slots other hosts could use
+                await limiter.acquire()
+                async with global_slots:
+                    result = await self._fetch(client, url, headers)
+                # Direct renders carry no HTTP status; only failures count
+                if result['status'] is not None or not result['html']:
+                    limiter.feedback(result['status'], result['elapsed'], result['headers'].get('retry-after'))
+                if result['status'] not in BACKOFF_STATUSES or attempt == Config.RATE_MAX_RETRIES:
+                    break
+                logger.info(f"Retrying {url} after HTTP {result['status']} (attempt {attempt + 1})")
+        return result
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str, headers: Optional[Dict[str, str]]) -> Dict:
+        result = {'url': url, 'html': "", 'source': "requests", 'status': None, 'headers': {}, 'elapsed': None, 'page': None}
+        host = urlparse(url).netloc
+        if self.strategy is not None and self.strategy.plan(host) == "render":
+            # Known render-only host: skip the plain HTTP request and parse
+            rendered = await asyncio.to_thread(render_with_playwright, url)
+            if rendered:
+                self.strategy.observe(host, needed_render=True, probed=False)
+                result['html'] = rendered
+                result['source'] = "playwright"
+                result['page'], _ = await self._extract(rendered, url)
+                return result
+
+        try:
+            resp = await client.get(url, headers=headers)
+            result['status'] = resp.status_code
+            result['headers'] = {k.lower(): v for k, v in resp.headers.items()}
+            result['elapsed'] = resp.elapsed.total_seconds()
+            if resp.status_code == 304:
+                logger.info(f"Not modified: {url}")
+                result['source'] = "not_modified"
+                return result
+            if resp.status_code in BACKOFF_STATUSES:
+                # Throttled: let the rate limiter retry instead of rendering
+                return result
+            result['html'] = resp.text
+        except Exception as e:
+            logger.error(f"HTTP fetch failed for {url}: {e}")
+
+        if result['html']:
+            # One parse yields both the page record and the render decision
+            result['page'], has_body_text = await self._extract(result['html'], url)
+            if not looks_empty(result['html'], has_body_text):
+                logger.info(f"Used requests for {url}")
+                if self.strategy is not None:
+                    self.strategy.observe(host, needed_render=False, probed=True)
+                return result
+
+        logger.info(f"Fallback to Playwright for {url}")
+        rendered = await asyncio.to_thread(render_with_playwright, url)
+        if rendered:
+            if self.strategy is not None:
+                self.strategy.observe(host, needed_render=True, probed=True)
+            result['html'] = rendered
+            result['source'] = "playwright"
+            result['page'], _ = await self._extract(rendered, url)
+        return result
+
+    async def _extract(self, html: str, url: str) -> Tuple[Optional[Dict], bool]:
+        """
+        Run extract_page in the extraction process pool.
+        Returns (None, False) if extraction fails.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(get_extraction_pool(), extract_page, html, url)
+        except BrokenProcessPool:
+            reset_extraction_pool()
+            logger.warning(f"Extraction pool broke; extracting {url} in-process")
+            return extract_page(html, url)
+        except Exception as e:
+            logger.error(f"Extraction failed for {url}: {e}")
+            return None, False
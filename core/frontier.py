@@ -0,0 +1,125 @@
+# ~/core/frontier.py
+"""
+Crawl frontier for the Enhanced Domain Intelligence Analyzer.
+
+Keeps discovered URLs in a priority queue so the page budget is spent on the
+most valuable pages first. URLs are scored by priority keywords and by how
+deep they sit, both in link hops from the homepage and in URL path segments.
+"""
+
+import heapq
+import itertools
+import re
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+# Earlier keywords rank higher
+PRIORITY_KEYWORDS = [
+    'about', 'service', 'product', 'solution', 'team',
+    'contact', 'portfolio', 'work', 'case-study', 'blog',
+    'news', 'career', 'job', 'pricing', 'plan'
+]
+
+class CrawlFrontier:
+    """
+    Priority queue of URLs to crawl with depth limits and O(1) deduplication.
+
+    Args:
+        max_depth: Maximum link hops from the seed URLs.
+        keywords: Priority keywords, most valuable first.
+    """
+
+    KEYWORD_WEIGHT = 10.0
+    HOP_PENALTY = 2.0
+    SEGMENT_PENALTY = 1.0
+
+    def __init__(self, max_depth: int, keywords: List[str] = None):
+        self.max_depth = max_depth
+        keywords = keywords or PRIORITY_KEYWORDS
+        self._keyword_rank = {kw: rank for rank, kw in enumerate(keywords)}
+        # Longest keywords first so overlapping keywords match in full
+        pattern = '|'.join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True))
+        self._keyword_re = re.compile(pattern)
+        self._heap = []
+        self._seen = set()
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def score(self, url: str, depth: int) -> float:
+        """
+        Score a URL; higher scores are crawled first.
+        """
+        path = urlparse(url).path.lower()
+        ranks = [self._keyword_rank[m] for m in self._keyword_re.findall(path)]
+        keyword_bonus = 0.0
+        if ranks:
+            keyword_bonus = self.KEYWORD_WEIGHT * (1 - min(ranks) / len(self._keyword_rank))
+        segments = len([s for s in path.split('/') if s])
+        return keyword_bonus - self.HOP_PENALTY * depth - self.SEGMENT_PENALTY * segments
+
+    def push(self, url: str, depth: int, score: float = None) -> bool:
+        """
+        Add a URL unless it was already seen or is too deep.
+
+        Args:
+            url: URL to enqueue.
+            depth: Link hops from the seed URL.
+            score: Explicit priority, overriding the computed score.
+
+        Returns:
+            bool: True if the URL was enqueued.
+        """
+        if depth > self.max_depth or url in self._seen:
+            return False
+        self._seen.add(url)
+        if score is None:
+            score = self.score(url, depth)
+        # heapq is a min-heap; the counter keeps insertion order for ties
+        heapq.heappush(self._heap, (-score, next(self._counter), url, depth))
+        return True
+
+    def pop(self) -> Tuple[str, int]:
+        """
+        Remove and return the highest-priority (url, depth).
+        """
+        _, _, url, depth = heapq.heappop(self._heap)
+        return url, depth
+
+    def pop_batch(self, n: int) -> List[Tuple[str, int]]:
+        """
+        Remove and return up to n (url, depth) pairs in priority order.
+        """
+        batch = []
+        while self._heap and len(batch) < n:
+            batch.append(self.pop())
+        return batch
+
+    def is_seen(self, url: str) -> bool:
+        return url in self._seen
+
+    def mark_seen(self, url: str):
+        """
+        Record a URL as handled without queueing it.
+        """
+        self._seen.add(url)
+
+    def to_state(self) -> Dict:
+        """
+        JSON-serializable snapshot of the queue and seen set, for checkpoints.
+        """
+        return {'heap': [list(entry) for entry in self._heap], 'seen': sorted(self._seen)}
+
+    def load_state(self, state: Dict):
+        """
+        Restore a snapshot taken by to_state().
+        """
+        self._heap = [tuple(entry) for entry in state['heap']]
+        heapq.heapify(self._heap)
+        self._seen = set(state['seen'])
+        self._counter = itertools.count(max((entry[1] for entry in self._heap), default=-1) + 1)
@@ -0,0 +1,340 @@
+# ~/core/html_extract.py
+"""
+Single-parse HTML extraction for the Enhanced Domain Intelligence Analyzer.
+
+Each page is parsed exactly once. One pass over the tree collects the title,
+links, headings, main-content element and body text, and the same result is
+used both for the "is this page empty, render it with Playwright" check and
+for building the crawled page record.
+
+The parser backend is selected with Config.HTML_PARSER: "lxml" (default,
+C-accelerated) or "html.parser" (pure-Python BeautifulSoup). HTML read
+from disk rather than HTTP is decoded with decode_html().
+"""
+
+import codecs
+import hashlib
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+from config import Config
+from core.dedup import simhash
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+REMOVED_TAGS = ("script", "style", "nav", "footer", "header")
+HEADING_TAGS = ("h1", "h2", "h3")
+# Elements that start a new text block; content keeps one block per line
+BLOCK_TAGS = frozenset((
+    "address", "article", "aside", "blockquote", "dd", "details", "dialog", "div",
+    "dl", "dt", "fieldset", "figcaption", "figure", "form", "h1", "h2", "h3", "h4",
+    "h5", "h6", "hr", "li", "main", "ol", "p", "pre", "section", "summary", "table",
+    "tbody", "td", "tfoot", "th", "thead", "tr", "ul", "br"
+))
+MIN_BODY_TEXT = 40  # Body text below this many characters means "render it"
+
+BOMS = ((codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16-le'), (codecs.BOM_UTF16_BE, 'utf-16-be'))
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="...; charset=...">
+META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-z0-9_.:-]+)', re.IGNORECASE)
+
+# Main-content selectors, most specific first:
+# 'main', '[role="main"]', '.main-content', '#main-content',
+# '.content', '#content', 'article', '.post', '.page-content'
+
+def _selector_rank(tag: str, element_id: Optional[str], classes: List[str], role: Optional[str]) -> Optional[int]:
+    """
+    Return the rank of the most specific main-content selector an element
+    matches, or None if it matches none.
+    """
+    if tag == "main":
+        return 0
+    if role == "main":
+        return 1
+    if "main-content" in classes:
+        return 2
+    if element_id == "main-content":
+        return 3
+    if "content" in classes:
+        return 4
+    if element_id == "content":
+        return 5
+    if tag == "article":
+        return 6
+    if "post" in classes:
+        return 7
+    if "page-content" in classes:
+        return 8
+    return None
+
+def _normalize(text: str) -> str:
+    # str.split() is several times faster than re.sub(r'\s+') on large pages
+    return ' '.join(text.split())
+
+def _has_text(strings, minimum: int) -> bool:
+    """
+    Return True once the stripped strings add up to minimum characters.
+    """
+    total = 0
+    for s in strings:
+        total += len(s.strip())
+        if total >= minimum:
+            return True
+    return False
+
+def _join_blocks(blocks: List[List[str]]) -> str:
+    lines = (_normalize(' '.join(parts)) for parts in blocks)
+    return '\n'.join(line for line in lines if line)
+
+def _block_text_lxml(root) -> str:
+    """
+    Text of an lxml element with one line per block-level element.
+    """
+    blocks = [[]]
+    for event, el in etree.iterwalk(root, events=("start", "end")):
+        if el.tag in BLOCK_TAGS:
+            blocks.append([])
+        if event == "start":
+            if el.text:
+                blocks[-1].append(el.text)
+        elif el.tail and el is not root:
+            blocks[-1].append(el.tail)
+    return _join_blocks(blocks)
+
+def _block_text_bs4(root) -> str:
+    """
+    Text of a BeautifulSoup element with one line per block-level element.
+    """
+    from bs4 import NavigableString
+    blocks, current_block = [], None
+    for s in root.descendants:
+        if type(s) is not NavigableString:
+            continue
+        parent = s.parent
+        while parent is not root and parent.name not in BLOCK_TAGS:
+            parent = parent.parent
+        if parent is not current_block or s.previous_sibling is not None and getattr(s.previous_sibling, 'name', None) in BLOCK_TAGS:
+            blocks.append([])
+            current_block = parent
+        blocks[-1].append(s)
+    return _join_blocks(blocks)
+
+def _empty_result() -> Dict:
+    return {'title': None, 'content': "", 'headings': [], 'links': [], 'canonical': None, 'has_body_text': False}
+
+def _drop_element(el):
+    """
+    Remove an lxml element but keep its tail text, like lxml.html drop_tree().
+    """
+    parent = el.getparent()
+    if parent is None:
+        return
+    if el.tail:
+        previous = el.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or '') + el.tail
+        else:
+            parent.text = (parent.text or '') + el.tail
+    parent.remove(el)
+
+def _extract_lxml(html: str) -> Dict:
+    try:
+        parser = etree.HTMLParser(encoding='utf-8')
+        doc = etree.fromstring(html.encode('utf-8', errors='replace'), parser=parser)
+    except (etree.ParserError, ValueError):
+        return _empty_result()
+    if doc is None:
+        return _empty_result()
+
+    # Links first, before navigation elements are dropped
+    links = [a.get('href') for a in doc.iter('a') if a.get('href')]
+
+    title_el = doc.find('.//title')
+    title = ''.join(title_el.itertext()).strip() if title_el is not None else None
+
+    canonical = None
+    for link in doc.iter('link'):
+        if 'canonical' in (link.get('rel') or '').lower().split() and link.get('href'):
+            canonical = link.get('href').strip()
+            break
+
+    for el in list(doc.iter(etree.Comment, etree.ProcessingInstruction, *REMOVED_TAGS)):
+        _drop_element(el)
+
+    best = {}
+    headings = []
+    for el in doc.iter(etree.Element):
+        tag = el.tag
+        if tag in HEADING_TAGS:
+            headings.append(''.join(el.itertext()).strip())
+        if 0 in best:
+            continue
+        rank = _selector_rank(tag, el.get('id'), (el.get('class') or '').split(), el.get('role'))
+        if rank is not None and rank not in best and (len(el) or el.text):
+            best[rank] = el
+
+    body = doc.find('body')
+    main_content = _block_text_lxml(best[min(best)]) if best else ""
+    if not main_content and body is not None:
+        main_content = _block_text_lxml(body)
+
+    return {
+        'title': title,
+        'content': main_content,
+        'headings': headings,
+        'links': links,
+        'canonical': canonical,
+        'has_body_text': body is not None and _has_text(body.itertext(), MIN_BODY_TEXT)
+    }
+
+def _extract_bs4(html: str) -> Dict:
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+
+    links = [a['href'] for a in soup.find_all('a', href=True)]
+
+    title_el = soup.find('title')
+    title = title_el.text.strip() if title_el else None
+
+    canonical_el = soup.find('link', rel=lambda v: v is not None and v.lower() == 'canonical', href=True)
+    canonical = canonical_el['href'].strip() if canonical_el else None
+
+    for el in soup(list(REMOVED_TAGS)):
+        el.decompose()
+
+    best = {}
+    headings = []
+    for el in soup.find_all(True):
+        if el.name in HEADING_TAGS:
+            headings.append(el.get_text().strip())
+        if 0 in best:
+            continue
+        rank = _selector_rank(el.name, el.get('id'), el.get('class') or [], el.get('role'))
+        if rank is not None and rank not in best and el.contents:
+            best[rank] = el
+
+    body = soup.find('body')
+    main_content = _block_text_bs4(best[min(best)]) if best else ""
+    if not main_content and body:
+        main_content = _block_text_bs4(body)
+
+    return {
+        'title': title,
+        'content': main_content,
+        'headings': headings,
+        'links': links,
+        'canonical': canonical,
+        'has_body_text': bool(body) and _has_text(body.strings, MIN_BODY_TEXT)
+    }
+
+def extract_html(html: str) -> Dict:
+    """
+    Parse HTML once and extract everything the crawler needs.
+
+    Args:
+        html: Raw HTML text.
+
+    Returns:
+        Dict with 'title' (None if absent), 'content' (normalized main text,
+        falling back to body text, one line per text block), 'headings', 'links' (raw hrefs),
+        'canonical' (raw <link rel="canonical"> href or None) and
+        'has_body_text' (body has at least MIN_BODY_TEXT characters).
+    """
+    if not html:
+        return _empty_result()
+    if Config.HTML_PARSER == "lxml" and LXML_AVAILABLE:
+        return _extract_lxml(html)
+    return _extract_bs4(html)
+
+def extract_page(html: str, url: str) -> Tuple[Dict, bool]:
+    """
+    Build the compact page record for a fetched page.
+
+    This is a top-level function with picklable inputs and outputs so it
+    can run in the extraction process pool.
+
+    Args:
+        html: Raw HTML text.
+        url: Page URL, used to resolve relative links.
+
+    Returns:
+        (page, has_body_text): the page record with 'url', 'title',
+        'content', 'headings', 'word_count', 'content_hash', 'simhash',
+        'timestamp', 'links' and 'canonical_url', and whether the body holds enough text to skip rendering.
+    """
+    extracted = extract_html(html)
+    main_content = extracted['content'][:Config.MAX_CONTENT_LENGTH]
+    page = {
+        'url': url,
+        'title': extracted['title'] if extracted['title'] is not None else "No Title",
+        'content': main_content,
+        'headings': extracted['headings'],
+        'word_count': len(main_content.split()),
+        'content_hash': hashlib.md5(main_content.encode()).hexdigest(),
+        'simhash': simhash(main_content),
+        'timestamp': datetime.now().isoformat(),
+        'links': [urljoin(url, href) for href in extracted['links']],
+        'canonical_url': urljoin(url, extracted['canonical']) if extracted['canonical'] else None
+    }
+    return page, extracted['has_body_text']
+
+def extract_pages(items: List[Tuple[str, str]]) -> List[Optional[Dict]]:
+    """
+    Extract a batch of (html, url) pairs in one pool task, for bulk
+    ingestion. Links are dropped to keep results small; a page that fails
+    to parse comes back as None.
+    """
+    pages = []
+    for html, url in items:
+        try:
+            page, _ = extract_page(html, url)
+            page.pop('links')
+            pages.append(page)
+        except Exception as e:
+            logger.warning(f"Failed to extract {url}: {e}")
+            pages.append(None)
+    return pages
+
+def decode_html(data: bytes) -> str:
+    """
+    Decode an HTML document that came without HTTP headers (e.g. a file).
+
+    The encoding comes from a byte order mark, else from a <meta> charset
+    declaration in the first 1024 bytes; Latin-1 and ASCII declarations
+    mean windows-1252, as in browsers. Anything else is decoded as UTF-8
+    with replacement characters, like extraction itself.
+    """
+    for bom, encoding in BOMS:
+        if data.startswith(bom):
+            return data[len(bom):].decode(encoding, 'replace')
+    match = META_CHARSET.search(data[:1024])
+    if match:
+        try:
+            encoding = codecs.lookup(match.group(1).decode('ascii')).name
+        except LookupError:
+            logger.debug(f"Unknown charset {match.group(1)!r}; decoding as UTF-8")
+        else:
+            if encoding in ('iso8859-1', 'ascii'):
+                encoding = 'cp1252'
+            elif encoding.startswith('utf-16'):
+                # A UTF-16 declaration readable as ASCII is wrong by definition
+                encoding = 'utf-8'
+            return data.decode(encoding, 'replace')
+    return data.decode('utf-8', 'replace')
+
+def looks_empty(html: str, has_body_text: bool) -> bool:
+    """
+    Return True if a page is too empty to use without a Playwright render.
+    """
+    return not html or len(html) < 100 or not has_body_text
+
+if Config.HTML_PARSER == "lxml" and not LXML_AVAILABLE:
+    logger.warning("lxml is not installed; falling back to BeautifulSoup html.parser")
@@ -0,0 +1,95 @@
+# ~/core/http_cache.py
+"""
+On-disk HTTP validator cache for the Enhanced Domain Intelligence Analyzer.
+
+Stores the page record extracted from every crawled URL together with the
+ETag/Last-Modified validators of the response, if it had any. On sync the
+crawler sends them back as If-None-Match/If-Modified-Since; a 304 reply lets
+it reuse the stored page record without downloading, parsing or hashing the
+page again. Pages skipped as unchanged per sitemap lastmod are replayed from
+the stored record too, validators or not.
+"""
+
+import os
+import json
+import hashlib
+from typing import Dict, Optional
+from config import Config
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+class HttpCache:
+    """
+    One small JSON file per URL holding its page record and validators.
+
+    Args:
+        path: Cache directory (defaults to Config.HTTP_CACHE_PATH).
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.HTTP_CACHE_PATH
+        os.makedirs(self.path, exist_ok=True)
+
+    def _entry_path(self, url: str) -> str:
+        return os.path.join(self.path, hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    def _load(self, url: str) -> Optional[Dict]:
+        try:
+            with open(self._entry_path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            return entry if entry.get("url") == url else None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable HTTP cache entry for {url}: {e}")
+            return None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Build If-None-Match/If-Modified-Since headers for a cached URL.
+
+        Returns:
+            Dict of request headers; empty if nothing usable is cached.
+        """
+        entry = self._load(url)
+        if not entry or not entry.get("page"):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get_page(self, url: str) -> Optional[Dict]:
+        """
+        Return the page record stored for a URL, if any.
+        """
+        entry = self._load(url)
+        return entry.get("page") if entry else None
+
+    def store(self, url: str, response_headers: Dict[str, str], page: Dict):
+        """
+        Store the extracted page record and the validators (if any) for a URL.
+
+        Args:
+            url: Fetched URL.
+            response_headers: HTTP response headers (lower-cased keys).
+            page: Page record returned by extract_content.
+        """
+        entry = {
+            "url": url,
+            "etag": response_headers.get("etag"),
+            "last_modified": response_headers.get("last-modified"),
+            "page": page
+        }
+        target = self._entry_path(url)
+        tmp = target + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, target)
+        except Exception as e:
+            logger.error(f"Failed to write HTTP cache entry for {url}: {e}")
@@ -0,0 +1,145 @@
+# ~/core/http_client.py
+"""
+Shared pooled HTTP clients for the Enhanced Domain Intelligence Analyzer.
+
+Every crawler path goes through the process-wide clients created here, so
+connections to a host are kept alive and reused across pages, crawl waves
+and sessions instead of paying a new TCP+TLS handshake per request.
+
+- get_http_client(): synchronous httpx client for fetch_html, robots.txt and
+  sitemap downloads. httpx clients are thread-safe.
+- run_async(): runs a coroutine on a long-lived background event loop that
+  owns the shared async client used by the concurrent crawl engine.
+
+HTTP/2 is negotiated when Config.HTTP2 is enabled and the h2 package is
+installed; gzip is always accepted and brotli when the brotli package is.
+"""
+
+import asyncio
+import atexit
+import threading
+from typing import Optional
+
+import httpx
+from config import Config
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+__all__ = ["get_http_client", "get_async_client", "run_async"]
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+try:
+    import h2  # noqa: F401
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+_client = None
+_async_client = None
+_loop = None
+_lock = threading.Lock()
+
+def _client_options() -> dict:
+    http2 = Config.HTTP2 and H2_AVAILABLE
+    if Config.HTTP2 and not H2_AVAILABLE:
+        logger.warning("h2 is not installed; crawling over HTTP/1.1")
+    return {
+        'headers': DEFAULT_HEADERS,
+        'timeout': Config.CRAWL_TIMEOUT,
+        'follow_redirects': True,
+        'http2': http2,
+        'limits': httpx.Limits(
+            max_connections=Config.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=Config.HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY
+        )
+    }
+
+def get_http_client() -> httpx.Client:
+    """
+    Thread-safe function to return the process-wide synchronous HTTP client.
+
+    Returns:
+        httpx.Client instance
+    """
+    global _client
+    if _client is not None:
+        return _client
+
+    with _lock:
+        if _client is None:
+            options = _client_options()
+            _client = httpx.Client(**options)
+            logger.info(f"Shared HTTP client ready (http2={options['http2']})")
+        return _client
+
+def _run_loop(loop: asyncio.AbstractEventLoop):
+    try:
+        loop.run_forever()
+    finally:
+        loop.close()
+
+def _ensure_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _async_client
+    if _loop is not None:
+        return _loop
+
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=_run_loop, args=(loop,), name="http-client-loop", daemon=True).start()
+
+            async def create_client():
+                return httpx.AsyncClient(**_client_options())
+
+            _async_client = asyncio.run_coroutine_threadsafe(create_client(), loop).result()
+            _loop = loop
+            logger.info("Shared async HTTP client ready")
+        return _loop
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the shared async client. Only use it from coroutines passed to
+    run_async(), since it is bound to the background event loop.
+    """
+    _ensure_loop()
+    return _async_client
+
+def run_async(coro, timeout: Optional[float] = None):
+    """
+    Run a coroutine on the shared background event loop and wait for it.
+
+    Args:
+        coro: Coroutine to run.
+        timeout: Optional seconds to wait for the result.
+
+    Returns:
+        The coroutine's result.
+    """
+    loop = _ensure_loop()
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+def close_clients():
+    """
+    Close the shared clients and stop the background event loop.
+    """
+    global _client, _async_client, _loop
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+        if _loop is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(_async_client.aclose(), _loop).result(5)
+            except Exception as e:
+                logger.error(f"Error closing async HTTP client: {e}")
+            _loop.call_soon_threadsafe(_loop.stop)
+            _async_client = None
+            _loop = None
+
+atexit.register(close_clients)
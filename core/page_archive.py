@@ -0,0 +1,421 @@
+# ~/core/page_archive.py
+"""
+Append-only raw-HTML page archive for the Enhanced Domain Intelligence Analyzer.
+
+Every page fetched by a domain crawl is appended as a WARC/1.1 response
+record (URL, HTTP status and headers, fetch method, timestamp and the HTML)
+to a per-domain segment file. Each record is compressed as its own zstd
+frame (gzip member when zstandard is not installed), like per-record gzip
+in .warc.gz files, so a segment stays readable up to the last complete
+record if a crawl dies mid-write. Re-indexing streams the newest record of
+every URL back from disk, so extraction or chunking changes never require
+crawling a site again. Once a domain has more than ARCHIVE_MAX_SEGMENTS
+segments they are compacted into one holding only those newest records,
+so the archive stays about the size of the site however often it is crawled.
+"""
+
+import gzip
+import io
+import os
+import uuid
+import zlib
+from datetime import datetime, timezone
+from http import HTTPStatus
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+from config import Config
+from core.crawl_state import domain_key
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on installed extras
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+# Headers that describe the transfer, not the stored (decoded) HTML
+TRANSFER_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection', 'keep-alive'}
+
+def _utf8_content_type(content_type: str) -> str:
+    """
+    Replace the charset of a Content-Type value with utf-8.
+    """
+    media, *params = content_type.split(';')
+    params = [p.strip() for p in params if p.strip().partition('=')[0].strip().lower() != 'charset']
+    return '; '.join([media.strip(), *params, 'charset=utf-8'])
+
+def build_record(url: str, html: str, status: Optional[int] = None, headers: Dict[str, str] = None,
+                 fetch_method: str = None, fetched_at: datetime = None) -> bytes:
+    """
+    Serialize one fetched page as an uncompressed WARC/1.1 response record.
+
+    The HTML is stored as UTF-8, so the charset of the stored Content-Type
+    is rewritten to match whatever the site served it in.
+    """
+    body = html.encode('utf-8')
+    status = status or 200
+    http_headers = {
+        k: _utf8_content_type(v) if k.lower() == 'content-type' else v
+        for k, v in (headers or {}).items() if k.lower() not in TRANSFER_HEADERS
+    }
+    http_headers['content-length'] = str(len(body))
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = ""
+    http_head = f"HTTP/1.1 {status} {reason}\r\n" + ''.join(f"{k}: {v}\r\n" for k, v in http_headers.items())
+    block = (http_head + "\r\n").encode('utf-8') + body
+
+    date = (fetched_at or datetime.now(timezone.utc)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    warc_headers = [
+        ("WARC-Type", "response"),
+        ("WARC-Record-ID", f"<urn:uuid:{uuid.uuid4()}>"),
+        ("WARC-Date", date),
+        ("WARC-Target-URI", url),
+        ("Content-Type", "application/http; msgtype=response")
+    ]
+    if fetch_method:
+        warc_headers.append(("X-Fetch-Method", fetch_method))
+    warc_headers.append(("Content-Length", str(len(block))))
+    head = "WARC/1.1\r\n" + ''.join(f"{k}: {v}\r\n" for k, v in warc_headers) + "\r\n"
+    return head.encode('utf-8') + block + b"\r\n\r\n"
+
+def _read_headers(stream: BinaryIO) -> Dict[str, str]:
+    headers = {}
+    for line in iter(stream.readline, b''):
+        line = line.rstrip(b'\r\n')
+        if not line:
+            break
+        name, _, value = line.decode('utf-8', 'replace').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return headers
+
+def _decode_body(body: bytes, content_type: str) -> str:
+    charset = 'utf-8'
+    for param in content_type.split(';')[1:]:
+        name, _, value = param.strip().partition('=')
+        if name.lower() == 'charset' and value:
+            charset = value.strip('"\' ')
+    try:
+        return body.decode(charset, 'replace')
+    except LookupError:
+        return body.decode('utf-8', 'replace')
+
+def _dechunk(body: bytes) -> bytes:
+    stream, out = io.BytesIO(body), []
+    while True:
+        size_line = stream.readline().split(b';', 1)[0].strip()
+        if not size_line:
+            break
+        size = int(size_line, 16)
+        if size == 0:
+            break
+        out.append(stream.read(size))
+        stream.readline()
+    return b''.join(out)
+
+def _decode_transfer(body: bytes, headers: Dict[str, str]) -> bytes:
+    """
+    Undo chunked transfer and gzip/deflate content encoding that some
+    crawlers store verbatim in WARC payloads.
+    """
+    try:
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            body = _dechunk(body)
+        encoding = headers.get('content-encoding', '').lower()
+        if encoding in ('gzip', 'x-gzip'):
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        elif encoding == 'deflate':
+            body = zlib.decompress(body)
+    except (ValueError, zlib.error) as e:
+        logger.debug(f"Keeping WARC payload as stored: {e}")
+    return body
+
+def _parse_http_response(block: bytes) -> Optional[Dict]:
+    stream = io.BytesIO(block)
+    status_line = stream.readline().decode('latin-1').split()
+    if len(status_line) < 2 or not status_line[0].startswith('HTTP/') or not status_line[1].isdigit():
+        return None
+    headers = _read_headers(stream)
+    body = _decode_transfer(stream.read(), headers)
+    return {
+        'status': int(status_line[1]),
+        'headers': headers,
+        'html': _decode_body(body, headers.get('content-type', ''))
+    }
+
+def _skip(stream: BinaryIO, length: int) -> int:
+    skipped = 0
+    while skipped < length:
+        data = stream.read(min(1 << 20, length - skipped))
+        if not data:
+            break
+        skipped += len(data)
+    return skipped
+
+def _parse_warc_date(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return None
+
+def _target_uri(warc_headers: Dict[str, str]) -> str:
+    return warc_headers.get('warc-target-uri', '').strip('<>')
+
+def _response_blocks(stream: BinaryIO, max_bytes: int = None,
+                     read: Callable[[int], bool] = None) -> Iterator[Tuple[int, Dict[str, str], Optional[bytes]]]:
+    """
+    Iterate over (position, WARC headers, block) of the HTTP response
+    records of a stream; position numbers them from 0. Blocks larger than
+    max_bytes or whose position read() rejects are skipped unread (None).
+    """
+    position = -1
+    while True:
+        line = stream.readline()
+        if not line:
+            return
+        if not line.strip():
+            continue
+        if not line.startswith(b'WARC/'):
+            raise ValueError(f"Not a WARC record header: {line[:40]!r}")
+        warc_headers = _read_headers(stream)
+        length = int(warc_headers.get('content-length', 0))
+        relevant = warc_headers.get('warc-type') == 'response' and 'application/http' in warc_headers.get('content-type', '')
+        if relevant:
+            position += 1
+        if not relevant or (max_bytes and length > max_bytes) or (read and not read(position)):
+            if _skip(stream, length) < length:
+                return
+            if relevant:
+                yield position, warc_headers, None
+            continue
+        block = stream.read(length)
+        if len(block) < length:
+            logger.warning("Truncated WARC record at end of stream")
+            return
+        yield position, warc_headers, block
+
+def _response_record(warc_headers: Dict[str, str], block: bytes) -> Optional[Dict]:
+    response = _parse_http_response(block)
+    if response is not None:
+        response.update({
+            'url': _target_uri(warc_headers),
+            'date': warc_headers.get('warc-date'),
+            'fetch_method': warc_headers.get('x-fetch-method')
+        })
+    return response
+
+def read_warc(stream: BinaryIO, max_bytes: int = None) -> Iterator[Dict]:
+    """
+    Iterate over the HTTP response records of an uncompressed WARC stream.
+
+    Args:
+        stream: Decompressed WARC stream (see open_warc).
+        max_bytes: Records with a larger block are skipped unread.
+
+    Yields:
+        Dicts with 'url', 'date', 'fetch_method', 'status', 'headers' and
+        'html'. Request, metadata and other record types are skipped.
+    """
+    for _, warc_headers, block in _response_blocks(stream, max_bytes):
+        response = _response_record(warc_headers, block) if block is not None else None
+        if response is not None:
+            yield response
+
+def open_warc(path: str) -> BinaryIO:
+    """
+    Open a .warc, .warc.gz or .warc.zst file as a decompressed binary stream.
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    if path.endswith('.zst'):
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError(f"zstandard is not installed; cannot read {path}")
+        raw = open(path, 'rb')
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        return io.BufferedReader(reader)
+    return open(path, 'rb')
+
+class ArchiveWriter:
+    """
+    Appends page records to one new segment file of a domain.
+
+    The file is created on the first write, so a crawl that fetches
+    nothing (e.g. a sync where every page is unchanged) leaves no segment.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records = 0
+        if ZSTD_AVAILABLE:
+            compressor = zstandard.ZstdCompressor(level=Config.ARCHIVE_COMPRESSION_LEVEL)
+            self._compress = compressor.compress
+        else:
+            self._compress = gzip.compress
+
+    def write(self, pages: List[Dict]):
+        """
+        Append pages, each a dict with 'url', 'html' and optionally
+        'status', 'headers', 'fetch_method' and 'fetched_at'.
+        """
+        if not pages:
+            return
+        frames = [
+            self._compress(build_record(
+                page['url'], page['html'], page.get('status'),
+                page.get('headers'), page.get('fetch_method'), page.get('fetched_at')
+            ))
+            for page in pages
+        ]
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'ab') as f:
+                f.write(b''.join(frames))
+            self.records += len(frames)
+        except Exception as e:
+            logger.error(f"Failed to archive {len(frames)} pages to {self.path}: {e}")
+
+class PageArchive:
+    """
+    Per-domain directories of compressed WARC segments, one per crawl.
+
+    Args:
+        path: Archive directory (defaults to Config.ARCHIVE_PATH).
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.ARCHIVE_PATH
+
+    def _domain_dir(self, domain: str) -> str:
+        return os.path.join(self.path, domain_key(domain).replace(':', '_'))
+
+    def writer(self, domain: str) -> ArchiveWriter:
+        """
+        Start a new segment for a crawl of a domain.
+        """
+        stamp = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        extension = ".warc.zst" if ZSTD_AVAILABLE else ".warc.gz"
+        return ArchiveWriter(os.path.join(self._domain_dir(domain), f"{stamp}-{os.getpid()}{extension}"))
+
+    def segments(self, domain: str) -> List[str]:
+        """
+        Segment files of a domain, oldest first.
+        """
+        directory = self._domain_dir(domain)
+        if not os.path.isdir(directory):
+            return []
+        names = sorted(n for n in os.listdir(directory) if n.endswith(('.warc.zst', '.warc.gz', '.warc')))
+        return [os.path.join(directory, name) for name in names]
+
+    def iter_records(self, domain: str) -> Iterator[Dict]:
+        """
+        Iterate over every archived record of a domain, oldest first.
+        """
+        for path in self.segments(domain):
+            try:
+                with open_warc(path) as stream:
+                    yield from read_warc(stream)
+            except Exception as e:
+                logger.error(f"Stopped reading archive segment {path}: {e}")
+
+    def _latest_records(self, segments: List[str], failed: List[str] = None) -> Iterator[Dict]:
+        # First pass: record headers only, one (segment, position) per URL
+        latest = {}
+        for index, path in enumerate(segments):
+            try:
+                with open_warc(path) as stream:
+                    for position, warc_headers, _ in _response_blocks(stream, read=lambda position: False):
+                        latest[_target_uri(warc_headers)] = (index, position)
+            except Exception as e:
+                logger.error(f"Stopped reading archive segment {path}: {e}")
+                if failed is not None:
+                    failed.append(path)
+        wanted: Dict[int, set] = {}
+        for index, position in latest.values():
+            wanted.setdefault(index, set()).add(position)
+
+        # Second pass: decompress and parse only those records
+        for index, path in enumerate(segments):
+            positions = wanted.get(index)
+            if not positions:
+                continue
+            try:
+                with open_warc(path) as stream:
+                    for _, warc_headers, block in _response_blocks(stream, read=positions.__contains__):
+                        record = _response_record(warc_headers, block) if block is not None else None
+                        if record is not None:
+                            yield record
+            except Exception as e:
+                logger.error(f"Stopped reading archive segment {path}: {e}")
+                if failed is not None:
+                    failed.append(path)
+
+    def latest_records(self, domain: str) -> Iterator[Dict]:
+        """
+        Yield the newest record of every archived URL of a domain.
+
+        Records are read one at a time: a first pass over the record
+        headers finds where each URL's newest copy is, a second pass
+        parses just those, so memory does not grow with the site.
+        """
+        count = 0
+        for record in self._latest_records(self.segments(domain)):
+            count += 1
+            yield record
+        logger.info(f"Read {count} archived pages of {domain_key(domain)}")
+
+    def compact(self, domain: str, max_segments: int = None) -> bool:
+        """
+        Replace a domain's segments with one holding the newest record of
+        every URL, once there are more than max_segments of them.
+
+        Must not run while another crawl of the domain writes to the
+        archive (crawl_domain holds the host's crawl lock).
+
+        Args:
+            domain: Domain URL.
+            max_segments: Segments kept before compacting (defaults to
+                Config.ARCHIVE_MAX_SEGMENTS; 0 disables compaction).
+
+        Returns:
+            bool: True if the segments were compacted.
+        """
+        max_segments = Config.ARCHIVE_MAX_SEGMENTS if max_segments is None else max_segments
+        segments = self.segments(domain)
+        if max_segments <= 0 or len(segments) <= max_segments:
+            return False
+
+        # Named after the newest compacted segment so it sorts before any newer one
+        stem = os.path.basename(segments[-1]).split('.warc', 1)[0]
+        extension = ".warc.zst" if ZSTD_AVAILABLE else ".warc.gz"
+        path = os.path.join(self._domain_dir(domain), f"{stem}-compact{extension}")
+        writer = ArchiveWriter(path + ".tmp")
+        written, batch, failed = 0, [], []
+        for record in self._latest_records(segments, failed):
+            batch.append({**record, 'fetched_at': _parse_warc_date(record.get('date'))})
+            if len(batch) >= 64:
+                writer.write(batch)
+                written += len(batch)
+                batch = []
+        writer.write(batch)
+        written += len(batch)
+        if failed or not written or writer.records != written:
+            # Never drop segments whose records were not all carried over
+            logger.error(f"Archive compaction of {domain_key(domain)} failed; keeping {len(segments)} segments")
+            if os.path.exists(writer.path):
+                os.remove(writer.path)
+            return False
+
+        os.replace(writer.path, path)
+        for old in segments:
+            if old == path:
+                continue
+            try:
+                os.remove(old)
+            except OSError as e:
+                logger.warning(f"Could not remove compacted archive segment {old}: {e}")
+        logger.info(f"Compacted {len(segments)} archive segments of {domain_key(domain)} into {written} records")
+        return True
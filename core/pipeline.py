@@ -0,0 +1,181 @@
+# ~/core/pipeline.py
+"""
+Streaming crawl-to-index pipeline for the Enhanced Domain Intelligence Analyzer.
+
+Pages flow from the crawler through chunk -> embed -> upsert stages while
+the crawl is still running, instead of the whole site being embedded after
+the last page arrives. Extraction already runs in the crawler's process pool.
+Each stage is a thread connected to the next by a bounded queue, so a slow
+embedder throttles the crawler (backpressure) rather than buffering the site.
+When the domain's existing collection is reused, unchanged pages skip the
+chunk and embed stages and pages no longer crawled are pruned at the end.
+"""
+
+import queue
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from config import Config
+from core.processor import EnhancedContentProcessor, chunk_id
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+_DONE = object()
+
+class IndexingPipeline:
+    """
+    Bounded-queue pipeline from crawled pages to a ChromaDB collection.
+
+    Args:
+        processor: Content processor owning the embedding model and collections.
+        queue_size: Capacity of each inter-stage queue (defaults to Config.PIPELINE_QUEUE_SIZE).
+        batch_size: Maximum chunks per embedding batch (defaults to Config.PIPELINE_EMBED_BATCH).
+        collection_name: Existing collection to add to instead of replacing
+            the domain's collection (e.g. a session collection).
+    """
+
+    def __init__(self, processor: EnhancedContentProcessor, queue_size: int = None, batch_size: int = None,
+                 collection_name: str = None):
+        self.processor = processor
+        self.queue_size = queue_size or Config.PIPELINE_QUEUE_SIZE
+        self.batch_size = batch_size or Config.PIPELINE_EMBED_BATCH
+        self.target_collection = collection_name
+        self._pages = queue.Queue(self.queue_size)
+        self._chunks = queue.Queue(self.queue_size * 4)
+        self._embedded = queue.Queue(self.queue_size)
+        self._error = None
+        self._collection_name = None
+        self._domain_key = None
+        self._chunk_count = 0
+        self._page_count = 0
+        self._unchanged_count = 0
+        self._stored = None  # stored_pages() of a reused domain collection
+        self._urls = set()
+
+    @property
+    def chunk_count(self) -> int:
+        return self._chunk_count
+
+    def run(self, domain_key: str, produce: Callable[[Callable[[List[Dict]], None]], Dict]) -> Tuple[Dict, Optional[str]]:
+        """
+        Run a crawl and index its pages as they arrive.
+
+        Args:
+            domain_key: Domain URL used to name the collection.
+            produce: Function that runs the crawl. It is called with an
+                emit(pages) callback and must return the crawl result dict.
+
+        Returns:
+            (crawl_result, collection_name); collection_name is None if no
+            page was emitted, in which case no collection was touched.
+        """
+        self._domain_key = domain_key
+        stages = [
+            threading.Thread(target=self._chunk_stage, name="pipeline-chunk", daemon=True),
+            threading.Thread(target=self._embed_stage, name="pipeline-embed", daemon=True),
+            threading.Thread(target=self._upsert_stage, name="pipeline-upsert", daemon=True)
+        ]
+        for stage in stages:
+            stage.start()
+        try:
+            result = produce(self._emit)
+        finally:
+            self._pages.put(_DONE)
+            for stage in stages:
+                stage.join()
+
+        if self._error is not None:
+            raise self._error
+        if self._collection_name:
+            if self._stored:
+                self.processor.delete_pages([url for url in self._stored if url not in self._urls], self._stored)
+            self.processor.set_domain_metadata(result)
+            logger.info(
+                f"Streamed {self._chunk_count} chunks from {self._page_count} pages into {self._collection_name} "
+                f"({self._unchanged_count} unchanged pages kept)"
+            )
+        return result, self._collection_name
+
+    def _emit(self, pages: List[Dict]):
+        # Blocks while the chunk queue is full: backpressure on the crawler
+        for page in pages:
+            self._pages.put(page)
+
+    def _fail(self, stage: str, error: Exception):
+        if self._error is None:
+            logger.error(f"Indexing pipeline {stage} stage failed: {error}")
+            self._error = error
+
+    def _chunk_stage(self):
+        while True:
+            page = self._pages.get()
+            if page is _DONE:
+                self._chunks.put(_DONE)
+                return
+            if self._error is not None:
+                continue  # Keep draining so the crawler never blocks
+            try:
+                if self._collection_name is None:
+                    if self.target_collection:
+                        self._collection_name = self.processor.use_collection(self.target_collection)
+                    else:
+                        self._collection_name = self.processor.open_collection(self._domain_key)
+                        self._stored = self.processor.stored_pages()
+                self._page_count += 1
+                if self._stored is not None:
+                    self._urls.add(page['url'])
+                    if not self.processor.changed_pages([page], self._stored):
+                        self._unchanged_count += 1
+                        continue
+                    self.processor.delete_pages([page['url']], self._stored)
+                for chunk in self.processor.page_chunks(page):
+                    self._chunks.put((chunk_id(page['url'], chunk['metadata']['chunk_index']), chunk))
+                    self._chunk_count += 1
+            except Exception as e:
+                self._fail("chunk", e)
+
+    def _embed_stage(self):
+        done = False
+        while not done:
+            item = self._chunks.get()
+            if item is _DONE:
+                break
+            batch = [item]
+            # Take whatever else is ready, up to a full batch
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._chunks.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _DONE:
+                    done = True
+                    break
+                batch.append(item)
+            if self._error is not None:
+                continue
+            try:
+                texts = [chunk['text'] for _, chunk in batch]
+                embeddings = self.processor.embedding_model.encode(texts)
+                self._embedded.put((batch, embeddings))
+            except Exception as e:
+                self._fail("embed", e)
+        self._embedded.put(_DONE)
+
+    def _upsert_stage(self):
+        while True:
+            item = self._embedded.get()
+            if item is _DONE:
+                return
+            if self._error is not None:
+                continue
+            batch, embeddings = item
+            try:
+                self.processor.add_embedded_chunks(
+                    [chunk for _, chunk in batch],
+                    [chunk_id for chunk_id, _ in batch],
+                    embeddings
+                )
+                logger.debug(f"Upserted {len(batch)} chunks into {self._collection_name}")
+            except Exception as e:
+                self._fail("upsert", e)
@@ -6,15 +6,26 @@ Handles chunking, embedding, and storage of crawled web content.
 
 import os
 import json
+from hashlib import blake2b
 from typing import List, Dict
-from sentence_transformers import SentenceTransformer
+import numpy as np
 import chromadb
 from config import Config
+from core.collection_registry import CollectionRegistry, collection_name_for
+from core.embedding_backend import embedding_cache_name, load_embedding_model
+from core.embedding_batch import BatchedEncoder
+from core.embedding_cache import CachedEmbedder
 
 # Add logger
 from core.logger_config import setup_logger
 logger = setup_logger(__name__)
 
+def chunk_id(url: str, chunk_index: int) -> str:
+    """
+    Stable ChromaDB id of a page chunk, so re-indexing a page replaces it.
+    """
+    return f"{blake2b(url.encode(), digest_size=8).hexdigest()}_{chunk_index}"
+
 class EnhancedContentProcessor:
     """
     Processes crawled web content: chunking, embedding, and storage in ChromaDB.
@@ -25,11 +36,16 @@ class EnhancedContentProcessor:
     def __init__(self):
         # Load embedding model only once for all processor instances
         if EnhancedContentProcessor._embedding_model is None:
-            logger.info(f"Loading embedding model: {Config.EMBEDDING_MODEL}")
-            EnhancedContentProcessor._embedding_model = SentenceTransformer(Config.EMBEDDING_MODEL)
-        self.embedding_model = EnhancedContentProcessor._embedding_model
+            EnhancedContentProcessor._embedding_model = load_embedding_model(Config.EMBEDDING_MODEL)
+        # Chunks already embedded by any session come from the shared cache;
+        # the rest are encoded in length-sorted batches
+        self.embedding_model = CachedEmbedder(
+            BatchedEncoder(EnhancedContentProcessor._embedding_model),
+            embedding_cache_name(Config.EMBEDDING_MODEL, EnhancedContentProcessor._embedding_model)
+        )
 
         self.chroma_client = chromadb.PersistentClient(path=Config.CHROMA_DB_PATH)
+        self.registry = CollectionRegistry()
         self.collection = None
         self.domain_metadata = {}
 
@@ -63,22 +79,64 @@ class EnhancedContentProcessor:
         logger.debug(f"Created {len(chunks)} chunks for content (metadata: {metadata.get('url', '')})")
         return chunks
 
-    def process_domain_data(self, domain_data: Dict, sync_mode=False) -> str:
+    def index_params(self) -> Dict:
         """
-        Process crawled domain data: chunk, embed, and store in ChromaDB.
+        Embedding model and chunking settings new chunks are built with.
+        """
+        return {
+            'embedding_model': self.embedding_model.model_name,
+            'dimension': self.embedding_model.get_sentence_embedding_dimension(),
+            'chunk_size': Config.CHUNK_SIZE,
+            'chunk_overlap': Config.CHUNK_OVERLAP
+        }
+
+    def index_matches(self, domain_key: str) -> bool:
+        """
+        True if the domain's stored index can take chunks built with the
+        current settings (or the domain has no index yet).
+        """
+        return self.registry.matches(domain_key, self.index_params())
+
+    def open_collection(self, domain_key: str, sync_mode=False) -> str:
+        """
+        Open the ChromaDB collection of a domain and make it the active
+        collection. The name is derived from the domain, so it is the same
+        in every process, and the collection is recorded in the registry
+        with the current index settings.
+
+        A full analysis keeps the existing collection if the registry shows
+        it was built with the current embedding model and chunking settings
+        (callers then only index changed pages and prune the rest, see
+        changed_pages() and delete_pages()); otherwise it is rebuilt.
 
         Args:
-            domain_data: Data from domain crawl
-            sync_mode: If True, update existing collection
+            domain_key: Domain URL or 'multiple-urls'
+            sync_mode: If True, always keep the existing collection
 
         Returns:
-            str: Name of the ChromaDB collection used
+            str: Name of the ChromaDB collection
         """
-        domain_key = domain_data.get('domain', 'multiple-urls')
-        collection_name = f"domain_{abs(hash(domain_key)) % 1000000}" # Use abs() for positive hash
+        collection_name = collection_name_for(domain_key)
+        params = self.index_params()
+        entry = self.registry.get(domain_key)
+        compatible = self.registry.matches(domain_key, params)
+        if sync_mode and not compatible:
+            logger.warning(
+                f"Collection {collection_name} was built with other embedding or chunking settings than "
+                f"{params}; re-index {domain_key} to rebuild it"
+            )
+
+        reused = False
+        if not sync_mode and entry is not None and compatible:
+            try:
+                self.collection = self.chroma_client.get_collection(collection_name)
+                reused = True
+                logger.info(f"Reusing existing collection built with the same settings: {collection_name}")
+            except Exception:
+                logger.debug(f"Registered collection {collection_name} is missing; creating it")
 
         # Create or replace collection
-        if not sync_mode:
+        if not sync_mode and not reused:
             try:
                 self.chroma_client.delete_collection(collection_name)
                 logger.info(f"Deleted existing collection: {collection_name}")
@@ -86,56 +144,162 @@ class EnhancedContentProcessor:
                 logger.debug(f"No existing collection to delete: {collection_name}")
             self.collection = self.chroma_client.create_collection(collection_name)
             logger.info(f"Created new collection: {collection_name}")
-        else:
+        elif sync_mode:
             try:
                 self.collection = self.chroma_client.get_collection(collection_name)
                 logger.info(f"Retrieved existing collection for sync: {collection_name}")
             except Exception:
                 self.collection = self.chroma_client.create_collection(collection_name)
                 logger.info(f"Created new collection during sync (was missing): {collection_name}")
+        if compatible or not sync_mode:
+            self.registry.register(domain_key, collection_name, params)
+        return collection_name
 
-        all_chunks = []
+    def use_collection(self, collection_name: str) -> str:
+        """
+        Make a named collection (e.g. a session collection) the active one,
+        creating it if needed and keeping its existing chunks.
+        """
+        self.collection = self.chroma_client.get_or_create_collection(collection_name)
+        logger.info(f"Using collection: {collection_name}")
+        return collection_name
+
+    def page_chunks(self, page: Dict) -> List[Dict]:
+        """
+        Chunk one crawled page with its metadata attached to every chunk.
+        """
+        metadata = {
+            'url': page['url'],
+            'title': page['title'],
+            'headings': json.dumps(page['headings']),
+            'word_count': page['word_count'],
+            'content_hash': page['content_hash'],
+            'template_id': page.get('template_id', ""),
+            'timestamp': page['timestamp']
+        }
+        return self.create_chunks(page['content'], metadata)
+
+    def add_chunks(self, chunks: List[Dict], ids: List[str] = None):
+        """
+        Embed chunks and write them to the active collection.
+        """
+        if not chunks:
+            return
+        texts = [chunk['text'] for chunk in chunks]
+        self.add_embedded_chunks(chunks, ids, self.embedding_model.encode(texts))
+
+    def add_embedded_chunks(self, chunks: List[Dict], ids: List[str], embeddings: np.ndarray):
+        """
+        Write already embedded chunks to the active collection, replacing
+        chunks with the same ids. ids default to chunk_id(url, chunk_index).
+        embeddings is a float32 array with one row per chunk.
+        """
+        if ids is None:
+            ids = [chunk_id(c['metadata']['url'], c['metadata']['chunk_index']) for c in chunks]
+        self.collection.upsert(
+            # ChromaDB 0.4 only accepts lists: convert the whole array at once
+            embeddings=np.asarray(embeddings, dtype=np.float32).tolist(),
+            documents=[chunk['text'] for chunk in chunks],
+            metadatas=[chunk['metadata'] for chunk in chunks],
+            ids=ids
+        )
+
+    def set_domain_metadata(self, domain_data: Dict):
         self.domain_metadata = {
-            'domain': domain_key,
+            'domain': domain_data.get('domain', 'multiple-urls'),
             'last_crawl': domain_data['crawl_date'],
             'total_pages': domain_data['total_pages']
         }
 
-        for page in domain_data['pages']:
-            metadata = {
-                'url': page['url'],
-                'title': page['title'],
-                'headings': json.dumps(page['headings']),
-                'word_count': page['word_count'],
-                'content_hash': page['content_hash'],
-                'timestamp': page['timestamp']
-            }
-            chunks = self.create_chunks(page['content'], metadata)
-            all_chunks.extend(chunks)
+    def stored_pages(self) -> Dict[str, Dict]:
+        """
+        Return {url: {'version': (content_hash, template_id), 'ids': [...]}}
+        for the chunks in the active collection.
+        """
+        stored = {}
+        existing = self.collection.get(include=["metadatas"])
+        for id_, metadata in zip(existing['ids'], existing['metadatas']):
+            metadata = metadata or {}
+            version = (metadata.get('content_hash'), metadata.get('template_id'))
+            entry = stored.setdefault(metadata.get('url'), {'version': version, 'ids': []})
+            entry['ids'].append(id_)
+            if entry['version'] != version:
+                entry['version'] = None  # Mixed versions: treat as changed
+        return stored
+
+    def changed_pages(self, pages: List[Dict], stored: Dict[str, Dict]) -> List[Dict]:
+        """
+        Return the pages whose content hash or stripped template differs
+        from their stored chunks.
+
+        Args:
+            pages: Crawled pages.
+            stored: stored_pages() of the active collection.
+        """
+        return [
+            page for page in pages
+            if stored.get(page['url'], {}).get('version') != (page['content_hash'], page.get('template_id', ""))
+        ]
+
+    def delete_pages(self, urls: List[str], stored: Dict[str, Dict]) -> int:
+        """
+        Delete the stored chunks of pages from the active collection.
+
+        Returns:
+            int: Number of chunks deleted.
+        """
+        ids = [id_ for url in urls for id_ in stored.get(url, {}).get('ids', [])]
+        if ids:
+            self.collection.delete(ids=ids)
+            logger.info(f"Deleted {len(ids)} stale chunks from collection {self.collection.name}")
+        return len(ids)
+
+    def process_domain_data(self, domain_data: Dict, sync_mode=False) -> str:
+        """
+        Process crawled domain data: chunk, embed, and store in ChromaDB.
+
+        Only pages whose content hash or stripped template differs from the
+        stored chunks are re-chunked and embedded; their old chunks are
+        deleted first, and so are those of removed pages: in sync mode the
+        pages listed in sync_info['removed_pages'], otherwise every stored
+        page missing from the crawl. Unchanged pages cost no embedding and no write.
+        (A newly created collection has no stored chunks, so everything is
+        indexed.)
+
+        Args:
+            domain_data: Data from domain crawl
+            sync_mode: If True, update existing collection
+
+        Returns:
+            str: Name of the ChromaDB collection used
+        """
+        domain_key = domain_data.get('domain', 'multiple-urls')
+        collection_name = self.open_collection(domain_key, sync_mode)
+        self.set_domain_metadata(domain_data)
+
+        stored = self.stored_pages()
+        pages = self.changed_pages(domain_data['pages'], stored)
+        if sync_mode:
+            removed = domain_data.get('sync_info', {}).get('removed_pages', [])
+        else:
+            crawled = {page['url'] for page in domain_data['pages']}
+            removed = [url for url in stored if url not in crawled]
+        stale_count = self.delete_pages([page['url'] for page in pages] + removed, stored)
+
+        all_chunks = []
+        for page in pages:
+            all_chunks.extend(self.page_chunks(page))
 
         if all_chunks:
-            texts = [chunk['text'] for chunk in all_chunks]
-            embeddings = self.embedding_model.encode(texts).tolist()
-            ids = [
-                f"chunk_{i + (self.collection.count() if sync_mode else 0)}"
-                for i in range(len(all_chunks))
-            ]
-            metadatas = [chunk['metadata'] for chunk in all_chunks]
-
-            self.collection.add(
-                embeddings=embeddings,
-                documents=texts,
-                metadatas=metadatas,
-                ids=ids
-            )
+            self.add_chunks(all_chunks)
             logger.info(f"Added {len(all_chunks)} chunks to collection {collection_name}")
 
         mode_text = "Updated" if sync_mode else "Processed"
-        result = f"{mode_text} {len(all_chunks)} chunks from {len(domain_data['pages'])} pages"
+        result = f"{mode_text} {len(all_chunks)} chunks from {len(pages)} pages"
 
         if sync_mode and 'sync_info' in domain_data:
             changes = domain_data['sync_info']
-            result += f"\nSync Changes: {changes['total_changes']} updated/new pages"
+            result += f"\nSync Changes: {changes['total_changes']} updated/new/removed pages, {stale_count} chunks deleted"
 
         logger.info(f"process_domain_data result: {result}")
         return collection_name
@@ -0,0 +1,119 @@
+# ~/core/rate_limiter.py
+"""
+Adaptive per-host politeness for the Enhanced Domain Intelligence Analyzer.
+
+Each host gets a token bucket whose refill interval starts at the robots.txt
+Crawl-delay (or Config.CRAWL_DELAY), shrinks while the host answers quickly,
+grows when it slows down or fails, and backs off hard on 429/503, honouring
+Retry-After. Buckets of different hosts are independent, so fast hosts are
+never held back by slow ones.
+"""
+
+import time
+import asyncio
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from config import Config
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+BACKOFF_STATUSES = (429, 503)
+SPEEDUP_FACTOR = 0.8   # Interval multiplier after a fast response
+SLOWDOWN_FACTOR = 1.5  # Interval multiplier after a slow or failed response
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date) into seconds.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+class HostRateLimiter:
+    """
+    Token bucket for one host with an adaptive refill interval.
+
+    Args:
+        host: Host name, used for logging.
+        interval: Initial seconds between requests.
+        floor: Smallest interval the limiter may speed up to.
+        burst: Bucket capacity (requests allowed back to back).
+    """
+
+    def __init__(self, host: str, interval: float, floor: float, burst: int = 1):
+        self.host = host
+        self.floor = max(0.0, floor)
+        self.interval = min(max(interval, self.floor), Config.RATE_MAX_DELAY)
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        if self.interval <= 0:
+            self._tokens = float(self.burst)
+        else:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) / self.interval)
+        self._updated = now
+
+    async def acquire(self):
+        """
+        Wait until the host may be sent another request.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) * self.interval
+                await asyncio.sleep(wait)
+
+    def set_floor(self, floor: float):
+        """
+        Raise or lower the minimum interval, e.g. for a robots.txt Crawl-delay.
+        """
+        self.floor = max(0.0, floor)
+        self.interval = max(self.interval, self.floor)
+
+    def feedback(self, status: Optional[int], latency: Optional[float], retry_after: Optional[str] = None):
+        """
+        Adapt the interval to the outcome of one request.
+
+        Args:
+            status: HTTP status, or None if the request failed.
+            latency: Response time in seconds, if known.
+            retry_after: Raw Retry-After header value, if any.
+        """
+        previous = self.interval
+        if status in BACKOFF_STATUSES:
+            pause = parse_retry_after(retry_after)
+            if pause is None:
+                pause = max(self.interval * 2, Config.CRAWL_DELAY)
+            pause = min(pause, Config.RATE_MAX_BACKOFF)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+            self.interval = max(self.interval * 2, pause / self.burst)
+            logger.warning(f"{self.host} answered {status}; pausing {pause:.1f}s")
+        elif status is None or status >= 500 or (latency is not None and latency > Config.RATE_SLOW_LATENCY):
+            self.interval = max(self.interval * SLOWDOWN_FACTOR, 0.1)
+        elif latency is not None and latency < Config.RATE_FAST_LATENCY:
+            self.interval *= SPEEDUP_FACTOR
+        self.interval = min(max(self.interval, self.floor), Config.RATE_MAX_DELAY)
+        if abs(self.interval - previous) > 0.05 * max(previous, 0.01):
+            logger.debug(f"Rate for {self.host}: {previous:.2f}s -> {self.interval:.2f}s between requests")
@@ -0,0 +1,152 @@
+# ~/core/sitemap.py
+"""
+robots.txt and sitemap discovery for the Enhanced Domain Intelligence Analyzer.
+
+Reads robots.txt (rules, Crawl-delay and Sitemap: lines) and stream-parses
+sitemap indexes and sitemaps, so the crawl frontier can be seeded with a
+site's own URL list without holding multi-megabyte XML documents in memory.
+"""
+
+import zlib
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+from urllib.robotparser import RobotFileParser
+from xml.etree.ElementTree import XMLPullParser
+
+from config import Config
+from core.http_client import get_http_client
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+class RobotsPolicy:
+    """
+    Parsed robots.txt rules for one site.
+
+    Attributes:
+        crawl_delay (float): Crawl-delay for our user agent, or None.
+        sitemaps (list): Sitemap URLs listed in robots.txt.
+    """
+
+    def __init__(self, parser: Optional[RobotFileParser] = None):
+        self._parser = parser
+        self.crawl_delay = None
+        self.sitemaps = []
+        if parser is not None:
+            delay = parser.crawl_delay("*")
+            self.crawl_delay = float(delay) if delay is not None else None
+            self.sitemaps = list(parser.site_maps() or [])
+
+    def allowed(self, url: str) -> bool:
+        """
+        Return True if robots.txt allows crawling the URL.
+        """
+        if self._parser is None:
+            return True
+        return self._parser.can_fetch("*", url)
+
+def load_robots(domain: str) -> RobotsPolicy:
+    """
+    Fetch and parse robots.txt for a domain.
+    A missing or unreadable robots.txt allows everything.
+    """
+    robots_url = urljoin(domain, "/robots.txt")
+    try:
+        resp = get_http_client().get(robots_url)
+        if resp.status_code >= 400:
+            logger.info(f"No robots.txt for {domain} (HTTP {resp.status_code})")
+            return RobotsPolicy()
+        parser = RobotFileParser(robots_url)
+        parser.parse(resp.text.splitlines())
+        policy = RobotsPolicy(parser)
+        logger.info(f"Loaded robots.txt for {domain}: {len(policy.sitemaps)} sitemaps, crawl-delay {policy.crawl_delay}")
+        return policy
+    except Exception as e:
+        logger.warning(f"Could not read robots.txt for {domain}: {e}")
+        return RobotsPolicy()
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a sitemap <lastmod> (W3C datetime) into a naive local datetime.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+def _parse_sitemap(url: str) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """
+    Stream one sitemap file, yielding (kind, loc, lastmod) where kind is
+    'url' for pages and 'sitemap' for child sitemaps of an index.
+    """
+    with get_http_client().stream("GET", url) as resp:
+        resp.raise_for_status()
+        gunzip = zlib.decompressobj(zlib.MAX_WBITS | 32) if url.endswith(".gz") else None
+        parser = XMLPullParser(events=("start", "end"))
+
+        root = None
+        for chunk in resp.iter_bytes():
+            parser.feed(gunzip.decompress(chunk) if gunzip else chunk)
+            for event, elem in parser.read_events():
+                if event == "start":
+                    if root is None:
+                        root = elem
+                    continue
+                kind = _local_name(elem.tag)
+                if kind not in ("url", "sitemap"):
+                    continue
+                loc, lastmod = None, None
+                for child in elem:
+                    name = _local_name(child.tag)
+                    if name == "loc" and child.text:
+                        loc = child.text.strip()
+                    elif name == "lastmod" and child.text:
+                        lastmod = child.text.strip()
+                # Drop finished entries so memory stays flat on huge sitemaps
+                root.clear()
+                if loc:
+                    yield kind, loc, lastmod
+        parser.close()
+
+def iter_sitemap_urls(sitemap_urls: List[str], limit: int = None) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Walk sitemaps and sitemap indexes breadth-first.
+
+    Args:
+        sitemap_urls: Sitemap or sitemap index URLs to start from.
+        limit: Maximum page URLs to yield (defaults to Config.SITEMAP_MAX_URLS).
+
+    Yields:
+        (page_url, lastmod) tuples; lastmod is the raw string or None.
+    """
+    limit = limit or Config.SITEMAP_MAX_URLS
+    pending = list(sitemap_urls)
+    seen = set()
+    count = 0
+    while pending and count < limit and len(seen) < Config.SITEMAP_MAX_FILES:
+        sitemap_url = pending.pop(0)
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+        try:
+            for kind, loc, lastmod in _parse_sitemap(sitemap_url):
+                if kind == "sitemap":
+                    pending.append(loc)
+                    continue
+                yield loc, lastmod
+                count += 1
+                if count >= limit:
+                    break
+        except Exception as e:
+            logger.warning(f"Could not read sitemap {sitemap_url}: {e}")
+    logger.info(f"Read {count} URLs from {len(seen)} sitemaps")
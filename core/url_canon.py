@@ -0,0 +1,173 @@
+# ~/core/url_canon.py
+"""
+URL canonicalization and crawler-trap detection for the Enhanced Domain
+Intelligence Analyzer.
+
+canonicalize_url() maps the many spellings of one page (fragments, trailing
+slashes, default ports, tracking and session parameters, parameter order,
+www./bare host) to a single URL so the frontier's seen-set catches them.
+TrapDetector rejects URLs that look like infinite spaces - deep or
+repeating paths, calendars running into the future and faceted-search
+parameter explosions - before they can use up the page budget.
+"""
+
+import re
+from datetime import datetime
+from typing import Dict, Optional, Set
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode, quote
+from config import Config
+
+# Add logger
+from core.logger_config import setup_logger
+logger = setup_logger(__name__)
+
+# Query parameters that never change page content
+TRACKING_PARAMS = {
+    'gclid', 'gclsrc', 'dclid', 'fbclid', 'msclkid', 'yclid', 'twclid', 'igshid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', '_hsenc', '_hsmi', 'mkt_tok', 'ref_src',
+    'spm', 'vero_id', 'oly_anon_id', 'oly_enc_id', 'wickedid'
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_', 'hsa_')
+SESSION_PARAMS = {
+    'sid', 'sessionid', 'session_id', 'sessid', 'phpsessid', 'jsessionid',
+    'aspsessionid', 'cfid', 'cftoken', 'zenid', 'oscsid', 'sourceid'
+}
+_PATH_SESSION_RE = re.compile(r';(jsessionid|phpsessid|sid)=[^/?#]*', re.IGNORECASE)
+_MULTI_SLASH_RE = re.compile(r'/{2,}')
+# A year on its own or starting a date: "2031", "2031-05", "2031_05_01"
+_DATE_RE = re.compile(r'^((?:19|20|21)\d{2})([-_]\d{1,2}){0,2}$')
+_MONTH_RE = re.compile(r'^\d{1,2}$')
+_DATE_PARAM_HINTS = ('date', 'year', 'month', 'day', 'cal', 'week')
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def _strip_www(host: str) -> str:
+    return host[4:] if host.startswith('www.') else host
+
+def same_site(host_a: str, host_b: str) -> bool:
+    """
+    Return True if two hosts differ at most by a leading 'www.'.
+    """
+    return _strip_www(host_a.lower()) == _strip_www(host_b.lower())
+
+def _drop_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name in SESSION_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+def canonicalize_url(url: str, base: str = None, prefer_host: str = None) -> Optional[str]:
+    """
+    Normalize a URL to its canonical spelling.
+
+    Args:
+        url: Absolute or relative URL.
+        base: Base URL for resolving relative URLs.
+        prefer_host: Host (netloc) of the site being crawled; links to its
+            www./bare twin are rewritten to it.
+
+    Returns:
+        The canonical URL, or None if it is not an http(s) URL.
+    """
+    try:
+        if base:
+            url = urljoin(base, url.strip())
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https') or not parts.hostname:
+        return None
+
+    host = parts.hostname.lower().rstrip('.')
+    try:
+        port = parts.port
+    except ValueError:
+        return None
+    netloc = host if port in (None, DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+    if prefer_host and netloc != prefer_host.lower() and same_site(netloc, prefer_host):
+        netloc = prefer_host.lower()
+
+    path = _PATH_SESSION_RE.sub('', parts.path)
+    path = _MULTI_SLASH_RE.sub('/', path) or '/'
+    if len(path) > 1 and path.endswith('/'):
+        path = path.rstrip('/') or '/'
+    # Encode unsafe characters without double-encoding existing escapes
+    path = quote(path, safe="/%:@!$&'()*+,;=-._~")
+
+    params = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _drop_param(k)]
+    query = urlencode(sorted(params), doseq=True)
+
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+class TrapDetector:
+    """
+    Stateful crawler-trap heuristics for one crawl.
+
+    A URL is rejected when it is too long, too deep, repeats a path segment
+    too often, has too many query parameters, points at a calendar page far
+    in the future, or when its path has already produced too many distinct
+    query-string variants (faceted search, sort/filter combinations).
+    """
+
+    def __init__(self):
+        self._variants: Dict[str, Set[str]] = {}
+        self._max_year = datetime.now().year + 2
+        self.rejected = 0
+
+    def to_state(self) -> Dict:
+        return {'variants': {key: sorted(v) for key, v in self._variants.items()}, 'rejected': self.rejected}
+
+    def load_state(self, state: Dict):
+        self._variants = {key: set(v) for key, v in state['variants'].items()}
+        self.rejected = state['rejected']
+
+    def _reject(self, url: str, reason: str) -> bool:
+        self.rejected += 1
+        logger.debug(f"Trap heuristic rejected {url}: {reason}")
+        return False
+
+    def _future_date(self, segments, query) -> bool:
+        """
+        Detect calendar pages years ahead: /2031/05, /2031-05-01 or
+        ?month=2031-05. A bare 4-digit segment alone (an ID) does not count.
+        """
+        candidates = []
+        for i, segment in enumerate(segments):
+            match = _DATE_RE.match(segment)
+            if match and (match.group(2) or (i + 1 < len(segments) and _MONTH_RE.match(segments[i + 1]))):
+                candidates.append(match)
+        for name, value in query:
+            match = _DATE_RE.match(value)
+            if match and (match.group(2) or any(h in name.lower() for h in _DATE_PARAM_HINTS)):
+                candidates.append(match)
+        return any(int(match.group(1)) > self._max_year for match in candidates)
+
+    def allow(self, url: str) -> bool:
+        """
+        Return True if the URL does not look like part of a crawler trap.
+        """
+        if len(url) > Config.URL_MAX_LENGTH:
+            return self._reject(url, "too long")
+        parts = urlsplit(url)
+        segments = [s for s in parts.path.lower().split('/') if s]
+        if len(segments) > Config.URL_MAX_PATH_DEPTH:
+            return self._reject(url, "path too deep")
+        counts = {}
+        for segment in segments:
+            counts[segment] = counts.get(segment, 0) + 1
+            if counts[segment] > Config.URL_MAX_SEGMENT_REPEAT:
+                return self._reject(url, f"segment '{segment}' repeats")
+
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if self._future_date(segments, query):
+            return self._reject(url, "calendar date far in the future")
+
+        if parts.query:
+            names = {k for k, _ in query}
+            if len(names) > Config.URL_MAX_QUERY_PARAMS:
+                return self._reject(url, "too many query parameters")
+            key = parts.netloc + parts.path
+            variants = self._variants.setdefault(key, set())
+            if parts.query not in variants:
+                if len(variants) >= Config.URL_MAX_QUERY_VARIANTS:
+                    return self._reject(url, "too many query variants of one path")
+                variants.add(parts.query)
+        return True
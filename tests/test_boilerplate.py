@@ -0,0 +1,72 @@
+# ~/tests/test_boilerplate.py
+"""
+SiteTemplate learning and stripping tests.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.boilerplate import SiteTemplate, block_key, template_id
+
+def make_page(url: str, *blocks: str) -> dict:
+    content = '\n'.join(blocks)
+    return {'url': url, 'content': content, 'word_count': len(content.split()), 'content_hash': url}
+
+class TestSiteTemplate(unittest.TestCase):
+
+    def test_learns_blocks_repeated_across_pages(self):
+        template = SiteTemplate(min_pages=2, min_ratio=0.5)
+        pages = [make_page(f"/p{i}", "Accept cookies", f"Body of page {i}") for i in range(4)]
+        for page in pages:
+            template.observe(page)
+        self.assertEqual(template.learned(), {block_key("Accept cookies")})
+
+        stripped = template.strip(pages)
+        self.assertEqual([page['content'] for page in stripped], [f"Body of page {i}" for i in range(4)])
+        self.assertEqual(stripped[0]['word_count'], 4)
+        self.assertEqual(stripped[0]['content_hash'], pages[0]['content_hash'])
+        # The input pages are not modified
+        self.assertIn("Accept cookies", pages[0]['content'])
+
+    def test_block_key_ignores_case_and_spacing(self):
+        self.assertEqual(block_key("Accept  Cookies "), block_key("accept cookies"))
+
+    def test_strip_without_template_returns_new_list(self):
+        pages = [make_page("/a", "Only body")]
+        stripped = SiteTemplate(min_pages=0).strip(pages)
+        self.assertEqual(stripped, pages)
+        self.assertIsNot(stripped, pages)
+
+    def test_template_id_follows_stripped_blocks(self):
+        page = make_page("/a", "Accept cookies", "Subscribe now", "Body text")
+        other = make_page("/b", "Accept cookies", "Other body")
+
+        first = SiteTemplate([block_key("Accept cookies")]).strip([page, other])
+        second = SiteTemplate([block_key("Accept cookies"), block_key("Subscribe now")]).strip([page, other])
+        # A template change re-versions the pages it strips differently
+        self.assertNotEqual(first[0]['template_id'], second[0]['template_id'])
+        self.assertEqual(first[1]['template_id'], second[1]['template_id'])
+        self.assertEqual(second[0]['content'], "Body text")
+
+        untouched = SiteTemplate([block_key("Unrelated")]).strip([page])[0]
+        self.assertNotIn('template_id', untouched)
+        self.assertEqual(template_id([]), "")
+
+    def test_state_round_trip(self):
+        template = SiteTemplate(["known"], min_pages=2)
+        template.observe(make_page("/a", "Block"))
+        restored = SiteTemplate(min_pages=2)
+        restored.load_state(template.to_state())
+        self.assertEqual(restored.known, {"known"})
+        self.assertEqual(restored.pages_seen, 1)
+        self.assertEqual(restored.to_state(), template.to_state())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+# ~/tests/test_browser_pool.py
+"""
+BrowserPool job handling and light render mode tests, with Playwright
+replaced by fakes.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import browser_pool
+from core.browser_pool import BrowserPool, PlaywrightTimeoutError, _is_blocked_host, _route_light
+
+class FakeBrowser:
+    def new_context(self, **kwargs):
+        return mock.Mock()
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+class FakePool(BrowserPool):
+    """
+    Renders by recording the URL; 'slow' URLs block until released.
+    """
+
+    RESULT_HEADROOM = 0.2
+
+    def __init__(self):
+        super().__init__(max_browsers=1, recycle_after=100, user_agent="test")
+        self.rendered = []
+        self.release = threading.Event()
+
+    def _render_page(self, context, url, timeout):
+        if url.startswith("slow"):
+            self.release.wait(5)
+        self.rendered.append(url)
+        return f"<html>{url}</html>"
+
+class TestBrowserPool(unittest.TestCase):
+
+    def setUp(self):
+        playwright = mock.Mock()
+        playwright.chromium.launch.return_value = FakeBrowser()
+        patcher = mock.patch.object(browser_pool, "sync_playwright")
+        patcher.start().return_value.start.return_value = playwright
+        self.addCleanup(patcher.stop)
+        self.pool = FakePool()
+        self.addCleanup(self.pool.shutdown)
+
+    def test_render_returns_html(self):
+        self.assertEqual(self.pool.render("a", timeout=1000), "<html>a</html>")
+
+    def test_timed_out_job_is_not_rendered(self):
+        results = []
+        busy = threading.Thread(target=lambda: results.append(self.pool.render("slow", timeout=5000)))
+        busy.start()
+        while not self.pool._workers:
+            time.sleep(0.01)
+
+        # The only browser is busy, so this job waits in the queue and times out
+        with self.assertRaises(TimeoutError):
+            self.pool.render("abandoned", timeout=0)
+        self.pool.release.set()
+        busy.join(5)
+        self.assertEqual(results, ["<html>slow</html>"])
+
+        # The worker skipped the abandoned job and serves the next one
+        self.assertEqual(self.pool.render("next", timeout=1000), "<html>next</html>")
+        self.assertEqual(self.pool.rendered, ["slow", "next"])
+
+    def test_shutdown_rejects_new_jobs(self):
+        self.pool.shutdown()
+        with self.assertRaises(RuntimeError):
+            self.pool.render("a")
+
+def fake_route(url: str, resource_type: str, navigation: bool = False, main_frame: bool = True):
+    route = mock.Mock()
+    route.request.url = url
+    route.request.resource_type = resource_type
+    route.request.is_navigation_request.return_value = navigation
+    route.request.frame.parent_frame = None if main_frame else mock.Mock()
+    return route
+
+class TestLightRendering(unittest.TestCase):
+
+    def test_blocked_hosts(self):
+        self.assertTrue(_is_blocked_host("https://www.google-analytics.com/collect"))
+        self.assertTrue(_is_blocked_host("https://doubleclick.net/ad"))
+        self.assertFalse(_is_blocked_host("https://notdoubleclick.net/app.js"))
+        self.assertFalse(_is_blocked_host("https://example.com/sentry.io.js"))
+        self.assertFalse(_is_blocked_host("data:text/plain,hello"))
+
+    def test_route_light(self):
+        cases = [
+            (fake_route("https://example.com/", "document", navigation=True), True),
+            (fake_route("https://example.com/app.js", "script"), True),
+            (fake_route("https://example.com/api/items", "fetch"), True),
+            (fake_route("https://example.com/logo.png", "image"), False),
+            (fake_route("https://example.com/site.css", "stylesheet"), False),
+            (fake_route("https://www.googletagmanager.com/gtm.js", "script"), False),
+            (fake_route("https://ads.example.net/frame", "document", navigation=True, main_frame=False), True),
+            (fake_route("https://doubleclick.net/frame", "document", navigation=True, main_frame=False), False)
+        ]
+        for route, allowed in cases:
+            with self.subTest(url=route.request.url):
+                _route_light(route)
+                self.assertEqual(route.continue_.called, allowed)
+                self.assertEqual(route.abort.called, not allowed)
+
+    def test_light_mode_settles_without_waiting_for_idle(self):
+        pool = BrowserPool(max_browsers=1, recycle_after=1, user_agent="test", settle_ms=50)
+        context = mock.Mock()
+        page = context.new_page.return_value
+        page.content.return_value = "<html>rendered</html>"
+        page.wait_for_load_state.side_effect = PlaywrightTimeoutError("busy")
+        self.assertEqual(pool._render_page(context, "https://example.com/", 1000), "<html>rendered</html>")
+        context.route.assert_called_once_with("**/*", _route_light)
+        page.goto.assert_called_once_with("https://example.com/", timeout=1000, wait_until="domcontentloaded")
+        page.wait_for_load_state.assert_called_once_with("networkidle", timeout=50)
+
+    def test_full_mode(self):
+        pool = BrowserPool(max_browsers=1, recycle_after=1, user_agent="test", render_mode="full")
+        context = mock.Mock()
+        pool._render_page(context, "https://example.com/", 1000)
+        context.route.assert_not_called()
+        context.new_page.return_value.goto.assert_called_once_with("https://example.com/", timeout=1000, wait_until="networkidle")
+
+if __name__ == "__main__":
+    unittest.main()
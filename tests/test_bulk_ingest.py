@@ -0,0 +1,47 @@
+# ~/tests/test_bulk_ingest.py
+"""
+Offline bulk ingestion input tests.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.bulk_ingest import _new_stats, iter_html_dir
+
+class TestHtmlMirror(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="domchat-mirror-")
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def write(self, relative: str, data: bytes):
+        path = os.path.join(self.root, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def test_pages_decoded_with_their_own_charset(self):
+        self.write("index.html", '<meta charset="utf-8"><p>Café crème</p>'.encode('utf-8'))
+        self.write("fr/page.html", '<meta charset="iso-8859-1"><p>Crème brûlée</p>'.encode('latin-1'))
+        self.write("notes.txt", b"not html")
+        stats = _new_stats()
+        pages = dict((url, html) for html, url in iter_html_dir(self.root, "https://example.com", stats))
+
+        self.assertEqual(sorted(pages), ["https://example.com/", "https://example.com/fr/page.html"])
+        self.assertIn("Café crème", pages["https://example.com/"])
+        self.assertIn("Crème brûlée", pages["https://example.com/fr/page.html"])
+        self.assertEqual(stats['skipped_inputs'], 0)
+
+if __name__ == "__main__":
+    unittest.main()
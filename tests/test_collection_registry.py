@@ -0,0 +1,141 @@
+# ~/tests/test_collection_registry.py
+"""
+Collection naming and registry tests, including which collections
+open_collection() reuses or rebuilds.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.collection_registry import CollectionRegistry, collection_name_for
+from core.processor import EnhancedContentProcessor
+
+PARAMS = {'embedding_model': "all-MiniLM-L6-v2", 'dimension': 384, 'chunk_size': 500, 'chunk_overlap': 50}
+
+class TestCollectionName(unittest.TestCase):
+
+    def test_one_stable_name_per_host(self):
+        name = collection_name_for("https://example.com")
+        self.assertEqual(name, "domain_13c51305c1cf2666")
+        for spelling in ("http://EXAMPLE.com/", "https://example.com/docs/page", "example.com"):
+            with self.subTest(spelling=spelling):
+                self.assertEqual(collection_name_for(spelling), name)
+        self.assertNotEqual(collection_name_for("https://blog.example.com"), name)
+
+    def test_valid_chroma_name(self):
+        for domain in ("https://example.com", "multiple-urls", "http://localhost:8080"):
+            with self.subTest(domain=domain):
+                self.assertRegex(collection_name_for(domain), r'^[a-z0-9][a-z0-9_]{1,61}[a-z0-9]$')
+
+class RegistryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp(prefix="domchat-registry-")
+        self.registry = CollectionRegistry(os.path.join(self.path, "registry.db"))
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+class TestCollectionRegistry(RegistryTestCase):
+
+    def test_register_and_match(self):
+        self.assertIsNone(self.registry.get("example.com"))
+        self.assertTrue(self.registry.matches("example.com", PARAMS))
+        self.registry.register("https://example.com", "domain_x", PARAMS)
+
+        entry = CollectionRegistry(self.registry.path).get("EXAMPLE.com")
+        self.assertEqual(entry['collection'], "domain_x")
+        self.assertEqual(entry['dimension'], 384)
+        self.assertTrue(self.registry.matches("example.com", PARAMS))
+        for name, value in (('embedding_model', "other"), ('dimension', 768), ('chunk_size', 400), ('chunk_overlap', 0)):
+            with self.subTest(name=name):
+                self.assertFalse(self.registry.matches("example.com", {**PARAMS, name: value}))
+
+    def test_reregister_updates_settings(self):
+        self.registry.register("example.com", "domain_x", PARAMS)
+        created = self.registry.get("example.com")['created_at']
+        self.registry.register("example.com", "domain_x", {**PARAMS, 'chunk_size': 400})
+        entry = self.registry.get("example.com")
+        self.assertEqual((entry['chunk_size'], entry['created_at']), (400, created))
+
+class FakeCollection:
+    def __init__(self, name):
+        self.name = name
+
+class FakeChromaClient:
+    def __init__(self):
+        self.collections = {}
+        self.created = []
+
+    def get_collection(self, name):
+        if name not in self.collections:
+            raise ValueError(f"Collection {name} does not exist")
+        return self.collections[name]
+
+    def create_collection(self, name):
+        self.created.append(name)
+        self.collections[name] = FakeCollection(name)
+        return self.collections[name]
+
+    def delete_collection(self, name):
+        if self.collections.pop(name, None) is None:
+            raise ValueError(f"Collection {name} does not exist")
+
+class RegistryProcessor(EnhancedContentProcessor):
+    def __init__(self, registry: CollectionRegistry, chroma_client: FakeChromaClient, params: dict):
+        self.registry = registry
+        self.chroma_client = chroma_client
+        self.collection = None
+        self.params = params
+
+    def index_params(self):
+        return self.params
+
+class TestOpenCollection(RegistryTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client = FakeChromaClient()
+
+    def open(self, params=PARAMS, sync_mode=False):
+        processor = RegistryProcessor(self.registry, self.client, params)
+        name = processor.open_collection("https://example.com", sync_mode)
+        return processor, name
+
+    def test_compatible_collection_is_reused(self):
+        first, name = self.open()
+        self.assertEqual(name, collection_name_for("https://example.com"))
+        second, _ = self.open()
+        self.assertIs(second.collection, first.collection)
+        self.assertEqual(self.client.created, [name])
+
+    def test_changed_settings_rebuild(self):
+        first, name = self.open()
+        second, _ = self.open({**PARAMS, 'embedding_model': "other"})
+        self.assertIsNot(second.collection, first.collection)
+        self.assertEqual(self.registry.get("example.com")['embedding_model'], "other")
+
+    def test_sync_keeps_incompatible_index_registered_as_is(self):
+        first, _ = self.open()
+        second, _ = self.open({**PARAMS, 'chunk_size': 100}, sync_mode=True)
+        self.assertIs(second.collection, first.collection)
+        self.assertEqual(self.registry.get("example.com")['chunk_size'], 500)
+
+    def test_missing_registered_collection_is_recreated(self):
+        _, name = self.open()
+        self.client.collections.clear()
+        processor, _ = self.open()
+        self.assertEqual(processor.collection.name, name)
+        self.assertEqual(self.client.created, [name, name])
+
+if __name__ == "__main__":
+    unittest.main()
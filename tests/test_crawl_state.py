@@ -0,0 +1,81 @@
+# ~/tests/test_crawl_state.py
+"""
+CrawlStateStore persistence tests.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.crawl_state import CrawlStateStore, domain_key
+
+class TestCrawlStateStore(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp(prefix="domchat-state-")
+        self.store = CrawlStateStore(os.path.join(self.path, "state.db"))
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def test_domain_key(self):
+        self.assertEqual(domain_key("https://Example.com/path"), "example.com")
+        self.assertEqual(domain_key("example.com"), "example.com")
+        self.assertEqual(domain_key("http://example.com:8080"), "example.com:8080")
+
+    def test_pages_shared_across_domain_spellings(self):
+        self.store.record_pages("https://example.com", [
+            {'url': "https://example.com/a", 'content_hash': "h1", 'status_code': 200, 'fetch_method': "requests"}
+        ])
+        pages = CrawlStateStore(self.store.path).get_pages("EXAMPLE.com")
+        self.assertEqual(set(pages), {"https://example.com/a"})
+        self.assertEqual(pages["https://example.com/a"]['content_hash'], "h1")
+        self.assertTrue(pages["https://example.com/a"]['fetched_at'])
+        self.assertEqual(self.store.get_pages("other.com"), {})
+
+    def test_missing_hash_and_method_keep_stored_values(self):
+        url = "https://example.com/a"
+        self.store.record_pages("example.com", [
+            {'url': url, 'content_hash': "h1", 'status_code': 200, 'fetch_method': "playwright"}
+        ])
+        self.store.record_pages("example.com", [{'url': url, 'status_code': 304}])
+        page = self.store.get_pages("example.com")[url]
+        self.assertEqual((page['content_hash'], page['status_code'], page['fetch_method']), ("h1", 304, "playwright"))
+
+        self.store.record_pages("example.com", [{'url': url, 'content_hash': "h2", 'status_code': 200}])
+        self.assertEqual(self.store.get_pages("example.com")[url]['content_hash'], "h2")
+
+    def test_clear_hashes(self):
+        self.store.record_pages("example.com", [
+            {'url': "https://example.com/a", 'content_hash': "h1"},
+            {'url': "https://example.com/b", 'content_hash': "h2"}
+        ])
+        self.store.clear_hashes("example.com", ["https://example.com/a"])
+        pages = self.store.get_pages("example.com")
+        self.assertIsNone(pages["https://example.com/a"]['content_hash'])
+        self.assertEqual(pages["https://example.com/b"]['content_hash'], "h2")
+
+    def test_host_strategies(self):
+        self.assertEqual(self.store.get_host_strategies([]), {})
+        self.store.save_host_strategies({'a.com': {'render_streak': 2, 'pages_since_probe': 5}})
+        self.store.save_host_strategies({'a.com': {'render_streak': 3, 'pages_since_probe': 0}})
+        strategies = self.store.get_host_strategies(["a.com", "b.com"])
+        self.assertEqual(set(strategies), {"a.com"})
+        self.assertEqual((strategies["a.com"]['render_streak'], strategies["a.com"]['pages_since_probe']), (3, 0))
+
+    def test_save_template_replaces_blocks(self):
+        self.store.save_template("https://example.com", ["k1", "k2"])
+        self.store.save_template("example.com", ["k3"])
+        self.assertEqual(self.store.get_template("example.com"), ["k3"])
+        self.assertEqual(self.store.get_template("other.com"), [])
+
+if __name__ == "__main__":
+    unittest.main()
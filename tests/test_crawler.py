@@ -0,0 +1,228 @@
+# ~/tests/test_crawler.py
+"""
+Crawl regression tests against a local SyntheticSite.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from benchmarks.synthetic_site import SyntheticSite
+
+_OVERRIDES = (
+    "CHROMA_DB_PATH", "COLLECTION_REGISTRY_PATH", "HTTP_CACHE_PATH", "CRAWL_STATE_DB_PATH",
+    "ARCHIVE_PATH", "CHECKPOINT_PATH", "EMBED_CACHE_PATH", "MAX_PAGES", "CRAWL_DELAY",
+    "RATE_MIN_DELAY", "BOILERPLATE_MIN_PAGES", "CHECKPOINT_EVERY_PAGES", "ARCHIVE_MAX_SEGMENTS"
+)
+
+class CrawlTestCase(unittest.TestCase):
+    """
+    Points all storage at a temporary directory and restores Config afterwards.
+    """
+
+    def setUp(self):
+        self._saved = {name: getattr(Config, name) for name in _OVERRIDES}
+        self.storage = tempfile.mkdtemp(prefix="domchat-test-")
+        Config.CHROMA_DB_PATH = os.path.join(self.storage, "chroma_storage")
+        Config.COLLECTION_REGISTRY_PATH = os.path.join(self.storage, "collection_registry.db")
+        Config.HTTP_CACHE_PATH = os.path.join(self.storage, "http_cache")
+        Config.CRAWL_STATE_DB_PATH = os.path.join(self.storage, "crawl_state.db")
+        Config.ARCHIVE_PATH = os.path.join(self.storage, "page_archive")
+        Config.CHECKPOINT_PATH = os.path.join(self.storage, "crawl_checkpoints")
+        Config.EMBED_CACHE_PATH = os.path.join(self.storage, "embedding_cache")
+        Config.CRAWL_DELAY = 0
+        Config.RATE_MIN_DELAY = 0
+        self.sites = []
+
+    def tearDown(self):
+        for site in self.sites:
+            site.stop()
+        for name, value in self._saved.items():
+            setattr(Config, name, value)
+        shutil.rmtree(self.storage, ignore_errors=True)
+
+    def start_site(self, pages: int, validators: bool = True) -> SyntheticSite:
+        site = SyntheticSite(pages, fanout=min(8, pages - 1), page_words=300, latency_ms=0, validators=validators).start()
+        self.sites.append(site)
+        return site
+
+    def crawl(self, site: SyntheticSite, sync_mode=False, resume=False, on_pages=None):
+        from core.crawler import EnhancedDomainCrawler
+        received = []
+
+        def collect(pages):
+            received.extend(pages)
+            if on_pages:
+                on_pages(pages)
+
+        data = EnhancedDomainCrawler().crawl_domain(site.base_url, sync_mode=sync_mode, on_pages=collect, resume=resume)
+        return data, received
+
+class TestCrawlReturnsEveryPage(CrawlTestCase):
+    """
+    Every accepted page is returned and passed to on_pages, whether or not
+    a boilerplate template is learned or enabled.
+    """
+
+    def assert_all_pages(self, site: SyntheticSite, data, received, expected: int):
+        urls = {page['url'] for page in data['pages']}
+        self.assertEqual(data['total_pages'], expected)
+        self.assertEqual(len(urls), expected)
+        self.assertEqual({page['url'] for page in received}, urls)
+        self.assertEqual(len(received), expected)
+
+    def test_site_larger_than_page_budget(self):
+        Config.MAX_PAGES = 40
+        site = self.start_site(60)
+        data, received = self.crawl(site)
+        self.assert_all_pages(site, data, received, 40)
+
+    def test_site_smaller_than_template_minimum(self):
+        Config.MAX_PAGES = 40
+        site = self.start_site(2)
+        data, received = self.crawl(site)
+        self.assert_all_pages(site, data, received, 2)
+
+    def test_template_disabled(self):
+        Config.MAX_PAGES = 40
+        Config.BOILERPLATE_MIN_PAGES = 0
+        site = self.start_site(30)
+        data, received = self.crawl(site)
+        self.assert_all_pages(site, data, received, 30)
+
+    def test_sync_keeps_unchanged_pages(self):
+        Config.MAX_PAGES = 40
+        site = self.start_site(30)
+        self.crawl(site)
+        data, received = self.crawl(site, sync_mode=True)
+        self.assert_all_pages(site, data, received, 30)
+        self.assertEqual(data['sync_info']['removed_pages'], [])
+        self.assertEqual(data['sync_info']['total_changes'], 0)
+
+class TestLastmodSkipping(CrawlTestCase):
+    """
+    Sync does not fetch pages whose sitemap lastmod predates the last crawl,
+    whether or not the server sends validators.
+    """
+
+    def assert_skips_unchanged(self, validators: bool):
+        Config.MAX_PAGES = 40
+        site = self.start_site(30, validators=validators)
+        self.crawl(site)
+        fetched_before = site.page_requests
+        data, received = self.crawl(site, sync_mode=True)
+        # Only the start URL is requested again; the sitemap covers the rest
+        self.assertLessEqual(site.page_requests - fetched_before, 1)
+        self.assertEqual(data['total_pages'], 30)
+        self.assertEqual(len(received), 30)
+        self.assertGreaterEqual(len(data['sync_info']['not_modified_pages']), 29)
+        self.assertEqual(data['sync_info']['total_changes'], 0)
+
+    def test_with_validators(self):
+        self.assert_skips_unchanged(validators=True)
+
+    def test_without_validators(self):
+        self.assert_skips_unchanged(validators=False)
+
+    def test_changed_pages_on_site_larger_than_budget(self):
+        Config.MAX_PAGES = 40
+        site = self.start_site(60)
+        data, _ = self.crawl(site)
+        crawled = sorted(page['url'] for page in data['pages'] if '/page/' in page['url'])
+        changed = crawled[:3]
+        site.touch(*(int(url.rsplit('/', 1)[1]) for url in changed))
+        # The stored pages alone exceed this budget; replays must not use it up
+        Config.MAX_PAGES = 25
+        fetched_before = site.page_requests
+        data, received = self.crawl(site, sync_mode=True)
+        self.assertGreater(site.page_requests, fetched_before)
+        self.assertEqual(sorted(data['sync_info']['updated_pages']), changed)
+        self.assertGreaterEqual(data['sync_info']['total_changes'], 3)
+        self.assertGreaterEqual(len(data['sync_info']['not_modified_pages']), 36)
+        self.assertEqual(len(received), data['total_pages'])
+
+class TestConcurrentCheckpoint(CrawlTestCase):
+    """
+    A second crawl of a host does not touch the checkpoint of a running one.
+    """
+
+    def test_second_crawl_leaves_checkpoint_alone(self):
+        from core.crawl_checkpoint import CrawlCheckpoint
+        Config.MAX_PAGES = 40
+        site = self.start_site(20)
+        running = CrawlCheckpoint(site.base_url)
+        self.assertTrue(running.acquire())
+        try:
+            self.assertFalse(CrawlCheckpoint(site.base_url).acquire())
+            running.save({"marker": True, "visited": 1}, [{"url": site.base_url + "/"}])
+            data, received = self.crawl(site)
+            self.assertEqual(data['total_pages'], 20)
+            self.assertEqual(len(received), 20)
+            self.assertTrue(running.exists())
+            self.assertTrue(running.load()["marker"])
+        finally:
+            running.release()
+        after = CrawlCheckpoint(site.base_url)
+        self.assertTrue(after.acquire())
+        after.release()
+
+class TestArchive(CrawlTestCase):
+    """
+    Crawls archive their HTML, compact old segments and re-index from them.
+    """
+
+    def test_recrawls_compact_and_reindex(self):
+        from core.crawler import EnhancedDomainCrawler
+        from core.page_archive import PageArchive
+        Config.MAX_PAGES = 40
+        Config.ARCHIVE_MAX_SEGMENTS = 1
+        site = self.start_site(20)
+        self.crawl(site)
+        site.touch(3)
+        self.crawl(site)
+        self.assertEqual(len(PageArchive().segments(site.base_url)), 1)
+
+        data = EnhancedDomainCrawler().reindex_domain(site.base_url)
+        self.assertEqual(data['total_pages'], 20)
+        page = next(page for page in data['pages'] if page['url'].endswith("/page/3"))
+        self.assertIn("Revision 1 of page 3", page['content'])
+
+class TestResume(CrawlTestCase):
+    """
+    A resumed sync reports the changes of the whole crawl, including pages
+    refetched by the interrupted run after its last checkpoint.
+    """
+
+    def test_resumed_sync_diffs_pre_crawl_hashes(self):
+        Config.MAX_PAGES = 40
+        Config.CHECKPOINT_EVERY_PAGES = 5
+        site = self.start_site(30)
+        self.crawl(site)
+        changed = [f"{site.base_url}page/{i}" for i in range(1, 30)]
+        site.touch(*range(1, 30))
+
+        waves = []
+
+        def crash(pages):
+            waves.append(pages)
+            if len(waves) == 2:
+                raise RuntimeError("crawl interrupted")
+
+        with self.assertRaises(RuntimeError):
+            self.crawl(site, sync_mode=True, on_pages=crash)
+        data, _ = self.crawl(site, resume=True)
+        self.assertEqual(sorted(data['sync_info']['updated_pages']), sorted(changed))
+        self.assertEqual(data['sync_info']['new_pages'], [])
+        self.assertEqual(data['total_pages'], 30)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# ~/tests/test_dedup.py
+"""
+SimHash and near-duplicate detection tests.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from core.dedup import NearDuplicateIndex, drop_near_duplicates, hamming_distance, simhash
+
+def article(seed: int, words: int = 300) -> str:
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(2000)]
+    return ' '.join(rng.choice(vocabulary) for _ in range(words))
+
+def flip_bits(fingerprint: int, count: int, rng: random.Random) -> int:
+    for bit in rng.sample(range(64), count):
+        fingerprint ^= 1 << bit
+    return fingerprint
+
+class TestSimHash(unittest.TestCase):
+
+    def test_stable_64_bit_fingerprint(self):
+        text = article(1)
+        self.assertEqual(simhash(text), simhash(text))
+        self.assertEqual(simhash(text), simhash(text.upper().replace(' ', '\n  ')))
+        self.assertTrue(0 < simhash(text) < 2 ** 64)
+        self.assertEqual(simhash(""), 0)
+        self.assertEqual(simhash("   "), 0)
+        self.assertNotEqual(simhash("one two"), 0)
+
+    def test_small_edit_is_near(self):
+        text = article(2)
+        edited = text.replace(text.split()[100], "changed", 1) + " Page 2 of 7"
+        self.assertLessEqual(hamming_distance(simhash(text), simhash(edited)), Config.NEAR_DUPLICATE_DISTANCE)
+
+    def test_different_texts_are_far(self):
+        self.assertGreater(hamming_distance(simhash(article(3)), simhash(article(4))), 10)
+
+class TestNearDuplicateIndex(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        rng = random.Random(0)
+        for max_distance in (0, 3, 7):
+            with self.subTest(max_distance=max_distance):
+                index = NearDuplicateIndex(max_distance)
+                stored = [rng.getrandbits(64) for _ in range(200)]
+                for i, fingerprint in enumerate(stored):
+                    index.add(fingerprint, f"p{i}")
+                for i, fingerprint in enumerate(stored[:50]):
+                    self.assertEqual(index.find(flip_bits(fingerprint, max_distance, rng)), f"p{i}")
+                for _ in range(200):
+                    probe = rng.getrandbits(64)
+                    expected = any(hamming_distance(probe, other) <= max_distance for other in stored)
+                    self.assertEqual(index.find(probe) is not None, expected)
+
+class TestDropNearDuplicates(unittest.TestCase):
+
+    def setUp(self):
+        self._saved = Config.NEAR_DUPLICATE_DISTANCE
+        Config.NEAR_DUPLICATE_DISTANCE = 3
+
+    def tearDown(self):
+        Config.NEAR_DUPLICATE_DISTANCE = self._saved
+
+    def pages(self):
+        text = article(5)
+        return [
+            {'url': "https://example.com/a", 'content': text},
+            {'url': "https://example.com/b", 'content': article(6)},
+            {'url': "https://example.com/a?utm_source=x", 'content': text, 'simhash': simhash(text)}
+        ]
+
+    def test_keeps_first_of_each_group(self):
+        kept, duplicates = drop_near_duplicates(self.pages())
+        self.assertEqual([p['url'] for p in kept], ["https://example.com/a", "https://example.com/b"])
+        self.assertEqual(duplicates, [{'url': "https://example.com/a?utm_source=x", 'duplicate_of': "https://example.com/a"}])
+
+    def test_index_spans_waves(self):
+        first, second, third = self.pages()
+        index = NearDuplicateIndex(Config.NEAR_DUPLICATE_DISTANCE)
+        self.assertEqual(drop_near_duplicates([first], index), ([first], []))
+        kept, duplicates = drop_near_duplicates([second, third], index)
+        self.assertEqual(kept, [second])
+        self.assertEqual(duplicates[0]['duplicate_of'], first['url'])
+
+    def test_disabled(self):
+        Config.NEAR_DUPLICATE_DISTANCE = -1
+        pages = self.pages()
+        self.assertEqual(drop_near_duplicates(pages), (pages, []))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+# ~/tests/test_embedding_backend.py
+"""
+Embedding backend tests: the torch fallback of the onnx backend, ONNX
+pooling with a fake session and tokenizer, and the parity command.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import io
+import os
+import sys
+import types
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import embedding_backend
+from core.embedding_backend import OnnxEmbedder, _cosine, embedding_cache_name, load_embedding_model
+
+class FakeSentenceTransformer:
+    def __init__(self, model_name, device=None):
+        self.model_name = model_name
+
+def fake_sentence_transformers():
+    """
+    sys.modules entry so the torch fallback loads a fake model.
+    """
+    return mock.patch.dict(sys.modules, {
+        'sentence_transformers': types.SimpleNamespace(SentenceTransformer=FakeSentenceTransformer)
+    })
+
+class TestBackendFallback(unittest.TestCase):
+
+    def test_onnx_unavailable_falls_back_to_torch(self):
+        with fake_sentence_transformers(), mock.patch.object(embedding_backend, "ONNX_AVAILABLE", False):
+            model = load_embedding_model("all-MiniLM-L6-v2", "onnx")
+        self.assertIsInstance(model, FakeSentenceTransformer)
+        self.assertEqual(embedding_cache_name("all-MiniLM-L6-v2", model), "all-MiniLM-L6-v2")
+
+    def test_failed_export_falls_back_to_torch(self):
+        with fake_sentence_transformers(), \
+                mock.patch.object(embedding_backend, "ONNX_AVAILABLE", True), \
+                mock.patch.object(embedding_backend, "_model_dir", return_value="/nonexistent"), \
+                mock.patch.object(embedding_backend, "export_model", side_effect=RuntimeError("no torch.onnx")) as export:
+            model = load_embedding_model("all-MiniLM-L6-v2", "ONNX")
+        export.assert_called_once_with("all-MiniLM-L6-v2")
+        self.assertIsInstance(model, FakeSentenceTransformer)
+
+    def test_exported_model_is_loaded(self):
+        loaded = object.__new__(OnnxEmbedder)
+        with mock.patch.object(embedding_backend, "ONNX_AVAILABLE", True), \
+                mock.patch.object(embedding_backend.os.path, "exists", return_value=True), \
+                mock.patch.object(embedding_backend, "OnnxEmbedder", return_value=loaded), \
+                mock.patch.object(embedding_backend, "export_model") as export:
+            model = load_embedding_model("all-MiniLM-L6-v2", "onnx")
+        export.assert_not_called()
+        self.assertIs(model, loaded)
+        self.assertEqual(embedding_cache_name("all-MiniLM-L6-v2", model), "all-MiniLM-L6-v2@onnx-int8")
+
+    def test_unknown_backend_uses_torch(self):
+        with fake_sentence_transformers():
+            self.assertIsInstance(load_embedding_model("m", "tensorflow"), FakeSentenceTransformer)
+
+class FakeEncoding:
+    def __init__(self, length: int, padded: int):
+        self.ids = list(range(1, length + 1)) + [0] * (padded - length)
+        self.attention_mask = [1] * length + [0] * (padded - length)
+        self.type_ids = [0] * padded
+
+class FakeTokenizer:
+    def encode_batch(self, texts):
+        padded = max(len(text.split()) for text in texts)
+        return [FakeEncoding(len(text.split()), padded) for text in texts]
+
+class FakeSession:
+    """
+    Hidden state of token t is [id, 1]; padding positions hold garbage.
+    """
+
+    def __init__(self):
+        self.feeds = []
+
+    def run(self, outputs, feeds):
+        self.feeds.append(feeds)
+        ids = feeds['input_ids'].astype(np.float32)
+        hidden = np.stack([ids, np.ones_like(ids)], axis=-1)
+        hidden[feeds['attention_mask'] == 0] = 1000.0
+        return [hidden]
+
+def fake_embedder(pooling: str, normalize: bool, input_names=("input_ids", "attention_mask")) -> OnnxEmbedder:
+    embedder = object.__new__(OnnxEmbedder)
+    embedder.model_name = "fake"
+    embedder.pooling = pooling
+    embedder.normalize = normalize
+    embedder.dimension = 2
+    embedder.tokenizer = FakeTokenizer()
+    embedder.session = FakeSession()
+    embedder.input_names = set(input_names)
+    return embedder
+
+class TestOnnxPooling(unittest.TestCase):
+
+    def test_mean_pooling_ignores_padding(self):
+        out = fake_embedder("mean", normalize=False).encode(["one two three", "one"], batch_size=8)
+        np.testing.assert_allclose(out, [[2.0, 1.0], [1.0, 1.0]])
+        self.assertEqual(out.dtype, np.float32)
+
+    def test_cls_pooling_and_normalization(self):
+        embedder = fake_embedder("cls", normalize=True)
+        out = embedder.encode(["a b", "c d e"])
+        np.testing.assert_allclose(out, np.tile([1, 1] / np.sqrt(2), (2, 1)), rtol=1e-6)
+        single = fake_embedder("mean", normalize=False).encode("a b c", normalize_embeddings=True)
+        np.testing.assert_allclose(np.linalg.norm(single), 1.0, rtol=1e-6)
+
+    def test_batches_and_token_type_ids(self):
+        embedder = fake_embedder("mean", normalize=False, input_names=("input_ids", "attention_mask", "token_type_ids"))
+        out = embedder.encode(["a"] * 5, batch_size=2)
+        self.assertEqual(out.shape, (5, 2))
+        self.assertEqual([len(feeds['input_ids']) for feeds in embedder.session.feeds], [2, 2, 1])
+        self.assertIn('token_type_ids', embedder.session.feeds[0])
+
+class TestParity(unittest.TestCase):
+
+    def test_cosine(self):
+        a = np.array([[1.0, 0.0], [1.0, 1.0], [0.0, 0.0]])
+        b = np.array([[2.0, 0.0], [1.0, -1.0], [0.0, 0.0]])
+        np.testing.assert_allclose(_cosine(a, b), [1.0, 0.0, 0.0], atol=1e-9)
+
+    def test_parity_command_exit_status(self):
+        for drift, status in ((0.001, 0), (0.05, 1)):
+            with self.subTest(drift=drift), \
+                    mock.patch.object(embedding_backend, "parity_check", return_value={'drift_max': drift}) as check, \
+                    redirect_stdout(io.StringIO()):
+                self.assertEqual(embedding_backend.main(["parity", "m", "--batch-size", "8"]), status)
+                check.assert_called_once_with("m", None, 8)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+# ~/tests/test_embedding_batch.py
+"""
+Length-bucketed batch encoding tests, with a fake model.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import embedding_batch
+from core.embedding_batch import BatchedEncoder, length_buckets
+
+def vector_of(text: str) -> np.ndarray:
+    return np.array([len(text), text.count("a"), 1.0], dtype=np.float64)
+
+class FakeModel:
+    def __init__(self):
+        self.calls = []
+
+    def get_sentence_embedding_dimension(self):
+        return 3
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        self.calls.append(list(texts))
+        return np.stack([vector_of(text) for text in texts])
+
+class PoolModel(FakeModel):
+    def __init__(self):
+        super().__init__()
+        self.pool_calls = []
+
+    def start_multi_process_pool(self, target_devices):
+        return {'devices': target_devices}
+
+    def encode_multi_process(self, texts, pool, batch_size=32):
+        self.pool_calls.append(list(texts))
+        return np.stack([vector_of(text) for text in texts])
+
+    @staticmethod
+    def stop_multi_process_pool(pool):
+        pass
+
+TEXTS = ["a", "aaaa aaaa", "bb", "a longer text here", "", "ccc", "aa"]
+
+class TestLengthBuckets(unittest.TestCase):
+
+    def test_longest_first_and_stable(self):
+        buckets = length_buckets(["x", "xxx", "yy", "zzz", "w"], 2)
+        self.assertEqual([list(b) for b in buckets], [[1, 3], [2, 0], [4]])
+        self.assertEqual(length_buckets([], 4), [])
+
+class TestBatchedEncoder(unittest.TestCase):
+
+    def tearDown(self):
+        embedding_batch._pools.clear()
+
+    def test_results_in_caller_order(self):
+        model = FakeModel()
+        out = BatchedEncoder(model, batch_size=3, processes=0).encode(TEXTS)
+        self.assertEqual(out.dtype, np.float32)
+        np.testing.assert_array_equal(out, np.stack([vector_of(text) for text in TEXTS]))
+        self.assertEqual([len(call) for call in model.calls], [3, 3, 1])
+        # Every bucket holds texts of similar length
+        self.assertEqual(model.calls[0], ["a longer text here", "aaaa aaaa", "ccc"])
+
+    def test_single_and_empty(self):
+        encoder = BatchedEncoder(FakeModel(), batch_size=2, processes=0)
+        np.testing.assert_array_equal(encoder.encode("aa"), vector_of("aa"))
+        self.assertEqual(encoder.encode([]).shape, (0, 3))
+
+    def test_batch_size_option(self):
+        model = FakeModel()
+        BatchedEncoder(model, batch_size=2, processes=0).encode(TEXTS, batch_size=5, show_progress_bar=True)
+        self.assertEqual([len(call) for call in model.calls], [5, 2])
+
+    def test_process_pool_for_large_calls(self):
+        model = PoolModel()
+        encoder = BatchedEncoder(model, batch_size=2, processes=2, min_texts=5)
+        np.testing.assert_array_equal(encoder.encode(TEXTS), np.stack([vector_of(text) for text in TEXTS]))
+        self.assertEqual(len(model.pool_calls), 1)
+        self.assertEqual(model.calls, [])
+
+        # Small calls and extra encode options stay in-process
+        encoder.encode(TEXTS[:3])
+        encoder.encode(TEXTS, normalize_embeddings=True)
+        self.assertEqual(len(model.pool_calls), 1)
+        self.assertEqual(len(model.calls), 2 + 4)
+
+    def test_model_without_pool_encodes_in_process(self):
+        model = FakeModel()
+        out = BatchedEncoder(model, batch_size=4, processes=2, min_texts=1).encode(TEXTS)
+        np.testing.assert_array_equal(out, np.stack([vector_of(text) for text in TEXTS]))
+        self.assertEqual(len(model.calls), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+# ~/tests/test_embedding_cache.py
+"""
+Two-tier embedding cache tests, with a deterministic fake model.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.embedding_cache import _SCHEMA, CachedEmbedder, EmbeddingCache, _DiskTier, text_key
+
+DIMENSION = 4
+
+def vector_of(text: str) -> np.ndarray:
+    return np.full(DIMENSION, len(' '.join(text.split())), dtype=np.float32)
+
+class FakeModel:
+    def __init__(self):
+        self.encoded = []
+
+    def get_sentence_embedding_dimension(self):
+        return DIMENSION
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        vectors = np.stack([vector_of(text) for text in texts])
+        return vectors * 2 if kwargs.get('normalize_embeddings') else vectors
+
+class CacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp(prefix="domchat-embed-cache-")
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def embedder(self, memory_items: int = 100, disk_mb: int = 1, model_name: str = "fake"):
+        model = FakeModel()
+        return CachedEmbedder(model, model_name, EmbeddingCache(self.path, memory_items, disk_mb)), model
+
+class TestTextKey(unittest.TestCase):
+
+    def test_whitespace_and_model(self):
+        self.assertEqual(text_key("m", "a  b\nc"), text_key("m", " a b c "))
+        self.assertNotEqual(text_key("m", "a b"), text_key("other", "a b"))
+        self.assertNotEqual(text_key("m", "a b"), text_key("m", "a c"))
+
+class TestCachedEmbedder(CacheTestCase):
+
+    def test_encodes_only_missing_texts_once(self):
+        embedder, model = self.embedder()
+        out = embedder.encode(["alpha", "beta", "alpha"])
+        self.assertEqual(out.dtype, np.float32)
+        np.testing.assert_array_equal(out, np.stack([vector_of(t) for t in ["alpha", "beta", "alpha"]]))
+        self.assertEqual(model.encoded, ["alpha", "beta"])
+
+        out = embedder.encode(["beta", "gamma  ray", "gamma ray"])
+        self.assertEqual(model.encoded, ["alpha", "beta", "gamma  ray"])
+        self.assertEqual(out.shape, (3, DIMENSION))
+        self.assertEqual((embedder.cache.hits, embedder.cache.misses), (1, 5))
+
+    def test_single_text_and_empty_batch(self):
+        embedder, _ = self.embedder()
+        np.testing.assert_array_equal(embedder.encode("alpha"), vector_of("alpha"))
+        self.assertEqual(embedder.encode([]).shape, (0, DIMENSION))
+
+    def test_vector_changing_options_bypass_cache(self):
+        embedder, model = self.embedder()
+        embedder.encode(["alpha"], batch_size=8)
+        np.testing.assert_array_equal(embedder.encode(["alpha"], normalize_embeddings=True)[0], vector_of("alpha") * 2)
+        self.assertEqual(model.encoded, ["alpha", "alpha"])
+
+    def test_disk_tier_shared_across_instances(self):
+        first, _ = self.embedder()
+        first.encode(["alpha", "beta"])
+        second, model = self.embedder()
+        np.testing.assert_array_equal(second.encode(["beta", "alpha"]), np.stack([vector_of("beta"), vector_of("alpha")]))
+        self.assertEqual(model.encoded, [])
+        # Another model name never sees these vectors
+        third, model = self.embedder(model_name="other")
+        third.encode(["alpha"])
+        self.assertEqual(model.encoded, ["alpha"])
+
+    def test_memory_only_lru(self):
+        embedder, model = self.embedder(memory_items=2, disk_mb=0)
+        embedder.encode(["a", "bb", "ccc"])
+        embedder.encode(["bb", "ccc"])
+        self.assertEqual(model.encoded, ["a", "bb", "ccc"])
+        embedder.encode(["a"])
+        self.assertEqual(model.encoded, ["a", "bb", "ccc", "a"])
+        self.assertFalse(os.path.exists(os.path.join(self.path, "index.db")))
+
+class TestDiskTier(CacheTestCase):
+
+    def tier(self, rows: int) -> _DiskTier:
+        index_path = os.path.join(self.path, "index.db")
+        conn = sqlite3.connect(index_path)
+        conn.executescript(_SCHEMA)
+        conn.close()
+        return _DiskTier(self.path, "fake/model", DIMENSION, index_path, rows * DIMENSION * 4)
+
+    def test_evicts_least_recently_used(self):
+        tier = self.tier(3)
+        tier.put({'a': vector_of("a"), 'b': vector_of("bb"), 'c': vector_of("ccc")})
+        tier.get(['a'])  # a is now more recent than b
+        tier.put({'d': vector_of("dddd")})
+        found = tier.get(['a', 'b', 'c', 'd'])
+        self.assertEqual(set(found), {'a', 'c', 'd'})
+        np.testing.assert_array_equal(found['d'], vector_of("dddd"))
+        np.testing.assert_array_equal(found['a'], vector_of("a"))
+
+    def test_oversized_batch_keeps_newest(self):
+        tier = self.tier(2)
+        tier.put({str(i): vector_of("x" * i) for i in range(1, 6)})
+        self.assertEqual(set(tier.get([str(i) for i in range(1, 6)])), {'4', '5'})
+
+    def test_resize_starts_over(self):
+        self.tier(3).put({'a': vector_of("a")})
+        self.assertEqual(self.tier(3).get(['a']).keys(), {'a'})
+        self.assertEqual(self.tier(4).get(['a']), {})
+
+if __name__ == "__main__":
+    unittest.main()
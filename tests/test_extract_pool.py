@@ -0,0 +1,69 @@
+# ~/tests/test_extract_pool.py
+"""
+Extraction process pool tests.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from core import extract_pool
+from core.html_extract import extract_page
+
+HTML = "<html><head><title>Pool</title></head><body><main><p>" + "word " * 50 + "</p></main></body></html>"
+
+def without_timestamp(result):
+    page, has_body_text = result
+    return {k: v for k, v in page.items() if k != 'timestamp'}, has_body_text
+
+class TestExtractionPool(unittest.TestCase):
+
+    def setUp(self):
+        self._saved = Config.EXTRACT_WORKERS
+        Config.EXTRACT_WORKERS = 1
+
+    def tearDown(self):
+        extract_pool.reset_extraction_pool()
+        Config.EXTRACT_WORKERS = self._saved
+
+    def test_pool_matches_in_process_extraction(self):
+        pool = extract_pool.get_extraction_pool()
+        result = pool.submit(extract_page, HTML, "https://example.com/").result(timeout=60)
+        self.assertEqual(without_timestamp(result), without_timestamp(extract_page(HTML, "https://example.com/")))
+
+    def test_shared_pool_and_reset(self):
+        pool = extract_pool.get_extraction_pool()
+        self.assertIs(extract_pool.get_extraction_pool(), pool)
+        extract_pool.reset_extraction_pool()
+        self.assertIsNot(extract_pool.get_extraction_pool(), pool)
+
+    def test_disabled(self):
+        Config.EXTRACT_WORKERS = 0
+        self.assertIsNone(extract_pool.get_extraction_pool())
+
+    @mock.patch("core.fetcher.render_with_playwright", return_value="")
+    def test_broken_pool_falls_back_in_process(self, _):
+        from core.fetcher import AsyncCrawlEngine
+        pool = extract_pool.get_extraction_pool()
+        with self.assertRaises(BrokenProcessPool):
+            pool.submit(os._exit, 1).result(timeout=60)
+
+        engine = AsyncCrawlEngine()
+        page, has_body_text = asyncio.run(engine._extract(HTML, "https://example.com/"))
+        self.assertEqual(page['title'], "Pool")
+        self.assertTrue(has_body_text)
+        # The broken pool was dropped; the next call starts a fresh one
+        self.assertIsNot(extract_pool.get_extraction_pool(), pool)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# ~/tests/test_fetch_strategy.py
+"""
+Per-host fetch strategy tests.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from core.crawl_state import CrawlStateStore
+from core.fetch_strategy import FetchStrategyMemory
+
+HOST = "spa.example.com"
+
+class TestFetchStrategyMemory(unittest.TestCase):
+
+    def setUp(self):
+        self._saved = {name: getattr(Config, name) for name in ("FETCH_RENDER_STREAK", "FETCH_REPROBE_EVERY")}
+        Config.FETCH_RENDER_STREAK = 2
+        Config.FETCH_REPROBE_EVERY = 3
+        self.path = tempfile.mkdtemp(prefix="domchat-strategy-")
+        self.store = CrawlStateStore(os.path.join(self.path, "state.db"))
+        self.memory = FetchStrategyMemory(self.store)
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+        for name, value in self._saved.items():
+            setattr(Config, name, value)
+
+    def test_render_after_streak_and_reprobe(self):
+        self.assertEqual(self.memory.plan(HOST), "http")
+        self.memory.observe(HOST, needed_render=True, probed=True)
+        self.assertEqual(self.memory.plan(HOST), "http")
+        self.memory.observe(HOST, needed_render=True, probed=True)
+        self.assertEqual(self.memory.plan(HOST), "render")
+
+        # Direct renders count towards the next probe
+        for _ in range(Config.FETCH_REPROBE_EVERY):
+            self.memory.observe(HOST, needed_render=True, probed=False)
+        self.assertEqual(self.memory.plan(HOST), "http")
+        self.memory.observe(HOST, needed_render=True, probed=True)
+        self.assertEqual(self.memory.plan(HOST), "render")
+
+    def test_plain_html_probe_resets_streak(self):
+        for _ in range(3):
+            self.memory.observe(HOST, needed_render=True, probed=True)
+        self.memory.observe(HOST, needed_render=False, probed=True)
+        self.assertEqual(self.memory.plan(HOST), "http")
+        self.assertEqual(self.memory.plan("other.example.com"), "http")
+
+    def test_flush_persists_across_instances(self):
+        for _ in range(2):
+            self.memory.observe(HOST, needed_render=True, probed=True)
+        self.assertEqual(FetchStrategyMemory(self.store).plan(HOST), "http")
+        self.memory.flush()
+        self.assertEqual(FetchStrategyMemory(self.store).plan(HOST), "render")
+        self.assertEqual(self.store.get_host_strategies([HOST])[HOST]['render_streak'], 2)
+
+if __name__ == "__main__":
+    unittest.main()
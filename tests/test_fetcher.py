@@ -0,0 +1,82 @@
+# ~/tests/test_fetcher.py
+"""
+AsyncCrawlEngine tests against a local SyntheticSite.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from benchmarks.synthetic_site import SyntheticSite
+from core.fetcher import AsyncCrawlEngine
+
+class EngineTestCase(unittest.TestCase):
+    """
+    Starts a site with per-request latency; pacing is disabled and
+    Playwright is never launched.
+    """
+
+    latency_ms = 200
+
+    def setUp(self):
+        self._saved = {name: getattr(Config, name) for name in ("CRAWL_DELAY", "RATE_MIN_DELAY")}
+        Config.CRAWL_DELAY = 0
+        Config.RATE_MIN_DELAY = 0
+        patcher = mock.patch("core.fetcher.render_with_playwright", return_value="")
+        self.render = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.site = SyntheticSite(20, fanout=3, page_words=200, latency_ms=self.latency_ms).start()
+        self.addCleanup(self.site.stop)
+
+    def tearDown(self):
+        for name, value in self._saved.items():
+            setattr(Config, name, value)
+
+    def urls(self, count: int):
+        return [self.site.base_url.rstrip('/') + self.site.path(i) for i in range(count)]
+
+class TestAsyncCrawlEngine(EngineTestCase):
+
+    def test_results_in_request_order(self):
+        urls = self.urls(10)
+        results = AsyncCrawlEngine(max_concurrency=10, per_host_concurrency=10).fetch_all(list(reversed(urls)))
+        self.assertEqual([r['url'] for r in results], list(reversed(urls)))
+        for result in results:
+            self.assertEqual(result['status'], 200)
+            self.assertEqual(result['source'], "requests")
+            self.assertEqual(result['page']['url'], result['url'])
+            self.assertGreater(result['page']['word_count'], 50)
+        self.render.assert_not_called()
+
+    def test_fetches_concurrently(self):
+        start = time.perf_counter()
+        AsyncCrawlEngine(max_concurrency=20, per_host_concurrency=20).fetch_all(self.urls(20))
+        # 20 serial requests would take at least 4 seconds
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+    def test_per_host_limit(self):
+        start = time.perf_counter()
+        AsyncCrawlEngine(max_concurrency=20, per_host_concurrency=2).fetch_all(self.urls(10))
+        # 10 requests, at most 2 at a time
+        self.assertGreaterEqual(time.perf_counter() - start, 5 * self.latency_ms / 1000 * 0.9)
+
+    def test_missing_page(self):
+        result = AsyncCrawlEngine().fetch_all([self.site.base_url + "missing"])[0]
+        self.assertEqual(result['status'], 404)
+        self.assertEqual(result['html'], "")
+        self.assertIsNone(result['page'])
+
+    def test_empty_batch(self):
+        self.assertEqual(AsyncCrawlEngine().fetch_all([]), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+# ~/tests/test_frontier.py
+"""
+CrawlFrontier ordering, deduplication and snapshot tests.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.frontier import CrawlFrontier
+
+class TestCrawlFrontier(unittest.TestCase):
+
+    def setUp(self):
+        self.frontier = CrawlFrontier(max_depth=3)
+
+    def test_keyword_pages_first(self):
+        self.frontier.push("https://example.com/misc", 1)
+        self.frontier.push("https://example.com/blog", 1)
+        self.frontier.push("https://example.com/about", 1)
+        self.assertEqual(
+            [url for url, _ in self.frontier.pop_batch(3)],
+            ["https://example.com/about", "https://example.com/blog", "https://example.com/misc"]
+        )
+
+    def test_shallow_pages_first(self):
+        self.frontier.push("https://example.com/a/b/c", 1)
+        self.frontier.push("https://example.com/deep", 3)
+        self.frontier.push("https://example.com/near", 1)
+        self.assertEqual(self.frontier.pop(), ("https://example.com/near", 1))
+        self.assertEqual(self.frontier.pop(), ("https://example.com/a/b/c", 1))
+        self.assertEqual(self.frontier.pop(), ("https://example.com/deep", 3))
+
+    def test_explicit_score_and_insertion_order(self):
+        self.frontier.push("https://example.com/x", 1)
+        self.frontier.push("https://example.com/y", 1)
+        self.frontier.push("https://example.com/", 0, score=float('inf'))
+        self.assertEqual([url for url, _ in self.frontier.pop_batch(10)],
+                         ["https://example.com/", "https://example.com/x", "https://example.com/y"])
+
+    def test_dedup_and_depth_limit(self):
+        self.assertTrue(self.frontier.push("https://example.com/a", 1))
+        self.assertFalse(self.frontier.push("https://example.com/a", 2))
+        self.assertFalse(self.frontier.push("https://example.com/too-deep", 4))
+        self.frontier.mark_seen("https://example.com/b")
+        self.assertFalse(self.frontier.push("https://example.com/b", 1))
+        self.assertTrue(self.frontier.is_seen("https://example.com/b"))
+        self.assertEqual(len(self.frontier), 1)
+        # Popped URLs stay seen
+        self.frontier.pop()
+        self.assertFalse(self.frontier.push("https://example.com/a", 1))
+
+    def test_pop_batch_limit(self):
+        for i in range(5):
+            self.frontier.push(f"https://example.com/{i}", 1)
+        self.assertEqual(len(self.frontier.pop_batch(3)), 3)
+        self.assertEqual(len(self.frontier.pop_batch(3)), 2)
+        self.assertEqual(self.frontier.pop_batch(3), [])
+
+    def test_state_round_trip(self):
+        for url in ("https://example.com/team", "https://example.com/x/y", "https://example.com/z"):
+            self.frontier.push(url, 1)
+        self.frontier.mark_seen("https://example.com/done")
+        restored = CrawlFrontier(max_depth=3)
+        restored.load_state(self.frontier.to_state())
+        self.assertTrue(restored.is_seen("https://example.com/done"))
+        restored.push("https://example.com/new", 1)
+        self.frontier.push("https://example.com/new", 1)
+        self.assertEqual(restored.pop_batch(10), self.frontier.pop_batch(10))
+
+if __name__ == "__main__":
+    unittest.main()
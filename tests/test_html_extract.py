@@ -0,0 +1,110 @@
+# ~/tests/test_html_extract.py
+"""
+HTML extraction and decoding tests.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import codecs
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from core.html_extract import decode_html, extract_html, extract_page, looks_empty
+
+PAGE = """<html><head><title> Team </title>
+<link rel="Canonical" href="/team">
+<script>var x = 1;</script><style>p {}</style></head>
+<body>
+<nav><a href="/home">Home</a></nav>
+<div class="content"><h1>Our team</h1><p>Alice leads <b>engineering</b> and
+research.</p><p>Bob runs sales.</p><!-- hidden --></div>
+<main><h2>Main heading</h2><p>The main element wins over the content class.</p>
+<ul><li>First</li><li>Second</li></ul><a href="contact">Contact</a></main>
+<footer>Copyright</footer>
+</body></html>"""
+
+class TestExtractHtml(unittest.TestCase):
+
+    def setUp(self):
+        self._saved = Config.HTML_PARSER
+
+    def tearDown(self):
+        Config.HTML_PARSER = self._saved
+
+    def extract(self, html: str) -> dict:
+        """
+        Extract with both backends and check that they agree.
+        """
+        results = []
+        for parser in ("lxml", "html.parser"):
+            Config.HTML_PARSER = parser
+            results.append(extract_html(html))
+        self.assertEqual(results[0], results[1])
+        return results[0]
+
+    def test_backends_agree(self):
+        result = self.extract(PAGE)
+        self.assertEqual(result['title'], "Team")
+        self.assertEqual(result['canonical'], "/team")
+        self.assertEqual(result['links'], ["/home", "contact"])
+        self.assertEqual(result['headings'], ["Our team", "Main heading"])
+        self.assertEqual(result['content'].split("\n"), [
+            "Main heading", "The main element wins over the content class.", "First", "Second", "Contact"
+        ])
+        self.assertTrue(result['has_body_text'])
+
+    def test_falls_back_to_body_text(self):
+        result = self.extract("<html><body><div>Plain <i>body</i> text</div>tail<header>Top</header></body></html>")
+        self.assertEqual(result['content'], "Plain body text\ntail")
+        self.assertIsNone(result['title'])
+        self.assertFalse(result['has_body_text'])
+
+    def test_empty_input(self):
+        self.assertEqual(self.extract(""), {
+            'title': None, 'content': "", 'headings': [], 'links': [], 'canonical': None, 'has_body_text': False
+        })
+
+    def test_extract_page(self):
+        page, has_body_text = extract_page(PAGE, "https://example.com/about/")
+        self.assertEqual(page['links'], ["https://example.com/home", "https://example.com/about/contact"])
+        self.assertEqual(page['canonical_url'], "https://example.com/team")
+        self.assertEqual(page['word_count'], len(page['content'].split()))
+        self.assertEqual(page['content_hash'], extract_page(PAGE, "https://example.com/other")[0]['content_hash'])
+        self.assertTrue(has_body_text)
+        self.assertFalse(looks_empty(PAGE, has_body_text))
+        self.assertTrue(looks_empty("<html><body></body></html>", False))
+
+class TestDecodeHtml(unittest.TestCase):
+
+    def test_meta_charset(self):
+        html = '<html><head><meta charset="ISO-8859-1"></head><body>Café crème</body></html>'
+        self.assertIn("Café crème", decode_html(html.encode('latin-1')))
+
+    def test_http_equiv_charset(self):
+        html = ('<html><head><meta http-equiv="Content-Type" content="text/html; charset=shift_jis">'
+                '</head><body>日本語のページ</body></html>')
+        self.assertIn("日本語のページ", decode_html(html.encode('shift_jis')))
+
+    def test_latin1_declaration_means_windows_1252(self):
+        html = '<meta charset=latin1><p>“quoted” – dash</p>'
+        self.assertIn("“quoted” – dash", decode_html(html.encode('cp1252')))
+
+    def test_byte_order_marks(self):
+        html = '<meta charset="iso-8859-1"><p>Café</p>'
+        self.assertEqual(decode_html(codecs.BOM_UTF8 + html.encode('utf-8')), html)
+        self.assertEqual(decode_html(codecs.BOM_UTF16_LE + html.encode('utf-16-le')), html)
+
+    def test_utf8_fallback(self):
+        self.assertEqual(decode_html("<p>Café</p>".encode('utf-8')), "<p>Café</p>")
+        self.assertEqual(decode_html(b'<meta charset="bogus"><p>Caf\xc3\xa9</p>'), '<meta charset="bogus"><p>Café</p>')
+        self.assertEqual(decode_html(b'<meta charset="utf-16"><p>Caf\xc3\xa9</p>'), '<meta charset="utf-16"><p>Café</p>')
+        self.assertIn("�", decode_html(b"<p>Caf\xe9</p>"))
+
+if __name__ == "__main__":
+    unittest.main()
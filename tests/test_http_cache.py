@@ -0,0 +1,94 @@
+# ~/tests/test_http_cache.py
+"""
+HttpCache tests, including a conditional request round trip.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from benchmarks.synthetic_site import SyntheticSite
+from core.http_cache import HttpCache
+
+PAGE = {'url': "https://example.com/a", 'content': "Body", 'content_hash': "h1"}
+
+class TestHttpCache(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp(prefix="domchat-http-cache-")
+        self.cache = HttpCache(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def test_validators_become_conditional_headers(self):
+        self.cache.store(PAGE['url'], {'etag': '"v1"', 'last-modified': "Wed, 01 Jan 2020 00:00:00 GMT"}, PAGE)
+        self.assertEqual(self.cache.conditional_headers(PAGE['url']), {
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': "Wed, 01 Jan 2020 00:00:00 GMT"
+        })
+        self.assertEqual(self.cache.get_page(PAGE['url']), PAGE)
+
+    def test_page_without_validators(self):
+        self.cache.store(PAGE['url'], {}, PAGE)
+        self.assertEqual(self.cache.conditional_headers(PAGE['url']), {})
+        self.assertEqual(self.cache.get_page(PAGE['url']), PAGE)
+
+    def test_unknown_and_unreadable_entries(self):
+        self.assertIsNone(self.cache.get_page("https://example.com/unknown"))
+        self.assertEqual(self.cache.conditional_headers("https://example.com/unknown"), {})
+        self.cache.store(PAGE['url'], {'etag': '"v1"'}, PAGE)
+        with open(self.cache._entry_path(PAGE['url']), 'w') as f:
+            f.write("{not json")
+        self.assertIsNone(self.cache.get_page(PAGE['url']))
+        self.assertEqual(self.cache.conditional_headers(PAGE['url']), {})
+
+    def test_store_replaces_entry(self):
+        self.cache.store(PAGE['url'], {'etag': '"v1"'}, PAGE)
+        self.cache.store(PAGE['url'], {'etag': '"v2"'}, {**PAGE, 'content_hash': "h2"})
+        self.assertEqual(self.cache.conditional_headers(PAGE['url']), {'If-None-Match': '"v2"'})
+        self.assertEqual(self.cache.get_page(PAGE['url'])['content_hash'], "h2")
+
+class TestConditionalFetch(unittest.TestCase):
+
+    def setUp(self):
+        self._saved = {name: getattr(Config, name) for name in ("CRAWL_DELAY", "RATE_MIN_DELAY")}
+        Config.CRAWL_DELAY = 0
+        Config.RATE_MIN_DELAY = 0
+        self.path = tempfile.mkdtemp(prefix="domchat-http-cache-")
+        self.site = SyntheticSite(5, fanout=2, page_words=200, latency_ms=0).start()
+
+    def tearDown(self):
+        self.site.stop()
+        shutil.rmtree(self.path, ignore_errors=True)
+        for name, value in self._saved.items():
+            setattr(Config, name, value)
+
+    @mock.patch("core.fetcher.render_with_playwright", return_value="")
+    def test_unchanged_page_answers_not_modified(self, _):
+        from core.fetcher import AsyncCrawlEngine
+        cache, engine = HttpCache(self.path), AsyncCrawlEngine()
+        url = self.site.base_url + "page/1"
+        first = engine.fetch_all([url])[0]
+        cache.store(url, first['headers'], first['page'])
+
+        second = engine.fetch_all([url], {url: cache.conditional_headers(url)})[0]
+        self.assertEqual((second['status'], second['source'], second['page']), (304, "not_modified", None))
+
+        self.site.touch(1)
+        third = engine.fetch_all([url], {url: cache.conditional_headers(url)})[0]
+        self.assertEqual(third['status'], 200)
+        self.assertNotEqual(third['page']['content_hash'], first['page']['content_hash'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+# ~/tests/test_http_client.py
+"""
+Shared HTTP client tests: connections are kept alive and reused.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_site import SyntheticSite
+from core import http_client
+
+class TestSharedClients(unittest.TestCase):
+
+    def setUp(self):
+        self.site = SyntheticSite(5, fanout=2, page_words=50, latency_ms=0).start()
+        self.addCleanup(self.site.stop)
+        # Count TCP connections accepted by the site
+        self.connections = 0
+        server = self.site._server
+        process_request = server.process_request
+
+        def counting(request, client_address):
+            self.connections += 1
+            process_request(request, client_address)
+
+        server.process_request = counting
+        http_client.close_clients()
+        self.addCleanup(http_client.close_clients)
+
+    def urls(self):
+        return [self.site.base_url + f"page/{i}" for i in range(1, 5)] * 3
+
+    def test_sync_client_reuses_connection(self):
+        client = http_client.get_http_client()
+        self.assertIs(http_client.get_http_client(), client)
+        for url in self.urls():
+            self.assertEqual(client.get(url).status_code, 200)
+        self.assertEqual(self.connections, 1)
+
+    def test_async_client_reuses_connection(self):
+        async def fetch_all(urls):
+            client = http_client.get_async_client()
+            return [(await client.get(url)).status_code for url in urls]
+
+        self.assertEqual(http_client.run_async(fetch_all(self.urls()), timeout=30), [200] * 12)
+        self.assertEqual(http_client.run_async(fetch_all(self.urls()), timeout=30), [200] * 12)
+        self.assertEqual(self.connections, 1)
+
+    def test_close_clients_starts_fresh(self):
+        client = http_client.get_http_client()
+        async_client = http_client.get_async_client()
+        http_client.close_clients()
+        self.assertTrue(client.is_closed)
+        self.assertTrue(async_client.is_closed)
+        self.assertIsNot(http_client.get_http_client(), client)
+        self.assertIsNot(http_client.get_async_client(), async_client)
+
+    def test_default_headers(self):
+        client = http_client.get_http_client()
+        self.assertEqual(client.headers['User-Agent'], http_client.DEFAULT_HEADERS['User-Agent'])
+        self.assertTrue(client.follow_redirects)
+
+if __name__ == "__main__":
+    unittest.main()
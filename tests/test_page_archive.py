@@ -0,0 +1,116 @@
+# ~/tests/test_page_archive.py
+"""
+Page archive (WARC record) tests.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import types
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.page_archive import PageArchive, build_record, read_warc
+
+DOMAIN = "https://example.com"
+
+def round_trip(html: str, headers: dict) -> dict:
+    records = list(read_warc(io.BytesIO(build_record("https://example.com/", html, 200, headers))))
+    assert len(records) == 1
+    return records[0]
+
+class TestRecordRoundTrip(unittest.TestCase):
+
+    def test_utf8_page(self):
+        record = round_trip("<p>Café crème</p>", {'Content-Type': 'text/html; charset=utf-8'})
+        self.assertEqual(record['html'], "<p>Café crème</p>")
+        self.assertEqual(record['url'], "https://example.com/")
+        self.assertEqual(record['status'], 200)
+
+    def test_non_utf8_charset(self):
+        for charset in ("ISO-8859-1", "windows-1252", '"Shift_JIS"'):
+            with self.subTest(charset=charset):
+                headers = {'content-type': f'text/html; charset={charset}', 'etag': '"v1"'}
+                record = round_trip("<p>Café crème 日本</p>" if 'JIS' in charset else "<p>Café crème</p>", headers)
+                self.assertIn("Café crème", record['html'])
+                self.assertEqual(record['headers']['content-type'], 'text/html; charset=utf-8')
+                self.assertEqual(record['headers']['etag'], '"v1"')
+
+    def test_no_content_type(self):
+        self.assertEqual(round_trip("<p>Café</p>", {})['html'], "<p>Café</p>")
+
+    def test_transfer_headers_dropped(self):
+        record = round_trip("<p>Body</p>", {'Content-Encoding': 'gzip', 'Transfer-Encoding': 'chunked'})
+        self.assertNotIn('content-encoding', record['headers'])
+        self.assertNotIn('transfer-encoding', record['headers'])
+        self.assertEqual(record['html'], "<p>Body</p>")
+
+class TestPageArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp(prefix="domchat-archive-")
+        self.archive = PageArchive(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def crawl(self, *pages):
+        writer = self.archive.writer(DOMAIN)
+        writer.write([{'url': url, 'html': html, 'status': 200, 'headers': {}} for url, html in pages])
+        # Segment names are timestamps; keep them distinct
+        time.sleep(0.002)
+        return writer
+
+    def test_latest_records_streams_newest_copy(self):
+        self.crawl(("https://example.com/a", "a1"), ("https://example.com/b", "b1"))
+        self.crawl(("https://example.com/a", "a2"))
+        records = self.archive.latest_records(DOMAIN)
+        self.assertIsInstance(records, types.GeneratorType)
+        latest = {record['url']: record['html'] for record in records}
+        self.assertEqual(latest, {"https://example.com/a": "a2", "https://example.com/b": "b1"})
+
+    def test_truncated_segment_keeps_complete_records(self):
+        writer = self.crawl(("https://example.com/a", "a1"), ("https://example.com/b", "b1"))
+        with open(writer.path, 'r+b') as f:
+            f.truncate(os.path.getsize(writer.path) - 5)
+        urls = [record['url'] for record in self.archive.latest_records(DOMAIN)]
+        self.assertEqual(urls, ["https://example.com/a"])
+
+    def test_compaction_keeps_newest_record_of_each_url(self):
+        for i in range(4):
+            self.crawl(("https://example.com/a", f"a{i}"), (f"https://example.com/p{i}", f"p{i}"))
+        self.assertFalse(self.archive.compact(DOMAIN, max_segments=4))
+        self.assertTrue(self.archive.compact(DOMAIN, max_segments=3))
+
+        self.assertEqual(len(self.archive.segments(DOMAIN)), 1)
+        records = list(self.archive.iter_records(DOMAIN))
+        self.assertEqual(len(records), 5)
+        latest = {record['url']: record for record in records}
+        self.assertEqual(latest["https://example.com/a"]['html'], "a3")
+        self.assertEqual(latest["https://example.com/p0"]['status'], 200)
+        self.assertTrue(latest["https://example.com/p0"]['date'])
+
+        # Newer segments sort after the compacted one
+        self.crawl(("https://example.com/a", "a4"))
+        latest = {record['url']: record['html'] for record in self.archive.latest_records(DOMAIN)}
+        self.assertEqual(latest["https://example.com/a"], "a4")
+
+    def test_compaction_keeps_segments_it_cannot_read(self):
+        self.crawl(("https://example.com/a", "a1"))
+        self.crawl(("https://example.com/a", "a2"))
+        broken = os.path.join(os.path.dirname(self.archive.segments(DOMAIN)[0]), "00000000T000000000000-1.warc")
+        with open(broken, 'wb') as f:
+            f.write(b"not a warc file\r\n")
+        self.assertFalse(self.archive.compact(DOMAIN, max_segments=1))
+        self.assertEqual(len(self.archive.segments(DOMAIN)), 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+# ~/tests/test_pipeline.py
+"""
+Streaming indexing pipeline tests, with an in-memory collection and a fake
+embedding model in place of ChromaDB and SentenceTransformers.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from core.pipeline import IndexingPipeline
+from core.processor import EnhancedContentProcessor, chunk_id
+
+class MemoryCollection:
+    """
+    The parts of a ChromaDB collection the processor uses.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows = {}
+
+    def upsert(self, embeddings, documents, metadatas, ids):
+        for id_, embedding, document, metadata in zip(ids, embeddings, documents, metadatas):
+            self.rows[id_] = (embedding, document, metadata)
+
+    def get(self, include=None):
+        return {'ids': list(self.rows), 'metadatas': [row[2] for row in self.rows.values()]}
+
+    def delete(self, ids):
+        for id_ in ids:
+            self.rows.pop(id_, None)
+
+class FakeEncoder:
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.texts = []
+        self.batches = []
+
+    def encode(self, texts):
+        time.sleep(self.delay)
+        self.texts.extend(texts)
+        self.batches.append(len(texts))
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+class MemoryProcessor(EnhancedContentProcessor):
+    """
+    EnhancedContentProcessor with collections kept in memory by name.
+    """
+
+    def __init__(self, encoder: FakeEncoder = None):
+        self.embedding_model = encoder or FakeEncoder()
+        self.collections = {}
+        self.collection = None
+        self.domain_metadata = {}
+
+    def open_collection(self, domain_key: str, sync_mode=False) -> str:
+        return self.use_collection(f"domain_{domain_key}")
+
+    def use_collection(self, collection_name: str) -> str:
+        self.collection = self.collections.setdefault(collection_name, MemoryCollection(collection_name))
+        return collection_name
+
+def make_page(i: int, words: int = 120, revision: int = 0) -> dict:
+    return {
+        'url': f"https://example.com/page/{i}",
+        'title': f"Page {i}",
+        'content': ' '.join(f"p{i}r{revision}w{j}" for j in range(words)),
+        'headings': [],
+        'word_count': words,
+        'content_hash': f"h{i}-{revision}",
+        'timestamp': "2024-01-01T00:00:00"
+    }
+
+def crawl_result(pages) -> dict:
+    return {'domain': "https://example.com", 'crawl_date': "2024-01-01T00:00:00", 'total_pages': len(pages), 'pages': pages}
+
+def run(processor: MemoryProcessor, pages, waves: int = 3, **kwargs):
+    def produce(emit):
+        for start in range(0, len(pages), waves):
+            emit(pages[start:start + waves])
+        return crawl_result(pages)
+    return IndexingPipeline(processor, **kwargs).run("https://example.com", produce)
+
+class TestIndexingPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self._saved = {name: getattr(Config, name) for name in ("CHUNK_SIZE", "CHUNK_OVERLAP")}
+        Config.CHUNK_SIZE = 50
+        Config.CHUNK_OVERLAP = 10
+
+    def tearDown(self):
+        for name, value in self._saved.items():
+            setattr(Config, name, value)
+
+    def test_indexes_every_chunk(self):
+        processor = MemoryProcessor()
+        pages = [make_page(i) for i in range(7)]
+        result, name = run(processor, pages, batch_size=8)
+        self.assertEqual(result['total_pages'], 7)
+        self.assertEqual(processor.domain_metadata['total_pages'], 7)
+
+        expected = {chunk_id(page['url'], chunk['metadata']['chunk_index']): chunk['text']
+                    for page in pages for chunk in processor.page_chunks(page)}
+        rows = processor.collections[name].rows
+        self.assertEqual({id_: row[1] for id_, row in rows.items()}, expected)
+        self.assertTrue(all(size <= 8 for size in processor.embedding_model.batches))
+
+    def test_no_pages_touches_no_collection(self):
+        processor = MemoryProcessor()
+        result, name = run(processor, [])
+        self.assertIsNone(name)
+        self.assertEqual(processor.collections, {})
+        self.assertEqual(processor.domain_metadata, {})
+
+    def test_reused_collection_skips_unchanged_and_prunes_removed(self):
+        processor = MemoryProcessor()
+        run(processor, [make_page(i) for i in range(5)])
+        encoded = len(processor.embedding_model.texts)
+
+        # Page 1 changed, page 4 is gone
+        pages = [make_page(0), make_page(1, revision=1), make_page(2), make_page(3)]
+        _, name = run(processor, pages)
+        self.assertEqual(len(processor.embedding_model.texts) - encoded, len(processor.page_chunks(pages[1])))
+
+        stored = processor.stored_pages()
+        self.assertEqual(set(stored), {page['url'] for page in pages})
+        self.assertEqual(stored[pages[1]['url']]['version'], ("h1-1", ""))
+
+    def test_target_collection_keeps_existing_chunks(self):
+        processor = MemoryProcessor()
+        processor.use_collection("session_1")
+        processor.collection.upsert([[0.0]], ["old"], [{'url': "https://other.com/"}], ["old-id"])
+        _, name = run(processor, [make_page(0)], collection_name="session_1")
+        self.assertEqual(name, "session_1")
+        self.assertIn("old-id", processor.collections["session_1"].rows)
+        self.assertNotIn("domain_https://example.com", processor.collections)
+
+    def test_slow_embedder_throttles_crawler(self):
+        processor = MemoryProcessor(FakeEncoder(delay=0.05))
+        emitted = []
+
+        def produce(emit):
+            for i in range(40):
+                emit([make_page(i, words=40)])
+                emitted.append(time.monotonic())
+            return crawl_result([])
+
+        start = time.monotonic()
+        IndexingPipeline(processor, queue_size=2, batch_size=1).run("https://example.com", produce)
+        # With 2-slot queues the crawler cannot run far ahead of 40 x 50 ms of embedding
+        self.assertGreater(emitted[-1] - start, 1.0)
+
+    def test_stage_error_is_raised_without_blocking_the_crawler(self):
+        processor = MemoryProcessor()
+        processor.embedding_model.encode = mock.Mock(side_effect=RuntimeError("model crashed"))
+        done = threading.Event()
+
+        def produce(emit):
+            for i in range(30):
+                emit([make_page(i)])
+            done.set()
+            return crawl_result([])
+
+        with self.assertRaisesRegex(RuntimeError, "model crashed"):
+            IndexingPipeline(processor, queue_size=2).run("https://example.com", produce)
+        self.assertTrue(done.is_set())
+
+if __name__ == "__main__":
+    unittest.main()
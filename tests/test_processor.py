@@ -0,0 +1,152 @@
+# ~/tests/test_processor.py
+"""
+Incremental indexing tests: stable chunk ids and change detection, with an
+in-memory collection and a fake embedding model.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from core.processor import EnhancedContentProcessor, chunk_id
+
+class MemoryCollection:
+    name = "domain_test"
+
+    def __init__(self):
+        self.rows = {}
+
+    def upsert(self, embeddings, documents, metadatas, ids):
+        for id_, document, metadata in zip(ids, documents, metadatas):
+            self.rows[id_] = (document, metadata)
+
+    def get(self, include=None):
+        return {'ids': list(self.rows), 'metadatas': [row[1] for row in self.rows.values()]}
+
+    def delete(self, ids):
+        for id_ in ids:
+            self.rows.pop(id_, None)
+
+class CountingEncoder:
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, texts):
+        self.encoded += len(texts)
+        return np.zeros((len(texts), 4), dtype=np.float32)
+
+class MemoryProcessor(EnhancedContentProcessor):
+    def __init__(self):
+        self.embedding_model = CountingEncoder()
+        self.collection = MemoryCollection()
+        self.domain_metadata = {}
+
+    def open_collection(self, domain_key: str, sync_mode=False) -> str:
+        return self.collection.name
+
+def make_page(i: int, words: int = 120, revision: int = 0, template_id: str = None) -> dict:
+    page = {
+        'url': f"https://example.com/page/{i}",
+        'title': f"Page {i}",
+        'content': ' '.join(f"p{i}r{revision}w{j}" for j in range(words)),
+        'headings': ["Heading"],
+        'word_count': words,
+        'content_hash': f"h{i}-{revision}-{words}",
+        'timestamp': "2024-01-01T00:00:00"
+    }
+    if template_id is not None:
+        page['template_id'] = template_id
+    return page
+
+def domain_data(pages, **extra) -> dict:
+    return {'domain': "https://example.com", 'crawl_date': "2024-01-01", 'total_pages': len(pages), 'pages': pages, **extra}
+
+class TestChunkId(unittest.TestCase):
+
+    def test_stable_and_distinct(self):
+        self.assertEqual(chunk_id("https://example.com/a", 0), chunk_id("https://example.com/a", 0))
+        # Fixed across processes and Python versions (no salted hash())
+        self.assertEqual(chunk_id("https://example.com/a", 3), "f24a9deb5f47e5a4_3")
+        ids = {chunk_id(f"https://example.com/{i}", j) for i in range(50) for j in range(5)}
+        self.assertEqual(len(ids), 250)
+
+class TestIncrementalIndexing(unittest.TestCase):
+
+    def setUp(self):
+        self._saved = {name: getattr(Config, name) for name in ("CHUNK_SIZE", "CHUNK_OVERLAP")}
+        Config.CHUNK_SIZE = 50
+        Config.CHUNK_OVERLAP = 10
+        self.processor = MemoryProcessor()
+
+    def tearDown(self):
+        for name, value in self._saved.items():
+            setattr(Config, name, value)
+
+    def ids_of(self, url: str):
+        return sorted(id_ for id_, (_, metadata) in self.processor.collection.rows.items() if metadata['url'] == url)
+
+    def test_create_chunks_overlap(self):
+        chunks = self.processor.create_chunks(' '.join(str(i) for i in range(100)), {'url': "u"})
+        self.assertEqual([c['metadata']['chunk_index'] for c in chunks], [0, 1, 2])
+        self.assertEqual(chunks[1]['text'].split()[0], "40")
+        self.assertEqual(chunks[2]['metadata']['chunk_size'], 20)
+
+    def test_unchanged_recrawl_embeds_nothing(self):
+        pages = [make_page(i) for i in range(4)]
+        self.processor.process_domain_data(domain_data(pages))
+        rows = dict(self.processor.collection.rows)
+        encoded = self.processor.embedding_model.encoded
+        self.assertEqual(set(rows), {chunk_id(p['url'], i) for p in pages for i in range(3)})
+
+        self.processor.process_domain_data(domain_data([make_page(i) for i in range(4)]))
+        self.assertEqual(self.processor.embedding_model.encoded, encoded)
+        self.assertEqual(self.processor.collection.rows, rows)
+
+    def test_changed_page_replaces_its_chunks(self):
+        self.processor.process_domain_data(domain_data([make_page(0), make_page(1)]))
+        encoded = self.processor.embedding_model.encoded
+
+        # Page 0 shrinks to one chunk; its stale chunks 1 and 2 must go
+        self.processor.process_domain_data(domain_data([make_page(0, words=30, revision=1), make_page(1)]))
+        self.assertEqual(self.processor.embedding_model.encoded - encoded, 1)
+        self.assertEqual(self.ids_of("https://example.com/page/0"), [chunk_id("https://example.com/page/0", 0)])
+        self.assertEqual(len(self.ids_of("https://example.com/page/1")), 3)
+
+    def test_template_change_reindexes(self):
+        self.processor.process_domain_data(domain_data([make_page(0)]))
+        stored = self.processor.stored_pages()
+        self.assertEqual(self.processor.changed_pages([make_page(0, template_id="")], stored), [])
+        self.assertEqual(len(self.processor.changed_pages([make_page(0, template_id="t1")], stored)), 1)
+
+    def test_mixed_versions_count_as_changed(self):
+        self.processor.process_domain_data(domain_data([make_page(0)]))
+        id_ = chunk_id("https://example.com/page/0", 1)
+        document, metadata = self.processor.collection.rows[id_]
+        self.processor.collection.rows[id_] = (document, {**metadata, 'content_hash': "other"})
+        stored = self.processor.stored_pages()
+        self.assertIsNone(stored["https://example.com/page/0"]['version'])
+        self.assertEqual(len(self.processor.changed_pages([make_page(0)], stored)), 1)
+
+    def test_removed_pages(self):
+        self.processor.process_domain_data(domain_data([make_page(i) for i in range(3)]))
+        # Sync only removes the pages it reports as removed
+        self.processor.process_domain_data(domain_data(
+            [make_page(0)],
+            sync_info={'removed_pages': ["https://example.com/page/1"], 'total_changes': 1}
+        ), sync_mode=True)
+        self.assertEqual(set(self.processor.stored_pages()), {"https://example.com/page/0", "https://example.com/page/2"})
+        # A full analysis removes every page it did not crawl
+        self.processor.process_domain_data(domain_data([make_page(0)]))
+        self.assertEqual(set(self.processor.stored_pages()), {"https://example.com/page/0"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+# ~/tests/test_rate_limiter.py
+"""
+Adaptive per-host rate limiter tests.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import asyncio
+import os
+import sys
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from core.rate_limiter import SLOWDOWN_FACTOR, SPEEDUP_FACTOR, HostRateLimiter, parse_retry_after
+
+def acquire_times(limiter: HostRateLimiter, count: int):
+    """
+    Acquire count tokens concurrently; return the seconds each one waited.
+    """
+    async def run():
+        start = time.monotonic()
+
+        async def one():
+            await limiter.acquire()
+            return time.monotonic() - start
+
+        return sorted(await asyncio.gather(*(one() for _ in range(count))))
+    return asyncio.run(run())
+
+class TestParseRetryAfter(unittest.TestCase):
+
+    def test_formats(self):
+        self.assertEqual(parse_retry_after("120"), 120.0)
+        self.assertEqual(parse_retry_after(" 5 "), 5.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True)
+        self.assertAlmostEqual(parse_retry_after(later), 60, delta=2)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+class TestHostRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self._saved = {name: getattr(Config, name) for name in ("CRAWL_DELAY", "RATE_MAX_DELAY", "RATE_MAX_BACKOFF")}
+        Config.CRAWL_DELAY = 1
+        Config.RATE_MAX_DELAY = 30
+        Config.RATE_MAX_BACKOFF = 120
+
+    def tearDown(self):
+        for name, value in self._saved.items():
+            setattr(Config, name, value)
+
+    def test_paces_requests(self):
+        waits = acquire_times(HostRateLimiter("a", interval=0.1, floor=0), 4)
+        self.assertLess(waits[0], 0.05)
+        self.assertGreaterEqual(waits[-1], 0.3 * 0.9)
+
+    def test_burst(self):
+        waits = acquire_times(HostRateLimiter("a", interval=0.2, floor=0, burst=3), 4)
+        self.assertLess(waits[2], 0.05)
+        self.assertGreaterEqual(waits[3], 0.2 * 0.9)
+
+    def test_zero_interval_never_waits(self):
+        self.assertLess(acquire_times(HostRateLimiter("a", interval=0, floor=0), 20)[-1], 0.05)
+
+    def test_adapts_to_latency_within_bounds(self):
+        limiter = HostRateLimiter("a", interval=1.0, floor=0.5)
+        limiter.feedback(200, 0.01)
+        self.assertAlmostEqual(limiter.interval, SPEEDUP_FACTOR)
+        for _ in range(10):
+            limiter.feedback(200, 0.01)
+        self.assertEqual(limiter.interval, 0.5)
+        limiter.feedback(200, 10)
+        self.assertAlmostEqual(limiter.interval, 0.5 * SLOWDOWN_FACTOR)
+        limiter.feedback(None, None)
+        limiter.feedback(500, 0.01)
+        self.assertAlmostEqual(limiter.interval, 0.5 * SLOWDOWN_FACTOR ** 3)
+        for _ in range(20):
+            limiter.feedback(502, None)
+        self.assertEqual(limiter.interval, Config.RATE_MAX_DELAY)
+
+    def test_set_floor(self):
+        limiter = HostRateLimiter("a", interval=0.2, floor=0)
+        limiter.set_floor(2)
+        self.assertEqual(limiter.interval, 2)
+        limiter.feedback(200, 0.01)
+        self.assertEqual(limiter.interval, 2)
+
+    def test_backoff_honours_retry_after(self):
+        limiter = HostRateLimiter("a", interval=0.05, floor=0)
+        acquire_times(limiter, 1)
+        limiter.feedback(429, 0.01, retry_after="1")
+        self.assertGreaterEqual(limiter.interval, 0.1)
+        waits = acquire_times(limiter, 1)
+        self.assertGreaterEqual(waits[0], 0.9)
+
+    def test_backoff_is_capped(self):
+        Config.RATE_MAX_BACKOFF = 0.3
+        limiter = HostRateLimiter("a", interval=0.05, floor=0)
+        acquire_times(limiter, 1)
+        limiter.feedback(503, None, retry_after="3600")
+        waits = acquire_times(limiter, 1)
+        self.assertGreaterEqual(waits[0], 0.25)
+        self.assertLess(waits[0], 1)
+
+if __name__ == "__main__":
+    unittest.main()
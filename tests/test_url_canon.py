@@ -0,0 +1,113 @@
+# ~/tests/test_url_canon.py
+"""
+URL canonicalization and crawler-trap detection tests.
+
+Run from the project root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from core.url_canon import TrapDetector, canonicalize_url, same_site
+
+class TestCanonicalizeUrl(unittest.TestCase):
+
+    def test_spellings_of_one_page(self):
+        spellings = [
+            "https://example.com/docs",
+            "https://example.com/docs/",
+            "https://EXAMPLE.com:443/docs#intro",
+            "https://example.com//docs",
+            "https://example.com/docs?utm_source=x&utm_medium=y",
+            "https://example.com/docs?fbclid=abc&gclid=def",
+            "https://example.com/docs;jsessionid=ABC123",
+            "https://example.com/docs?PHPSESSID=123",
+            "https://example.com./docs"
+        ]
+        for url in spellings:
+            with self.subTest(url=url):
+                self.assertEqual(canonicalize_url(url), "https://example.com/docs")
+
+    def test_query_order_and_values(self):
+        self.assertEqual(canonicalize_url("https://example.com/s?b=2&a=1&a=0"), "https://example.com/s?a=0&a=1&b=2")
+        self.assertEqual(canonicalize_url("https://example.com/s?q="), "https://example.com/s?q=")
+        self.assertEqual(canonicalize_url("https://example.com/s?page=2&utm_campaign=z"), "https://example.com/s?page=2")
+
+    def test_root_port_and_encoding(self):
+        self.assertEqual(canonicalize_url("http://example.com"), "http://example.com/")
+        self.assertEqual(canonicalize_url("http://example.com:80/"), "http://example.com/")
+        self.assertEqual(canonicalize_url("http://example.com:8080/a"), "http://example.com:8080/a")
+        self.assertEqual(canonicalize_url("https://example.com/a b"), "https://example.com/a%20b")
+        self.assertEqual(canonicalize_url("https://example.com/a%20b"), "https://example.com/a%20b")
+
+    def test_relative_urls_and_preferred_host(self):
+        self.assertEqual(canonicalize_url("../b/", base="https://example.com/a/c/"), "https://example.com/a/b")
+        self.assertEqual(canonicalize_url("https://www.example.com/x", prefer_host="example.com"), "https://example.com/x")
+        self.assertEqual(canonicalize_url("https://example.com/x", prefer_host="www.example.com"), "https://www.example.com/x")
+        self.assertEqual(canonicalize_url("https://blog.example.com/x", prefer_host="example.com"), "https://blog.example.com/x")
+        self.assertTrue(same_site("WWW.example.com", "example.com"))
+        self.assertFalse(same_site("blog.example.com", "example.com"))
+
+    def test_rejects_non_http(self):
+        for url in ("mailto:a@example.com", "javascript:void(0)", "ftp://example.com/", "https://", "http://example.com:99999/"):
+            with self.subTest(url=url):
+                self.assertIsNone(canonicalize_url(url))
+
+class TestTrapDetector(unittest.TestCase):
+
+    def setUp(self):
+        self.detector = TrapDetector()
+
+    def test_allows_ordinary_urls(self):
+        for url in ("https://example.com/", "https://example.com/blog/2019/05/post",
+                    "https://example.com/products/2031", "https://example.com/s?q=shoes&page=2"):
+            with self.subTest(url=url):
+                self.assertTrue(self.detector.allow(url))
+        self.assertEqual(self.detector.rejected, 0)
+
+    def test_structural_traps(self):
+        traps = [
+            "https://example.com/" + "a" * Config.URL_MAX_LENGTH,
+            "https://example.com/" + "/".join(f"d{i}" for i in range(Config.URL_MAX_PATH_DEPTH + 1)),
+            "https://example.com/a/b/a/b/a/b",
+            "https://example.com/s?" + "&".join(f"p{i}=1" for i in range(Config.URL_MAX_QUERY_PARAMS + 1))
+        ]
+        for url in traps:
+            with self.subTest(url=url[:60]):
+                self.assertFalse(self.detector.allow(url))
+        self.assertEqual(self.detector.rejected, len(traps))
+
+    def test_future_calendar_pages(self):
+        future = datetime.now().year + 5
+        self.assertFalse(self.detector.allow(f"https://example.com/calendar/{future}/05"))
+        self.assertFalse(self.detector.allow(f"https://example.com/events/{future}-05-01"))
+        self.assertFalse(self.detector.allow(f"https://example.com/calendar?month={future}-05"))
+        self.assertFalse(self.detector.allow(f"https://example.com/calendar?year={future}"))
+        self.assertTrue(self.detector.allow(f"https://example.com/calendar/{datetime.now().year}/05"))
+        self.assertTrue(self.detector.allow(f"https://example.com/item?id={future}"))
+
+    def test_query_variant_limit_per_path(self):
+        for i in range(Config.URL_MAX_QUERY_VARIANTS):
+            self.assertTrue(self.detector.allow(f"https://example.com/search?color={i}"))
+        self.assertTrue(self.detector.allow("https://example.com/search?color=0"))
+        self.assertFalse(self.detector.allow("https://example.com/search?color=new"))
+        self.assertTrue(self.detector.allow("https://example.com/other?color=new"))
+
+    def test_state_round_trip(self):
+        for i in range(Config.URL_MAX_QUERY_VARIANTS):
+            self.detector.allow(f"https://example.com/search?color={i}")
+        self.detector.allow("https://example.com/a/a/a")
+        restored = TrapDetector()
+        restored.load_state(self.detector.to_state())
+        self.assertEqual(restored.rejected, 1)
+        self.assertFalse(restored.allow("https://example.com/search?color=new"))
+
+if __name__ == "__main__":
+    unittest.main()